@@ -25,6 +25,8 @@ from .serializers import AdminPageSerializer
 class PagesAdminAPIViewSet(PagesAPIViewSet):
     base_serializer_class = AdminPageSerializer
     authentication_classes = [SessionAuthentication]
+    cacheable = False
+    streamable = False
 
     actions = {
         "convert_alias": ConvertAliasPageAPIAction,
@@ -120,6 +120,8 @@ class TestAdminPageListing(AdminAPITestCase, TestPageListing):
     # Not applicable to the admin API
     test_unpublished_pages_dont_appear_in_list = None
     test_private_pages_dont_appear_in_list = None
+    test_private_pages_with_passed_password_restriction = None
+    test_private_pages_with_view_restriction_cache = None
 
     def test_unpublished_pages_appear_in_list(self):
         total_count = get_total_page_count()
@@ -43,18 +43,14 @@ class ChooseParentView(WagtailAdminTemplateMixin, FormView):
         else:
             pages_where_user_can_add = Page.objects.none()
 
-            perms = {
-                perm
-                for perm in page_permission_policy.get_cached_permissions_for_user(user)
-                if perm.permission.codename == "add_page"
-            }
-
-            for perm in perms:
-                # user has add permission on any subpage of perm.page
-                # (including perm.page itself)
-                pages_where_user_can_add |= Page.objects.descendant_of(
-                    perm.page, inclusive=True
-                )
+            paths = page_permission_policy.get_permission_index_for_user(
+                user
+            ).get_paths_for_codenames({"add_page"})
+
+            for path in paths:
+                # user has add permission on any subpage of the page with this
+                # path (including the page itself)
+                pages_where_user_can_add |= Page.objects.filter(path__startswith=path)
 
         # Combine them
         return allowed_parent_pages & pages_where_user_can_add
@@ -10,6 +10,67 @@ class WagtailAPIV2AppConfig(AppConfig):
     verbose_name = _("Wagtail API v2")
 
     def ready(self):
+        from django.contrib.auth import get_user_model
+        from django.core.signals import setting_changed
+        from django.db.models.signals import m2m_changed, post_delete, post_save
+
+        from wagtail.models import PageViewRestriction, Site
+        from wagtail.signals import page_published, page_unpublished, post_page_move
+
+        from .utils import (
+            bump_content_generation_on_change,
+            clear_page_view_restriction_map_on_change,
+        )
+        from .views import clear_serializer_class_cache_on_setting_change
+
+        post_save.connect(
+            clear_page_view_restriction_map_on_change, sender=PageViewRestriction
+        )
+        post_delete.connect(
+            clear_page_view_restriction_map_on_change, sender=PageViewRestriction
+        )
+        m2m_changed.connect(
+            clear_page_view_restriction_map_on_change,
+            sender=PageViewRestriction.groups.through,
+        )
+        # Moving a page changes the paths of any restricted pages beneath it
+        post_page_move.connect(clear_page_view_restriction_map_on_change)
+
+        setting_changed.connect(clear_serializer_class_cache_on_setting_change)
+
+        # Start a new content generation whenever the content or visibility of
+        # objects in the API changes, invalidating ETags and cached responses
+        page_published.connect(bump_content_generation_on_change)
+        page_unpublished.connect(bump_content_generation_on_change)
+        post_page_move.connect(bump_content_generation_on_change)
+        for model in [PageViewRestriction, Site]:
+            post_save.connect(bump_content_generation_on_change, sender=model)
+            post_delete.connect(bump_content_generation_on_change, sender=model)
+        m2m_changed.connect(
+            bump_content_generation_on_change,
+            sender=PageViewRestriction.groups.through,
+        )
+        # A user's groups decide which group-restricted pages they can see
+        groups_field = getattr(get_user_model(), "groups", None)
+        if groups_field is not None:
+            m2m_changed.connect(
+                bump_content_generation_on_change, sender=groups_field.through
+            )
+
+        if apps.is_installed("wagtail.images"):
+            from wagtail.images import get_image_model
+
+            Image = get_image_model()
+            post_save.connect(bump_content_generation_on_change, sender=Image)
+            post_delete.connect(bump_content_generation_on_change, sender=Image)
+
+        if apps.is_installed("wagtail.documents"):
+            from wagtail.documents import get_document_model
+
+            Document = get_document_model()
+            post_save.connect(bump_content_generation_on_change, sender=Document)
+            post_delete.connect(bump_content_generation_on_change, sender=Document)
+
         # Install cache purging signal handlers
         if getattr(settings, "WAGTAILAPI_USE_FRONTENDCACHE", False):
             if apps.is_installed("wagtail.contrib.frontend_cache"):
@@ -1,13 +1,71 @@
+import base64
+import binascii
+import datetime
+import json
 from collections import OrderedDict
 
 from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import F, Q, QuerySet
 from rest_framework.pagination import BasePagination
 from rest_framework.response import Response
 
-from .utils import BadRequestError
+from .utils import BadRequestError, parse_boolean
+
+
+def _encode_cursor_value(value):
+    # Unlike DjangoJSONEncoder, keep the full precision of times, so that the
+    # cursor matches the value in the database exactly
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    return str(value)
+
+
+def encode_cursor(ordering, values):
+    """
+    Encode the ordering and the values of the ordering fields of the last
+    item on a page into an opaque cursor string
+    """
+    data = json.dumps(
+        [ordering, values], default=_encode_cursor_value, separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor created by encode_cursor into an (ordering, values) tuple
+    """
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        ordering, values = json.loads(data)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+        raise BadRequestError("cursor is invalid") from e
+
+    if (
+        not isinstance(ordering, list)
+        or not isinstance(values, list)
+        or len(ordering) != len(values)
+    ):
+        raise BadRequestError("cursor is invalid")
+
+    return ordering, values
 
 
 class WagtailPagination(BasePagination):
+    """
+    Paginates API listings using the ``offset`` and ``limit`` parameters.
+
+    If a ``cursor`` parameter is given (which is empty for the first page),
+    the listing is paginated with keyset pagination instead: the position
+    in the listing is identified by the values of the ordering fields of the
+    last item on the previous page, which is returned as ``next_cursor``.
+    This makes each page equally fast to fetch, no matter how deep.
+
+    Passing ``total_count=false`` skips counting the results, and omits
+    ``total_count`` from the response.
+    """
+
     def paginate_queryset(self, queryset, request, view=None):
         limit_max = getattr(settings, "WAGTAILAPI_LIMIT_MAX", 20)
 
@@ -29,24 +87,150 @@ class WagtailPagination(BasePagination):
         if limit_max and limit > limit_max:
             raise BadRequestError("limit cannot be higher than %d" % limit_max)
 
+        try:
+            include_total_count = parse_boolean(request.GET.get("total_count", "true"))
+        except ValueError as e:
+            raise BadRequestError("total_count must be 'true' or 'false'") from e
+
+        self.view = view
+        self.total_count = queryset.count() if include_total_count else None
+        self.cursor_mode = "cursor" in request.GET
+        self.next_cursor = None
+
+        if self.cursor_mode:
+            if "offset" in request.GET:
+                raise BadRequestError("offset cannot be combined with cursor")
+            if limit == 0:
+                # An empty page has no last item to continue from
+                raise BadRequestError("limit must be at least 1 when using cursor")
+            return self.paginate_queryset_by_cursor(
+                queryset, request.GET["cursor"], limit
+            )
+
         start = offset
         stop = offset + limit
 
-        self.view = view
-        self.total_count = queryset.count()
         return queryset[start:stop]
 
+    def get_cursor_ordering(self, queryset):
+        """
+        Return the field names (prefixed with '-' for descending order) that
+        determine the order of the queryset, ending with the primary key so
+        that the order is unambiguous
+        """
+        if not isinstance(queryset, QuerySet):
+            raise BadRequestError("cursor cannot be used when searching")
+
+        query = queryset.query
+        ordering = list(query.order_by) or (
+            list(queryset.model._meta.ordering) if query.default_ordering else []
+        )
+
+        opts = queryset.model._meta
+        result = []
+        for field_name in ordering:
+            if not isinstance(field_name, str) or field_name == "?":
+                raise BadRequestError("cursor cannot be used with this ordering")
+
+            descending = field_name.startswith("-")
+            field_name = field_name.lstrip("-")
+            if field_name != "pk":
+                try:
+                    field = opts.get_field(field_name)
+                except FieldDoesNotExist as e:
+                    raise BadRequestError(
+                        "cursor cannot be used with this ordering"
+                    ) from e
+
+                if field.primary_key:
+                    field_name = "pk"
+                elif field.is_relation:
+                    # Order by the foreign key value, rather than the
+                    # ordering of the related model
+                    field_name = field.attname
+
+            result.append(("-" if descending else "") + field_name)
+            if field_name == "pk":
+                break
+        else:
+            result.append("pk")
+
+        return result
+
+    def paginate_queryset_by_cursor(self, queryset, cursor, limit):
+        ordering = self.get_cursor_ordering(queryset)
+
+        # Nulls are sorted last, so that they can be paginated consistently on
+        # all databases
+        queryset = queryset.order_by(
+            *[
+                F(field_name[1:]).desc(nulls_last=True)
+                if field_name.startswith("-")
+                else F(field_name).asc(nulls_last=True)
+                for field_name in ordering
+            ]
+        )
+
+        if cursor:
+            cursor_ordering, values = decode_cursor(cursor)
+            if cursor_ordering != ordering:
+                raise BadRequestError("cursor does not match the ordering")
+            queryset = queryset.filter(self.get_cursor_filter(ordering, values))
+
+        items = list(queryset[: limit + 1])
+        if len(items) > limit:
+            items = items[:limit]
+            last_item = items[-1]
+            self.next_cursor = encode_cursor(
+                ordering,
+                [getattr(last_item, field_name.lstrip("-")) for field_name in ordering],
+            )
+
+        return items
+
+    def get_cursor_filter(self, ordering, values):
+        """
+        Return a Q object matching the items that come after the item with
+        the given values of the ordering fields
+        """
+        condition = None
+
+        # Build the condition from the last field backwards, so that each
+        # field is compared only when all previous fields are equal
+        for field_name, value in reversed(list(zip(ordering, values))):
+            lookup = "lt" if field_name.startswith("-") else "gt"
+            field_name = field_name.lstrip("-")
+
+            if value is None:
+                # Only nulls can follow a null
+                after = None
+                equal = Q(**{field_name + "__isnull": True})
+            else:
+                after = Q(**{f"{field_name}__{lookup}": value}) | Q(
+                    **{field_name + "__isnull": True}
+                )
+                equal = Q(**{field_name: value})
+
+            if condition is not None:
+                equal &= condition
+                condition = equal if after is None else after | equal
+            else:
+                condition = after if after is not None else Q(pk__in=[])
+
+        return condition
+
+    def get_paginated_meta(self):
+        meta = OrderedDict()
+        if self.total_count is not None:
+            meta["total_count"] = self.total_count
+        if self.cursor_mode:
+            meta["next_cursor"] = self.next_cursor
+        return meta
+
     def get_paginated_response(self, data):
         data = OrderedDict(
             [
-                (
-                    "meta",
-                    OrderedDict(
-                        [
-                            ("total_count", self.total_count),
-                        ]
-                    ),
-                ),
+                ("meta", self.get_paginated_meta()),
                 ("items", data),
             ]
         )
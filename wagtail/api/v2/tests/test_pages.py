@@ -6,13 +6,17 @@ from unittest import mock
 from django.contrib.auth.models import Group
 from django.contrib.contenttypes.models import ContentType
 from django.core import management
+from django.core.cache import cache
 from django.test import TestCase, TransactionTestCase
 from django.test.utils import override_settings
 from django.urls import reverse
+from django.utils.cache import patch_vary_headers
 from rest_framework.test import APIClient
 
 from wagtail.api.v2 import signal_handlers
-from wagtail.api.v2.views import PagesAPIViewSet
+from wagtail.api.v2.router import WagtailAPIRouter
+from wagtail.api.v2.utils import BadRequestError, parse_fields_parameter
+from wagtail.api.v2.views import PagesAPIViewSet, clear_serializer_class_cache
 from wagtail.models import Locale, Page, Site
 from wagtail.models.view_restrictions import BaseViewRestriction
 from wagtail.test.demosite import models
@@ -140,6 +144,78 @@ class TestPageListing(WagtailTestUtils, TestCase):
         ]
         self.assertEqual(new_total_count, old_total_count)
 
+    def test_private_pages_with_other_user_groups(self):
+        client = APIClient()
+        user = self.create_user(username="alice", password="password")
+        page = models.BlogIndexPage.objects.get(id=5)
+        page_restriction_instance = page.view_restrictions.create(
+            restriction_type="groups"
+        )
+        page_restriction_instance.groups.add(Group.objects.get(name="Editors"))
+        user.groups.add(Group.objects.get(name="Moderators"))
+        client.force_authenticate(user)
+
+        response = client.get(reverse("wagtailapi_v2:pages:listing"))
+        content = json.loads(response.content.decode("UTF-8"))
+        self.assertEqual(content["meta"]["total_count"], get_total_page_count())
+        self.assertNotIn(5, self.get_page_id_list(content))
+        self.assertNotIn(16, self.get_page_id_list(content))
+
+    def test_private_pages_with_passed_password_restriction(self):
+        old_total_count = get_total_page_count()
+        page = models.BlogIndexPage.objects.get(id=5)
+        restriction = page.view_restrictions.create(
+            restriction_type=BaseViewRestriction.PASSWORD, password="test"
+        )
+        # A nested restriction that has not been passed
+        models.BlogEntryPage.objects.get(id=16).view_restrictions.create(
+            restriction_type=BaseViewRestriction.PASSWORD, password="test"
+        )
+
+        session = self.client.session
+        session[restriction.passed_view_restrictions_session_key] = [restriction.id]
+        session.save()
+
+        response = self.get_response()
+        content = json.loads(response.content.decode("UTF-8"))
+        self.assertEqual(content["meta"]["total_count"], old_total_count - 1)
+        self.assertIn(5, self.get_page_id_list(content))
+        self.assertNotIn(16, self.get_page_id_list(content))
+
+    @override_settings(
+        WAGTAILAPI_VIEW_RESTRICTION_CACHE=True,
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            }
+        },
+    )
+    def test_private_pages_with_view_restriction_cache(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        old_total_count = get_total_page_count()
+        self.assertEqual(
+            self.get_response().json()["meta"]["total_count"], old_total_count
+        )
+
+        # The cached restriction map is rebuilt when a restriction is added
+        page = models.BlogIndexPage.objects.get(id=5)
+        with self.captureOnCommitCallbacks(execute=True):
+            restriction = page.view_restrictions.create(restriction_type="login")
+        new_total_count = get_total_page_count()
+        self.assertNotEqual(new_total_count, old_total_count)
+        self.assertEqual(
+            self.get_response().json()["meta"]["total_count"], new_total_count
+        )
+
+        # ...and when it is removed
+        with self.captureOnCommitCallbacks(execute=True):
+            restriction.delete()
+        self.assertEqual(
+            self.get_response().json()["meta"]["total_count"], old_total_count
+        )
+
     def test_page_listing_with_missing_page_model(self):
         # Create a ContentType that doesn't correspond to a real model
         missing_page_content_type = ContentType.objects.create(
@@ -1084,6 +1160,107 @@ class TestPageListing(WagtailTestUtils, TestCase):
         self.assertEqual(response.status_code, 400)
         self.assertEqual(content, {"message": "offset must be a positive integer"})
 
+    # CURSOR
+
+    def walk_cursor(self, **params):
+        page_ids = []
+        cursor = ""
+        while cursor is not None:
+            response = self.get_response(cursor=cursor, limit=3, **params)
+            self.assertEqual(response.status_code, 200)
+            content = json.loads(response.content.decode("UTF-8"))
+            self.assertLessEqual(len(content["items"]), 3)
+            page_ids.extend(self.get_page_id_list(content))
+            cursor = content["meta"]["next_cursor"]
+        return page_ids
+
+    def get_all_page_ids(self, **params):
+        page_ids = []
+        while True:
+            response = self.get_response(offset=len(page_ids), **params)
+            content = json.loads(response.content.decode("UTF-8"))
+            if not content["items"]:
+                return page_ids
+            page_ids.extend(self.get_page_id_list(content))
+
+    def test_cursor_walks_all_pages(self):
+        self.assertEqual(self.walk_cursor(), self.get_all_page_ids())
+
+    def test_cursor_with_ordering(self):
+        for order in ["title", "-title", "-first_published_at,title", "-id"]:
+            with self.subTest(order=order):
+                self.assertEqual(
+                    self.walk_cursor(order=order), self.get_all_page_ids(order=order)
+                )
+
+    def test_cursor_with_null_values(self):
+        models.BlogEntryPage.objects.filter(id__in=[16, 18]).update(
+            first_published_at=None
+        )
+        page_ids = self.walk_cursor(order="first_published_at")
+        self.assertCountEqual(page_ids, self.get_all_page_ids())
+
+        # Pages without a value come last, in order of ID
+        unpublished_ids = sorted(
+            Page.objects.filter(
+                id__in=page_ids, first_published_at__isnull=True
+            ).values_list("id", flat=True)
+        )
+        self.assertIn(16, unpublished_ids)
+        self.assertEqual(page_ids[-len(unpublished_ids) :], unpublished_ids)
+
+    def test_cursor_with_type_filter(self):
+        self.assertEqual(
+            self.walk_cursor(type="demosite.BlogEntryPage", order="-date"),
+            self.get_all_page_ids(type="demosite.BlogEntryPage", order="-date"),
+        )
+
+    def test_cursor_meta(self):
+        response = self.get_response(cursor="", limit=2)
+        content = json.loads(response.content.decode("UTF-8"))
+
+        self.assertEqual(content["meta"]["total_count"], len(self.get_all_page_ids()))
+        self.assertIsInstance(content["meta"]["next_cursor"], str)
+
+    def test_total_count_false(self):
+        response = self.get_response(cursor="", total_count="false")
+        content = json.loads(response.content.decode("UTF-8"))
+        self.assertEqual(set(content["meta"]), {"next_cursor"})
+
+        response = self.get_response(total_count="false", limit=5)
+        content = json.loads(response.content.decode("UTF-8"))
+        self.assertEqual(content["meta"], {})
+        self.assertEqual(len(content["items"]), 5)
+
+    def test_total_count_invalid_gives_error(self):
+        response = self.get_response(total_count="abc")
+        content = json.loads(response.content.decode("UTF-8"))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(content, {"message": "total_count must be 'true' or 'false'"})
+
+    def test_cursor_errors(self):
+        response = self.get_response(cursor="", limit=2, order="title")
+        cursor = json.loads(response.content.decode("UTF-8"))["meta"]["next_cursor"]
+
+        for params, message in [
+            ({"cursor": "", "offset": 2}, "offset cannot be combined with cursor"),
+            ({"cursor": "", "limit": 0}, "limit must be at least 1 when using cursor"),
+            ({"cursor": "not a cursor"}, "cursor is invalid"),
+            ({"cursor": "W1td"}, "cursor is invalid"),
+            ({"cursor": cursor}, "cursor does not match the ordering"),
+            (
+                {"cursor": "", "order": "random"},
+                "cursor cannot be used with this ordering",
+            ),
+        ]:
+            with self.subTest(params=params):
+                response = self.get_response(**params)
+                content = json.loads(response.content.decode("UTF-8"))
+
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(content, {"message": message})
+
     # REGRESSION TESTS
 
     def test_issue_3967(self):
@@ -1909,6 +2086,339 @@ class TestPageCacheInvalidation(TestCase):
         purge.assert_not_called()
 
 
+@override_settings(
+    WAGTAILAPI_USE_CONDITIONAL_REQUESTS=True,
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    },
+)
+class TestConditionalRequests(WagtailTestUtils, TestCase):
+    fixtures = ["demosite.json"]
+
+    def setUp(self):
+        cache.clear()
+
+    def get_listing(self, **kwargs):
+        return self.client.get(reverse("wagtailapi_v2:pages:listing"), **kwargs)
+
+    def get_detail(self, pk=16, **kwargs):
+        return self.client.get(
+            reverse("wagtailapi_v2:pages:detail", args=(pk,)), **kwargs
+        )
+
+    def test_listing_etag(self):
+        response = self.get_listing()
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+
+        response = self.get_listing(headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+    def test_etag_depends_on_query_string(self):
+        etag = self.get_listing()["ETag"]
+        response = self.client.get(
+            reverse("wagtailapi_v2:pages:listing"),
+            {"limit": 5, "offset": 2},
+        )
+        self.assertNotEqual(response["ETag"], etag)
+
+        # The order of the parameters doesn't matter
+        response = self.client.get(
+            reverse("wagtailapi_v2:pages:listing") + "?offset=2&limit=5",
+            headers={"if-none-match": response["ETag"]},
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_etag_depends_on_user(self):
+        etag = self.get_listing()["ETag"]
+        client = APIClient()
+        client.force_authenticate(self.create_user(username="alice"))
+        response = client.get(reverse("wagtailapi_v2:pages:listing"))
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_publishing_changes_etag(self):
+        etag = self.get_listing()["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            models.BlogEntryPage.objects.get(id=16).save_revision().publish()
+
+        response = self.get_listing(headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_detail_etag(self):
+        response = self.get_detail()
+        self.assertEqual(response.status_code, 200)
+        # The page can become hidden without being published again, so
+        # Last-Modified can't be relied on
+        self.assertNotIn("Last-Modified", response)
+
+        response = self.get_detail(headers={"if-none-match": response["ETag"]})
+        self.assertEqual(response.status_code, 304)
+
+    def test_changing_user_groups_changes_etag(self):
+        user = self.create_user(username="alice")
+        client = APIClient()
+        client.force_authenticate(user)
+        etag = client.get(reverse("wagtailapi_v2:pages:listing"))["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            user.groups.add(Group.objects.get(name="Editors"))
+
+        response = client.get(
+            reverse("wagtailapi_v2:pages:listing"), headers={"if-none-match": etag}
+        )
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(WAGTAILAPI_USE_CONDITIONAL_REQUESTS=False)
+    def test_disabled(self):
+        response = self.get_listing()
+        self.assertNotIn("ETag", response)
+        self.assertNotIn("ETag", self.get_detail())
+
+    @override_settings(
+        WAGTAILAPI_USE_CONDITIONAL_REQUESTS=False,
+        WAGTAILAPI_RESPONSE_CACHE_TIMEOUT=60,
+    )
+    def test_response_cache(self):
+        response = self.get_listing()
+        self.assertEqual(response.status_code, 200)
+
+        with self.assertNumQueries(0):
+            cached_response = self.get_listing()
+        self.assertEqual(cached_response.status_code, 200)
+        self.assertEqual(cached_response.content, response.content)
+        self.assertEqual(cached_response["Content-Type"], "application/json")
+
+        # Unpublishing a page starts a new content generation
+        with self.captureOnCommitCallbacks(execute=True):
+            models.BlogEntryPage.objects.get(id=16).unpublish()
+
+        content = self.get_listing().json()
+        self.assertNotIn(16, [page["id"] for page in content["items"]])
+
+    @override_settings(
+        WAGTAILAPI_USE_CONDITIONAL_REQUESTS=False,
+        WAGTAILAPI_RESPONSE_CACHE_TIMEOUT=60,
+    )
+    def test_response_cache_keeps_headers(self):
+        get_listing_response = PagesAPIViewSet.get_listing_response
+
+        def get_listing_response_with_vary(view):
+            response = get_listing_response(view)
+            patch_vary_headers(response, ["Accept-Language"])
+            return response
+
+        with mock.patch.object(
+            PagesAPIViewSet, "get_listing_response", get_listing_response_with_vary
+        ):
+            response = self.get_listing()
+            with self.assertNumQueries(0):
+                cached_response = self.get_listing()
+
+        self.assertIn("Accept-Language", response["Vary"])
+        self.assertEqual(cached_response["Vary"], response["Vary"])
+
+    def test_admin_api_is_not_cacheable(self):
+        self.login()
+        response = self.client.get(reverse("wagtailadmin_api:pages:listing"))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("ETag", response)
+
+
+class TestStreamingListing(WagtailTestUtils, TestCase):
+    fixtures = ["demosite.json"]
+
+    def get_listing(self, params=None, **kwargs):
+        return self.client.get(
+            reverse("wagtailapi_v2:pages:listing"), params or {}, **kwargs
+        )
+
+    def get_streamed_json(self, response):
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/json")
+        return json.loads(b"".join(response.streaming_content))
+
+    def test_streaming_is_disabled_by_default(self):
+        response = self.get_listing({"limit": 50})
+        self.assertFalse(response.streaming)
+
+    def test_streamed_listing_matches_listing(self):
+        params = {"limit": 15, "offset": 2, "fields": "*", "order": "title"}
+        expected = json.loads(self.get_listing(params).content)
+
+        with override_settings(WAGTAILAPI_STREAMING_THRESHOLD=10):
+            response = self.get_listing(params)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.get_streamed_json(response), expected)
+
+    def test_streamed_listing_with_cursor(self):
+        params = {
+            "limit": 15,
+            "cursor": "",
+            "type": "demosite.BlogEntryPage",
+            "fields": "*",
+        }
+        expected = json.loads(self.get_listing(params).content)
+
+        with override_settings(WAGTAILAPI_STREAMING_THRESHOLD=10):
+            response = self.get_listing(params)
+
+        self.assertEqual(self.get_streamed_json(response), expected)
+
+    def test_streamed_listing_in_chunks(self):
+        expected = json.loads(self.get_listing({"limit": 15}).content)
+
+        with (
+            override_settings(WAGTAILAPI_STREAMING_THRESHOLD=10),
+            mock.patch.object(PagesAPIViewSet, "streaming_chunk_size", 4),
+        ):
+            response = self.get_listing({"limit": 15})
+            data = self.get_streamed_json(response)
+
+        self.assertEqual(data, expected)
+
+    def test_streamed_listing_is_rendered_by_json_renderer(self):
+        page = Page.objects.get(id=16)
+        page.title = "Line\u2028separator"
+        page.save(update_fields=["title"])
+        params = {"limit": 15, "fields": "title"}
+        expected = self.get_listing(params).content
+
+        with override_settings(WAGTAILAPI_STREAMING_THRESHOLD=10):
+            response = self.get_listing(params)
+            content = b"".join(response.streaming_content)
+
+        self.assertEqual(content, expected)
+        self.assertIn(b"Line\\u2028separator", content)
+
+    def test_streamed_listing_layout_matches_listing(self):
+        for accept in ["application/json", "application/json; indent=0"]:
+            for params in [{"limit": 15}, {"limit": 15, "offset": 100}]:
+                with self.subTest(accept=accept, params=params):
+                    expected = self.get_listing(params, headers={"accept": accept})
+
+                    with override_settings(WAGTAILAPI_STREAMING_THRESHOLD=10):
+                        response = self.get_listing(params, headers={"accept": accept})
+                        content = b"".join(response.streaming_content)
+
+                    self.assertEqual(content, expected.content)
+
+    @override_settings(WAGTAILAPI_STREAMING_THRESHOLD=10)
+    def test_limit_below_threshold_is_not_streamed(self):
+        response = self.get_listing({"limit": 10})
+        self.assertFalse(response.streaming)
+
+        response = self.get_listing()
+        self.assertFalse(response.streaming)
+
+    @override_settings(WAGTAILAPI_STREAMING_THRESHOLD=10)
+    def test_browsable_api_is_not_streamed(self):
+        response = self.get_listing({"limit": 15}, headers={"accept": "text/html"})
+        self.assertFalse(response.streaming)
+
+    @override_settings(WAGTAILAPI_STREAMING_THRESHOLD=10)
+    def test_bad_request_is_not_streamed(self):
+        response = self.get_listing({"limit": 15, "order": "not_a_field"})
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.streaming)
+
+    @override_settings(WAGTAILAPI_STREAMING_THRESHOLD=10)
+    def test_admin_api_is_not_streamed(self):
+        self.login()
+        response = self.client.get(
+            reverse("wagtailadmin_api:pages:listing"), {"limit": 15}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.streaming)
+
+
+api_router = WagtailAPIRouter("testapi")
+
+
+class TestSerializerClassCache(TestCase):
+    def setUp(self):
+        clear_serializer_class_cache()
+        self.addCleanup(clear_serializer_class_cache)
+
+    def get_serializer_class(self, fields="", model=models.BlogEntryPage, **kwargs):
+        return PagesAPIViewSet._get_serializer_class(
+            api_router, model, parse_fields_parameter(fields), **kwargs
+        )
+
+    def test_serializer_class_is_reused(self):
+        serializer_class = self.get_serializer_class("title,carousel_items(image)")
+
+        self.assertIs(
+            self.get_serializer_class("title,carousel_items(image)"),
+            serializer_class,
+        )
+        self.assertIn("title", serializer_class.Meta.fields)
+        self.assertIn("carousel_items", serializer_class.child_serializer_classes)
+
+    def test_different_configurations_are_not_shared(self):
+        serializer_class = self.get_serializer_class("title")
+
+        self.assertIsNot(self.get_serializer_class("title,date"), serializer_class)
+        self.assertIsNot(
+            self.get_serializer_class("title", show_details=True), serializer_class
+        )
+        self.assertIsNot(
+            self.get_serializer_class("title", model=models.BlogIndexPage),
+            serializer_class,
+        )
+        self.assertIsNot(
+            Test10411APIViewSet._get_serializer_class(
+                api_router, models.BlogEntryPage, parse_fields_parameter("title")
+            ),
+            serializer_class,
+        )
+
+    def test_nested_serializer_class_is_reused(self):
+        serializer_class = self.get_serializer_class("carousel_items(image)")
+        other_serializer_class = self.get_serializer_class(
+            "title,carousel_items(image)"
+        )
+
+        self.assertIs(
+            serializer_class.child_serializer_classes["carousel_items"],
+            other_serializer_class.child_serializer_classes["carousel_items"],
+        )
+
+    def test_invalid_configuration_is_not_cached(self):
+        with self.assertRaises(BadRequestError):
+            self.get_serializer_class("title,foo")
+        with self.assertRaises(BadRequestError):
+            self.get_serializer_class("title,foo")
+
+    @override_settings(WAGTAILAPI_SERIALIZER_CACHE_SIZE=2)
+    def test_least_recently_used_class_is_discarded(self):
+        title = self.get_serializer_class("title")
+        date = self.get_serializer_class("date")
+        self.assertIs(self.get_serializer_class("title"), title)
+
+        self.get_serializer_class("body")
+
+        self.assertIs(self.get_serializer_class("title"), title)
+        self.assertIsNot(self.get_serializer_class("date"), date)
+
+    @override_settings(WAGTAILAPI_SERIALIZER_CACHE_SIZE=0)
+    def test_cache_disabled(self):
+        self.assertIsNot(
+            self.get_serializer_class("title"), self.get_serializer_class("title")
+        )
+
+    def test_clear_serializer_class_cache(self):
+        serializer_class = self.get_serializer_class("title")
+        clear_serializer_class_cache()
+        self.assertIsNot(self.get_serializer_class("title"), serializer_class)
+
+
 class TestPageViewSetSubclassing(PagesAPIViewSet):
     model = models.BlogEntryPage
 
@@ -1,11 +1,19 @@
+from django.contrib.auth.models import AnonymousUser, Group
+from django.contrib.sessions.backends.base import SessionBase
+from django.core.cache import cache
+from django.db import transaction
 from django.test import RequestFactory, TestCase, override_settings
 from django.utils.encoding import force_bytes
 
-from wagtail.models import Site
+from wagtail.models import Page, PageViewRestriction, Site
+from wagtail.test.utils import WagtailTestUtils
 
 from ..utils import (
     FieldsParameterParseError,
+    PageViewRestrictionMap,
+    collapse_path_prefixes,
     get_base_url,
+    get_page_view_restriction_map,
     parse_boolean,
     parse_fields_parameter,
 )
@@ -399,3 +407,184 @@ class TestParseBoolean(TestCase):
             parse_boolean("2")
 
         self.assertEqual(str(e.exception), "expected 'true' or 'false', got '2'")
+
+
+class TestPageViewRestrictionMap(WagtailTestUtils, TestCase):
+    fixtures = ["test.json"]
+
+    def setUp(self):
+        PageViewRestriction.objects.all().delete()
+        self.events_index = Page.objects.get(url_path="/home/events/")
+        self.christmas = Page.objects.get(url_path="/home/events/christmas/")
+        self.about_us = Page.objects.get(url_path="/home/about-us/")
+
+    def get_request(self, user=None, passed_restrictions=()):
+        request = RequestFactory().get("/")
+        request.user = user or AnonymousUser()
+        request.session = SessionBase()
+        request.session[PageViewRestriction.passed_view_restrictions_session_key] = (
+            list(passed_restrictions)
+        )
+        return request
+
+    def test_collapse_path_prefixes(self):
+        self.assertEqual(
+            collapse_path_prefixes(
+                ["000100010002", "0001000100020003", "00010001", "00010002"]
+            ),
+            ["00010001", "00010002"],
+        )
+
+    def test_excluded_paths(self):
+        PageViewRestriction.objects.create(
+            page=self.christmas, restriction_type="login"
+        )
+        password_restriction = PageViewRestriction.objects.create(
+            page=self.events_index, restriction_type="password", password="test"
+        )
+        groups_restriction = PageViewRestriction.objects.create(
+            page=self.about_us, restriction_type="groups"
+        )
+        editors = Group.objects.get(name="Editors")
+        groups_restriction.groups.add(editors)
+        PageViewRestriction.objects.create(page=self.about_us, restriction_type="none")
+
+        restriction_map = PageViewRestrictionMap()
+        editor = self.create_user("editor")
+        editor.groups.add(editors)
+
+        # The login restriction is within the password-restricted section
+        self.assertEqual(
+            restriction_map.get_excluded_paths(self.get_request()),
+            sorted([self.about_us.path, self.events_index.path]),
+        )
+        self.assertEqual(
+            restriction_map.get_excluded_paths(
+                self.get_request(passed_restrictions=[password_restriction.id])
+            ),
+            sorted([self.about_us.path, self.christmas.path]),
+        )
+        self.assertEqual(
+            restriction_map.get_excluded_paths(
+                self.get_request(
+                    user=editor, passed_restrictions=[password_restriction.id]
+                )
+            ),
+            [],
+        )
+        self.assertEqual(
+            restriction_map.get_excluded_paths(
+                self.get_request(user=self.create_user("other"))
+            ),
+            sorted([self.about_us.path, self.events_index.path]),
+        )
+        self.assertEqual(
+            restriction_map.get_excluded_paths(
+                self.get_request(user=self.create_superuser("admin"))
+            ),
+            [self.events_index.path],
+        )
+
+    def test_results_are_reused_for_the_same_kind_of_request(self):
+        PageViewRestriction.objects.create(
+            page=self.christmas, restriction_type="login"
+        )
+        restriction_map = PageViewRestrictionMap()
+
+        with self.assertNumQueries(0):
+            restriction_map.get_exclusion(self.get_request())
+            exclusion = restriction_map.get_exclusion(self.get_request())
+
+        self.assertEqual(
+            set(Page.objects.filter(exclusion)),
+            set(Page.objects.descendant_of(self.christmas, inclusive=True)),
+        )
+        self.assertIsNone(
+            restriction_map.get_exclusion(self.get_request(self.create_user("bob")))
+        )
+
+    def test_results_are_forgotten_after_max_kinds(self):
+        PageViewRestriction.objects.create(
+            page=self.christmas, restriction_type="login"
+        )
+        restriction_map = PageViewRestrictionMap(max_kinds=2)
+        anonymous_request = self.get_request()
+
+        restriction_map.get_excluded_paths(anonymous_request)
+        restriction_map.get_excluded_paths(self.get_request(self.create_user("bob")))
+        restriction_map.get_excluded_paths(
+            self.get_request(self.create_superuser("admin"))
+        )
+
+        self.assertEqual(len(restriction_map._excluded_paths), 1)
+        self.assertEqual(
+            restriction_map.get_excluded_paths(anonymous_request),
+            [self.christmas.path],
+        )
+        self.assertEqual(len(restriction_map._excluded_paths), 2)
+
+    def test_map_is_not_cached_by_default(self):
+        self.assertIsNot(
+            get_page_view_restriction_map(), get_page_view_restriction_map()
+        )
+
+    @override_settings(
+        WAGTAILAPI_VIEW_RESTRICTION_CACHE=True,
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            }
+        },
+    )
+    def test_cached_map_is_cleared_on_change(self):
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            restriction = PageViewRestriction.objects.create(
+                page=self.about_us, restriction_type="groups"
+            )
+        restriction_map = get_page_view_restriction_map()
+
+        with self.assertNumQueries(0):
+            self.assertIs(get_page_view_restriction_map(), restriction_map)
+
+        # Changing the groups of a restriction
+        with self.captureOnCommitCallbacks(execute=True):
+            restriction.groups.add(Group.objects.get(name="Editors"))
+        new_restriction_map = get_page_view_restriction_map()
+        self.assertIsNot(new_restriction_map, restriction_map)
+        self.assertEqual(len(new_restriction_map.group_paths[0][1]), 1)
+
+        # Moving a restricted page
+        with self.captureOnCommitCallbacks(execute=True):
+            self.about_us.move(self.events_index, pos="last-child")
+        restriction_map = get_page_view_restriction_map()
+        self.assertIsNot(restriction_map, new_restriction_map)
+        self.assertTrue(
+            restriction_map.group_paths[0][0].startswith(self.events_index.path)
+        )
+
+    @override_settings(
+        WAGTAILAPI_VIEW_RESTRICTION_CACHE=True,
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            }
+        },
+    )
+    def test_map_not_kept_from_rolled_back_transaction(self):
+        cache.clear()
+        restriction_map = get_page_view_restriction_map()
+
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                PageViewRestriction.objects.create(
+                    page=self.about_us, restriction_type="login"
+                )
+                # The new restriction is visible within the transaction
+                self.assertEqual(len(get_page_view_restriction_map().login_paths), 1)
+                raise RuntimeError
+
+        # The map built within the transaction isn't kept
+        new_restriction_map = get_page_view_restriction_map()
+        self.assertIsNot(new_restriction_map, restriction_map)
+        self.assertEqual(new_restriction_map.login_paths, [])
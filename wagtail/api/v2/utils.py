@@ -1,10 +1,19 @@
+import threading
+import uuid
 from urllib.parse import urlsplit
 
 from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
 from django.utils.encoding import force_str
 
 from wagtail.coreutils import resolve_model_string
-from wagtail.models import Page, Site
+from wagtail.models import Page, PageViewRestriction, Site
+from wagtail.utils.transactions import has_uncommitted_changes, mark_uncommitted_changes
+
+VIEW_RESTRICTION_MAP_VERSION_CACHE_KEY = "wagtailapi_view_restriction_map_version"
+CONTENT_GENERATION_CACHE_KEY = "wagtailapi_content_generation"
 
 
 class BadRequestError(Exception):
@@ -268,3 +277,239 @@ def parse_boolean(value):
         return False
     else:
         raise ValueError("expected 'true' or 'false', got '%s'" % value)
+
+
+def collapse_path_prefixes(paths):
+    """
+    Given an iterable of page paths, return the sorted list of paths that
+    are not descendants of another path in the list
+    """
+    result = []
+    for path in sorted(set(paths)):
+        if not result or not path.startswith(result[-1]):
+            result.append(path)
+    return result
+
+
+class PageViewRestrictionMap:
+    """
+    The paths of all pages with view restrictions, grouped by restriction
+    type, so that the pages a request is not allowed to see can be found
+    without loading and checking each PageViewRestriction.
+
+    The result for each kind of request (anonymous, logged in with a given
+    set of groups, superuser, and with a given set of passed password
+    restrictions) is remembered, up to ``max_kinds`` kinds.
+    """
+
+    def __init__(self, version=None, max_kinds=1000):
+        self.version = version
+        self.max_kinds = max_kinds
+        self.login_paths = []
+        self.password_paths = {}
+        self.group_paths = []
+        self._excluded_paths = {}
+        self._excluded_paths_lock = threading.Lock()
+
+        restrictions = PageViewRestriction.objects.exclude(
+            restriction_type=PageViewRestriction.NONE
+        ).values_list("id", "restriction_type", "page__path")
+
+        group_ids_by_restriction = {}
+        for (
+            restriction_id,
+            group_id,
+        ) in PageViewRestriction.groups.through.objects.filter(
+            pageviewrestriction__restriction_type=PageViewRestriction.GROUPS
+        ).values_list("pageviewrestriction_id", "group_id"):
+            group_ids_by_restriction.setdefault(restriction_id, set()).add(group_id)
+
+        for restriction_id, restriction_type, path in restrictions:
+            if restriction_type == PageViewRestriction.LOGIN:
+                self.login_paths.append(path)
+            elif restriction_type == PageViewRestriction.PASSWORD:
+                self.password_paths[restriction_id] = path
+            elif restriction_type == PageViewRestriction.GROUPS:
+                self.group_paths.append(
+                    (path, frozenset(group_ids_by_restriction.get(restriction_id, ())))
+                )
+
+    def get_request_kind(self, request):
+        user = request.user
+        is_authenticated = user.is_authenticated
+        is_superuser = is_authenticated and user.is_superuser
+
+        if self.group_paths and is_authenticated and not is_superuser:
+            group_ids = frozenset(user.groups.values_list("id", flat=True))
+        else:
+            group_ids = frozenset()
+
+        if self.password_paths:
+            passed_restrictions = frozenset(
+                request.session.get(
+                    PageViewRestriction.passed_view_restrictions_session_key, []
+                )
+            ).intersection(self.password_paths)
+        else:
+            passed_restrictions = frozenset()
+
+        return (is_authenticated, is_superuser, group_ids, passed_restrictions)
+
+    def get_excluded_paths(self, request):
+        """
+        Return the paths of the pages (and their descendants) that the given
+        request may not see, with nested paths removed
+        """
+        kind = self.get_request_kind(request)
+        # The map is shared between threads, so look the kind up in a single
+        # step, as another thread may clear the results at any time
+        excluded_paths = self._excluded_paths.get(kind)
+        if excluded_paths is not None:
+            return excluded_paths
+
+        is_authenticated, is_superuser, group_ids, passed_restrictions = kind
+        paths = []
+
+        if not is_authenticated:
+            paths.extend(self.login_paths)
+
+        paths.extend(
+            path
+            for restriction_id, path in self.password_paths.items()
+            if restriction_id not in passed_restrictions
+        )
+
+        if not is_superuser:
+            paths.extend(
+                path
+                for path, restriction_group_ids in self.group_paths
+                if restriction_group_ids.isdisjoint(group_ids)
+            )
+
+        excluded_paths = collapse_path_prefixes(paths)
+
+        with self._excluded_paths_lock:
+            if len(self._excluded_paths) >= self.max_kinds:
+                self._excluded_paths.clear()
+            self._excluded_paths[kind] = excluded_paths
+
+        return excluded_paths
+
+    def get_exclusion(self, request):
+        """
+        Return a Q object matching the pages that the given request may not
+        see, or None if it may see all pages
+        """
+        excluded_paths = self.get_excluded_paths(request)
+        if not excluded_paths:
+            return None
+
+        condition = Q()
+        for path in excluded_paths:
+            condition |= Q(path__startswith=path)
+        return condition
+
+
+_view_restriction_map = None
+_view_restriction_map_lock = threading.Lock()
+
+
+def get_page_view_restriction_map():
+    """
+    Return a PageViewRestrictionMap of the current restrictions.
+
+    If ``WAGTAILAPI_VIEW_RESTRICTION_CACHE`` is enabled, a process-wide map is
+    reused until the version key in the shared cache shows that view
+    restrictions have changed since it was built.
+    """
+    global _view_restriction_map
+
+    if not getattr(settings, "WAGTAILAPI_VIEW_RESTRICTION_CACHE", False):
+        return PageViewRestrictionMap()
+
+    if has_uncommitted_changes(VIEW_RESTRICTION_MAP_VERSION_CACHE_KEY):
+        # View restrictions have changed within the current transaction, which
+        # may yet be rolled back, so build a map just for this request
+        return PageViewRestrictionMap()
+
+    version = cache.get(VIEW_RESTRICTION_MAP_VERSION_CACHE_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(VIEW_RESTRICTION_MAP_VERSION_CACHE_KEY, version, None):
+            # another process set the version first
+            version = cache.get(VIEW_RESTRICTION_MAP_VERSION_CACHE_KEY, version)
+
+    restriction_map = _view_restriction_map
+    if restriction_map is None or restriction_map.version != version:
+        with _view_restriction_map_lock:
+            restriction_map = _view_restriction_map
+            if restriction_map is None or restriction_map.version != version:
+                restriction_map = PageViewRestrictionMap(version=version)
+                _view_restriction_map = restriction_map
+
+    return restriction_map
+
+
+def clear_page_view_restriction_map():
+    """
+    Discard the process-wide PageViewRestrictionMap, and bump the shared
+    version key so that all other processes rebuild theirs on their next use.
+    """
+
+    global _view_restriction_map
+
+    # Discard this process's map straight away, and don't keep another one
+    # until the current transaction is over, so that requests reflect changes
+    # made within it but a map built from them can't outlive a rollback
+    _view_restriction_map = None
+    mark_uncommitted_changes(VIEW_RESTRICTION_MAP_VERSION_CACHE_KEY)
+
+    def clear():
+        global _view_restriction_map
+
+        # Other processes must wait until the change is visible to them, so
+        # that they can't rebuild their map from the old data
+        _view_restriction_map = None
+        cache.delete(VIEW_RESTRICTION_MAP_VERSION_CACHE_KEY)
+
+    transaction.on_commit(clear)
+
+
+def clear_page_view_restriction_map_on_change(**kwargs):
+    if getattr(settings, "WAGTAILAPI_VIEW_RESTRICTION_CACHE", False):
+        clear_page_view_restriction_map()
+
+
+def is_content_generation_used():
+    return bool(
+        getattr(settings, "WAGTAILAPI_USE_CONDITIONAL_REQUESTS", False)
+        or getattr(settings, "WAGTAILAPI_RESPONSE_CACHE_TIMEOUT", None)
+    )
+
+
+def get_content_generation():
+    """
+    Return the current content generation: an identifier, stored in the shared
+    cache, which changes whenever content served by the API is published,
+    unpublished or otherwise changed.
+    """
+    generation = cache.get(CONTENT_GENERATION_CACHE_KEY)
+    if generation is None:
+        generation = uuid.uuid4().hex
+        if not cache.add(CONTENT_GENERATION_CACHE_KEY, generation, None):
+            # another process set the generation first
+            generation = cache.get(CONTENT_GENERATION_CACHE_KEY, generation)
+    return generation
+
+
+def bump_content_generation():
+    """
+    Start a new content generation once the current transaction is committed,
+    invalidating all ETags and cached responses from the API.
+    """
+    transaction.on_commit(lambda: cache.delete(CONTENT_GENERATION_CACHE_KEY))
+
+
+def bump_content_generation_on_change(**kwargs):
+    if is_content_generation_used():
+        bump_content_generation()
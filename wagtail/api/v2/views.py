@@ -1,17 +1,33 @@
+import hashlib
+import json
+import threading
 from collections import OrderedDict
+from itertools import islice
 
 from django.apps import apps
 from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import FieldDoesNotExist
-from django.http import Http404
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import QuerySet, prefetch_related_objects
+from django.http import Http404, HttpResponse, StreamingHttpResponse
 from django.shortcuts import redirect
 from django.urls import path, reverse
+from django.utils.cache import get_conditional_response
 from django.utils.functional import classproperty
+from django.utils.http import quote_etag
 from modelcluster.fields import ParentalKey
 from rest_framework import status
-from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
+from rest_framework.renderers import (
+    INDENT_SEPARATORS,
+    LONG_SEPARATORS,
+    SHORT_SEPARATORS,
+    BrowsableAPIRenderer,
+    JSONRenderer,
+)
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
+from taggit.managers import TaggableManager
 
 from wagtail.api import APIField
 from wagtail.models import Page, PageViewRestriction, Site
@@ -30,11 +46,47 @@ from .pagination import WagtailPagination
 from .serializers import BaseSerializer, PageSerializer, get_serializer_class
 from .utils import (
     BadRequestError,
+    get_content_generation,
     get_object_detail_url,
+    get_page_view_restriction_map,
     page_models_from_string,
     parse_fields_parameter,
 )
 
+# Generated serializer classes, keyed by the arguments to
+# BaseAPIViewSet._get_serializer_class, most recently used last
+_serializer_class_cache = OrderedDict()
+_serializer_class_cache_lock = threading.Lock()
+
+
+def clear_serializer_class_cache():
+    """
+    Discard all serializer classes generated by the API endpoints, so that
+    they are rebuilt on their next use (for example, after changing the
+    ``api_fields`` of a model in a test).
+    """
+    with _serializer_class_cache_lock:
+        _serializer_class_cache.clear()
+
+
+def clear_serializer_class_cache_on_setting_change(**kwargs):
+    # The fields of a serializer can depend on settings such as
+    # WAGTAIL_I18N_ENABLED
+    clear_serializer_class_cache()
+
+
+def _freeze_fields_config(fields_config):
+    # Convert the output of parse_fields_parameter to nested tuples, so that
+    # it can be used as a cache key
+    return tuple(
+        (
+            field_name,
+            negated,
+            _freeze_fields_config(sub_fields) if sub_fields else None,
+        )
+        for field_name, negated, sub_fields in fields_config
+    )
+
 
 class BaseAPIViewSet(GenericViewSet):
     @classproperty
@@ -53,10 +105,22 @@ class BaseAPIViewSet(GenericViewSet):
     filter_backends = []
     model = None  # Set on subclass
 
+    # Whether large listings may be streamed, when enabled by the
+    # WAGTAILAPI_STREAMING_THRESHOLD setting
+    streamable = True
+    streaming_chunk_size = 100
+
+    # Whether responses may be cached or served as 304 Not Modified, when
+    # enabled by the WAGTAILAPI_USE_CONDITIONAL_REQUESTS and
+    # WAGTAILAPI_RESPONSE_CACHE_TIMEOUT settings
+    cacheable = True
+
     known_query_parameters = frozenset(
         [
             "limit",
             "offset",
+            "cursor",
+            "total_count",
             "fields",
             "order",
             "search",
@@ -88,17 +152,226 @@ class BaseAPIViewSet(GenericViewSet):
         return self.model.objects.all().order_by("id")
 
     def listing_view(self, request):
+        return self.get_cacheable_response(request, self.get_listing_response)
+
+    def get_listing_response(self):
         queryset = self.get_queryset()
         self.check_query_parameters(queryset)
         queryset = self.filter_queryset(queryset)
         queryset = self.paginate_queryset(queryset)
+
+        if self.should_stream_listing():
+            return self.get_streaming_listing_response(queryset)
+
         serializer = self.get_serializer(queryset, many=True)
         return self.get_paginated_response(serializer.data)
 
+    def should_stream_listing(self):
+        """
+        Listings requested with a ``limit`` above ``WAGTAILAPI_STREAMING_THRESHOLD``
+        are streamed, if they are to be rendered as JSON
+        """
+        threshold = getattr(settings, "WAGTAILAPI_STREAMING_THRESHOLD", None)
+        if threshold is None or not self.streamable:
+            return False
+
+        if not isinstance(self.request.accepted_renderer, JSONRenderer):
+            return False
+
+        try:
+            return int(self.request.GET["limit"]) > threshold
+        except (KeyError, ValueError):
+            return False
+
+    def get_listing_prefetch_lookups(self, serializer_class):
+        """
+        Return the relations to prefetch for each chunk of a streamed listing
+        """
+        model = serializer_class.Meta.model
+        lookups = []
+        for field_name in serializer_class.child_serializer_classes:
+            try:
+                field = model._meta.get_field(field_name)
+            except FieldDoesNotExist:
+                continue
+            # Tags are fetched in order by TagsField, so can't use a prefetch
+            if field.is_relation and not isinstance(field, TaggableManager):
+                lookups.append(field_name)
+        return lookups
+
+    def iter_listing_chunks(self, items):
+        """
+        Yield the items of a paginated listing in lists of
+        ``streaming_chunk_size`` items, without loading all of them at once
+        """
+        if isinstance(items, QuerySet):
+            items = items.iterator(chunk_size=self.streaming_chunk_size)
+        else:
+            items = iter(items)
+
+        while chunk := list(islice(items, self.streaming_chunk_size)):
+            yield chunk
+
+    def get_streaming_listing_response(self, items):
+        """
+        Return a response that serializes the listing one item at a time, and
+        writes the JSON as it goes, so that the memory used doesn't grow with
+        the number of items
+        """
+        serializer = self.get_serializer()
+        prefetch_lookups = self.get_listing_prefetch_lookups(type(serializer))
+
+        # Each part is rendered by the JSON renderer, and laid out with the
+        # same separators and indentation that it would use for the whole
+        # listing, so that the output is the same as if it wasn't streamed
+        renderer = self.request.accepted_renderer
+        accepted_media_type = self.request.accepted_media_type
+        renderer_context = self.get_renderer_context()
+        indent = renderer.get_indent(accepted_media_type, renderer_context)
+        if indent:
+            separators = INDENT_SEPARATORS
+        elif renderer.compact:
+            separators = SHORT_SEPARATORS
+        else:
+            separators = LONG_SEPARATORS
+        item_separator, key_separator = (separator.encode() for separator in separators)
+
+        def newline(depth):
+            return b"\n" + b" " * indent * depth if indent else b""
+
+        def render(data, depth):
+            # Newlines only appear between tokens in the rendered JSON
+            return renderer.render(data, accepted_media_type, renderer_context).replace(
+                b"\n", newline(depth)
+            )
+
+        meta = render(self.paginator.get_paginated_meta(), 1)
+
+        def stream():
+            yield (
+                b"{"
+                + newline(1)
+                + b'"meta"'
+                + key_separator
+                + meta
+                + item_separator
+                + newline(1)
+                + b'"items"'
+                + key_separator
+                + b"["
+            )
+            separator = b""
+            for chunk in self.iter_listing_chunks(items):
+                if prefetch_lookups:
+                    prefetch_related_objects(chunk, *prefetch_lookups)
+                for item in chunk:
+                    yield (
+                        separator
+                        + newline(2)
+                        + render(serializer.to_representation(item), 2)
+                    )
+                    separator = item_separator
+            yield (newline(1) if separator else b"") + b"]" + newline(0) + b"}"
+
+        return StreamingHttpResponse(
+            stream(), content_type=self.request.accepted_renderer.media_type
+        )
+
     def detail_view(self, request, pk):
         instance = self.get_object()
-        serializer = self.get_serializer(instance)
-        return Response(serializer.data)
+        return self.get_cacheable_response(
+            request, lambda: Response(self.get_serializer(instance).data)
+        )
+
+    def get_request_variant(self, request):
+        """
+        Return a list of the properties of the request, other than the URL,
+        that can change the content of the response
+        """
+        user = request.user
+        session = getattr(request, "session", None)
+        return [
+            request.accepted_renderer.format,
+            user.pk if user.is_authenticated else None,
+            sorted(
+                session.get(
+                    PageViewRestriction.passed_view_restrictions_session_key, []
+                )
+            )
+            if session is not None
+            else [],
+        ]
+
+    def get_response_cache_key(self, request):
+        """
+        Return a key identifying the response to this request, for use in the
+        ETag and the response cache. It changes whenever the content
+        generation does.
+        """
+        key = json.dumps(
+            [
+                get_content_generation(),
+                request.path,
+                sorted((name, sorted(values)) for name, values in request.GET.lists()),
+                self.get_request_variant(request),
+            ],
+            cls=DjangoJSONEncoder,
+        )
+        return hashlib.sha1(key.encode()).hexdigest()
+
+    def get_cacheable_response(self, request, get_response):
+        """
+        Return the response from calling ``get_response``, adding an ETag
+        header if ``WAGTAILAPI_USE_CONDITIONAL_REQUESTS`` is enabled, and
+        reusing the responses kept by the response cache if
+        ``WAGTAILAPI_RESPONSE_CACHE_TIMEOUT`` is set.
+
+        A Last-Modified header isn't sent, as the response can change without
+        the object itself changing (for example, when a view restriction is
+        added), which is only reflected by the ETag.
+        """
+        use_conditional_requests = getattr(
+            settings, "WAGTAILAPI_USE_CONDITIONAL_REQUESTS", False
+        )
+        cache_timeout = getattr(settings, "WAGTAILAPI_RESPONSE_CACHE_TIMEOUT", None)
+
+        if not self.cacheable or not (use_conditional_requests or cache_timeout):
+            return get_response()
+
+        key = self.get_response_cache_key(request)
+        etag = quote_etag(key) if use_conditional_requests else None
+
+        def set_validator_headers(response):
+            if etag:
+                response["ETag"] = etag
+            return response
+
+        if response := get_conditional_response(request, etag=etag):
+            return set_validator_headers(response)
+
+        cache_key = "wagtailapi_response:" + key
+        if cache_timeout and (cached := cache.get(cache_key)):
+            content, headers = cached
+            response = HttpResponse(content)
+            # Restore the headers of the original response, such as Vary
+            for header, value in headers:
+                response[header] = value
+            return set_validator_headers(response)
+
+        response = get_response()
+        if response.status_code == 200:
+            set_validator_headers(response)
+            # Streamed listings are too large to be worth keeping in the cache
+            if cache_timeout and not response.streaming:
+                response.add_post_render_callback(
+                    lambda response: cache.set(
+                        cache_key,
+                        (response.content, list(response.items())),
+                        cache_timeout,
+                    )
+                )
+
+        return response
 
     def find_view(self, request):
         queryset = self.get_queryset()
@@ -241,6 +514,43 @@ class BaseAPIViewSet(GenericViewSet):
     @classmethod
     def _get_serializer_class(
         cls, router, model, fields_config, show_details=False, nested=False
+    ):
+        """
+        Return the serializer class for the given model and fields
+        configuration, reusing a previously generated class where possible.
+        The number of classes kept is limited by the
+        ``WAGTAILAPI_SERIALIZER_CACHE_SIZE`` setting.
+        """
+        max_size = getattr(settings, "WAGTAILAPI_SERIALIZER_CACHE_SIZE", 512)
+        if not max_size:
+            return cls._build_serializer_class(
+                router, model, fields_config, show_details, nested
+            )
+
+        fields_config = _freeze_fields_config(fields_config)
+        key = (cls, router, model, fields_config, show_details, nested)
+
+        with _serializer_class_cache_lock:
+            if key in _serializer_class_cache:
+                _serializer_class_cache.move_to_end(key)
+                return _serializer_class_cache[key]
+
+        # Invalid fields configurations raise BadRequestError here, so are
+        # never cached
+        serializer_class = cls._build_serializer_class(
+            router, model, fields_config, show_details, nested
+        )
+
+        with _serializer_class_cache_lock:
+            _serializer_class_cache[key] = serializer_class
+            while len(_serializer_class_cache) > max_size:
+                _serializer_class_cache.popitem(last=False)
+
+        return serializer_class
+
+    @classmethod
+    def _build_serializer_class(
+        cls, router, model, fields_config, show_details=False, nested=False
     ):
         # Get all available fields
         body_fields = cls.get_body_fields_names(model)
@@ -523,16 +833,11 @@ class PagesAPIViewSet(BaseAPIViewSet):
         # Get all live pages
         queryset = Page.objects.all().live()
 
-        # Exclude pages that the user doesn't have access to
-        restricted_pages = [
-            restriction.page
-            for restriction in PageViewRestriction.objects.all().select_related("page")
-            if not restriction.accept_request(self.request)
-        ]
-
-        # Exclude the restricted pages and their descendants from the queryset
-        for restricted_page in restricted_pages:
-            queryset = queryset.not_descendant_of(restricted_page, inclusive=True)
+        # Exclude pages that the user doesn't have access to, along with their
+        # descendants
+        exclusion = get_page_view_restriction_map().get_exclusion(request)
+        if exclusion is not None:
+            queryset = queryset.exclude(exclusion)
 
         # Check if we have a specific site to look for
         if "site" in request.GET:
@@ -730,6 +730,43 @@ class StreamValue(MutableSequence):
                 child_block, value, id=self._raw_data[i].get("id")
             )
 
+    @staticmethod
+    def prefetch_blocks(stream_values):
+        """
+        Convert the raw data of all the given StreamValues to native values, making a single
+        ``bulk_to_python`` call for each child block across all of the streams - so that
+        database lookups for (say) image or page chooser blocks are batched into a single
+        query, rather than one per stream. Nested StructBlock and ListBlock children are
+        batched too, as their ``bulk_to_python`` methods pass all of their values on to
+        their own child blocks.
+
+        ``None`` values and items that have already been converted are skipped.
+        """
+        # child block id => (child block, list of (stream value, index within the stream))
+        pending = {}
+        for stream_value in stream_values:
+            if stream_value is None:
+                continue
+            child_blocks = stream_value.stream_block.child_blocks
+            for i, raw_item in enumerate(stream_value._raw_data):
+                if stream_value._bound_blocks[i] is not None:
+                    continue
+                child_block = child_blocks.get(raw_item["type"])
+                if child_block is None:
+                    continue
+                pending.setdefault(id(child_block), (child_block, []))[1].append(
+                    (stream_value, i)
+                )
+
+        for child_block, items in pending.values():
+            converted_values = child_block.bulk_to_python(
+                [stream_value._raw_data[i]["value"] for stream_value, i in items]
+            )
+            for (stream_value, i), value in zip(items, converted_values):
+                stream_value._bound_blocks[i] = StreamValue.StreamChild(
+                    child_block, value, id=stream_value._raw_data[i].get("id")
+                )
+
     def get_prep_value(self):
         prep_value = []
 
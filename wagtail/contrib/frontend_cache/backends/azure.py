@@ -3,7 +3,7 @@ from urllib.parse import urlsplit, urlunsplit
 
 from django.core.exceptions import ImproperlyConfigured
 
-from .base import BaseBackend
+from .base import BaseBackend, PurgeError, is_retryable_status
 
 logger = logging.getLogger("wagtail.frontendcache")
 
@@ -117,6 +117,14 @@ class AzureBaseBackend(BaseBackend):
                     type(self).__name__,
                     exception.response,
                 )
+            status_code = getattr(exception.response, "status_code", None)
+            self._raise_purge_error(
+                PurgeError(
+                    f"HttpOperationError: {exception.response!r}",
+                    retryable=status_code is None or is_retryable_status(status_code),
+                ),
+                exception,
+            )
 
 
 class AzureFrontDoorBackend(AzureBaseBackend):
@@ -5,21 +5,90 @@ from django.http.request import validate_host
 logger = logging.getLogger("wagtail.frontendcache")
 
 
-__all__ = ["BaseBackend"]
+__all__ = ["BaseBackend", "PurgeError"]
+
+
+class PurgeError(Exception):
+    """
+    Raised by a backend with ``raise_errors`` set when a purge request fails.
+    ``retryable`` is False for failures that sending the same request again
+    won't fix, such as invalid credentials.
+    """
+
+    def __init__(self, message, retryable=True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+def is_retryable_status(status_code):
+    # Rate limiting and server errors are usually temporary
+    return status_code == 429 or status_code >= 500
 
 
 class BaseBackend:
+    # The maximum number of URLs (or tags) to send in a single call to
+    # purge_batch / purge_tags, or None for no limit
+    batch_size = None
+
+    # Whether this backend can purge cached responses by tag (surrogate key)
+    supports_tags = False
+
+    # Whether failed purges raise PurgeError once they have been logged. The
+    # purge tasks set this, so that they can retry failed purges
+    raise_errors = False
+
     def __init__(self, params):
         # If unspecified, invalidate all hosts
         self.hostnames = params.get("HOSTNAMES", ["*"])
+        self.batch_size = params.get("BATCH_SIZE", self.batch_size)
 
     def purge(self, url) -> None:
         raise NotImplementedError
 
     def purge_batch(self, urls) -> None:
         # Fallback for backends that do not support batch purging
-        for url in urls:
-            self.purge(url)
+        self._purge_each(self.purge, urls)
+
+    def purge_tags(self, tags) -> None:
+        raise NotImplementedError
+
+    def _raise_purge_error(self, error, cause=None):
+        """
+        Raise the PurgeError ``error`` if ``raise_errors`` is set. Otherwise,
+        the failure is only logged
+        """
+        if self.raise_errors:
+            raise error from cause
+
+    def _purge_each(self, purge, items):
+        """
+        Call ``purge`` with each of ``items``, making every request before
+        raising a single PurgeError for any that failed
+        """
+        errors = []
+        for item in items:
+            try:
+                purge(item)
+            except PurgeError as e:
+                errors.append(e)
+
+        if errors:
+            raise PurgeError(
+                f"{len(errors)} of {len(items)} purge request(s) failed: {errors[0]}",
+                retryable=any(e.retryable for e in errors),
+            )
+
+    def get_batches(self, items):
+        """
+        Split `items` into lists that fit within this backend's `batch_size`
+        """
+        items = list(items)
+        if not self.batch_size:
+            return [items] if items else []
+        return [
+            items[i : i + self.batch_size]
+            for i in range(0, len(items), self.batch_size)
+        ]
 
     def invalidates_hostname(self, hostname) -> bool:
         """
@@ -3,7 +3,7 @@ import logging
 import requests
 from django.core.exceptions import ImproperlyConfigured
 
-from .base import BaseBackend
+from .base import BaseBackend, PurgeError, is_retryable_status
 
 logger = logging.getLogger("wagtail.frontendcache")
 
@@ -13,6 +13,8 @@ __all__ = ["CloudflareBackend"]
 
 class CloudflareBackend(BaseBackend):
     CHUNK_SIZE = 30
+    batch_size = CHUNK_SIZE
+    supports_tags = True
 
     def __init__(self, params):
         super().__init__(params)
@@ -47,6 +49,12 @@ class CloudflareBackend(BaseBackend):
             )
 
     def _purge_urls(self, urls):
+        self._send_purge_request({"files": urls}, urls)
+
+    def _purge_tags(self, tags):
+        self._send_purge_request({"tags": tags}, tags)
+
+    def _send_purge_request(self, data, items):
         try:
             purge_url = (
                 "https://api.cloudflare.com/client/v4/zones/{}/purge_cache".format(
@@ -62,8 +70,6 @@ class CloudflareBackend(BaseBackend):
                 headers["X-Auth-Email"] = self.cloudflare_email
                 headers["X-Auth-Key"] = self.cloudflare_api_key
 
-            data = {"files": urls}
-
             response = requests.delete(
                 purge_url,
                 json=data,
@@ -76,39 +82,67 @@ class CloudflareBackend(BaseBackend):
                 if response.status_code != 200:
                     response.raise_for_status()
                 else:
-                    for url in urls:
+                    for item in items:
                         logger.error(
                             "Couldn't purge '%s' from Cloudflare. Unexpected JSON parse error.",
-                            url,
+                            item,
                         )
 
         except requests.exceptions.HTTPError as e:
-            for url in urls:
+            for item in items:
                 logging.exception(
                     "Couldn't purge '%s' from Cloudflare. HTTPError: %d",
-                    url,
+                    item,
                     e.response.status_code,
                 )
+            self._raise_purge_error(
+                PurgeError(
+                    f"HTTPError: {e.response.status_code}",
+                    retryable=is_retryable_status(e.response.status_code),
+                ),
+                e,
+            )
             return
 
         if response_json["success"] is False:
             error_messages = ", ".join(
                 [str(err["message"]) for err in response_json["errors"]]
             )
-            for url in urls:
+            for item in items:
                 logger.error(
                     "Couldn't purge '%s' from Cloudflare. Cloudflare errors '%s'",
-                    url,
+                    item,
                     error_messages,
                 )
-            return
+            # Cloudflare also reports rate limiting in this way, with a 429
+            self._raise_purge_error(
+                PurgeError(
+                    f"Cloudflare errors '{error_messages}'",
+                    retryable=is_retryable_status(response.status_code),
+                )
+            )
 
     def purge_batch(self, urls):
         # Break the batched URLs in to chunks to fit within Cloudflare's maximum size for
         # the purge_cache call (https://api.cloudflare.com/#zone-purge-files-by-url)
-        for i in range(0, len(urls), self.CHUNK_SIZE):
-            chunk = urls[i : i + self.CHUNK_SIZE]
-            self._purge_urls(chunk)
+        self._purge_each(
+            self._purge_urls,
+            [
+                urls[i : i + self.CHUNK_SIZE]
+                for i in range(0, len(urls), self.CHUNK_SIZE)
+            ],
+        )
 
     def purge(self, url):
         self._purge_urls([url])
+
+    def purge_tags(self, tags):
+        # Cloudflare applies the same limit to the number of tags in a single
+        # purge_cache call (Enterprise zones only)
+        self._purge_each(
+            self._purge_tags,
+            [
+                tags[i : i + self.CHUNK_SIZE]
+                for i in range(0, len(tags), self.CHUNK_SIZE)
+            ],
+        )
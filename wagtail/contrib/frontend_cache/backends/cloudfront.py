@@ -5,15 +5,21 @@ from urllib.parse import urlparse
 
 from django.core.exceptions import ImproperlyConfigured
 
-from .base import BaseBackend
+from .base import BaseBackend, PurgeError, is_retryable_status
 
 logger = logging.getLogger("wagtail.frontendcache")
 
 
 __all__ = ["CloudfrontBackend"]
 
+# CloudFront reports these with a 400 status, but they clear up over time
+RETRYABLE_ERROR_CODES = {"Throttling", "TooManyInvalidationsInProgress"}
+
 
 class CloudfrontBackend(BaseBackend):
+    # The maximum number of paths in a single invalidation batch
+    batch_size = 3000
+
     def __init__(self, params):
         import boto3
 
@@ -66,11 +72,25 @@ class CloudfrontBackend(BaseBackend):
                 },
             )
         except botocore.exceptions.ClientError as e:
+            error_code = e.response["Error"]["Code"]
             for path in paths:
                 logger.error(
                     "Couldn't purge path '%s' from CloudFront (DistributionId=%s). ClientError: %s %s",
                     path,
                     distribution_id,
-                    e.response["Error"]["Code"],
+                    error_code,
                     e.response["Error"]["Message"],
                 )
+            status_code = e.response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+            self._raise_purge_error(
+                PurgeError(
+                    f"ClientError: {error_code}",
+                    retryable=(
+                        error_code in RETRYABLE_ERROR_CODES
+                        or (
+                            status_code is not None and is_retryable_status(status_code)
+                        )
+                    ),
+                ),
+                e,
+            )
@@ -5,7 +5,7 @@ from urllib.request import Request, urlopen
 
 from wagtail import __version__
 
-from .base import BaseBackend
+from .base import BaseBackend, PurgeError, is_retryable_status
 
 logger = logging.getLogger("wagtail.frontendcache")
 
@@ -58,7 +58,15 @@ class HTTPBackend(BaseBackend):
                 e.code,
                 e.reason,
             )
+            self._raise_purge_error(
+                PurgeError(
+                    f"HTTPError: {e.code} {e.reason}",
+                    retryable=is_retryable_status(e.code),
+                ),
+                e,
+            )
         except URLError as e:
             logger.error(
                 "Couldn't purge '%s' from HTTP cache. URLError: %s", url, e.reason
             )
+            self._raise_purge_error(PurgeError(f"URLError: {e.reason}"), e)
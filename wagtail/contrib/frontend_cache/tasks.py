@@ -1,13 +1,16 @@
 import logging
 import re
 from collections import defaultdict
+from datetime import timedelta
 from urllib.parse import urlsplit, urlunsplit
 
 from django.conf import settings
+from django.utils import timezone
 from django_tasks import task
 
 from wagtail.coreutils import get_content_languages
 
+from .backends.base import PurgeError
 from .utils import get_backends
 
 logger = logging.getLogger("wagtail.frontendcache")
@@ -80,4 +83,93 @@ def purge_urls_from_cache_task(urls, backend_settings=None, backends=None):
             for url in urls:
                 logger.info("[%s] Purging URL: %s", backend_name, url)
 
+            for batch in backend.get_batches(urls):
+                _purge_with_retry(backend_name, backend, backend_settings, urls=batch)
+
+
+@task()
+def purge_tags_from_cache_task(tags, backend_settings=None, backends=None):
+    if not tags:
+        return
+
+    for backend_name, backend in get_backends(backend_settings, backends).items():
+        if not backend.supports_tags:
+            continue
+
+        for tag in tags:
+            logger.info("[%s] Purging tag: %s", backend_name, tag)
+
+        for batch in backend.get_batches(tags):
+            _purge_with_retry(backend_name, backend, backend_settings, tags=batch)
+
+
+@task()
+def retry_purge_task(
+    backend_name, backend_settings=None, urls=None, tags=None, attempt=1
+):
+    backend = get_backends(backend_settings, [backend_name]).get(backend_name)
+
+    # The backend may have been removed from the settings since the purge failed
+    if backend is None:
+        return
+
+    _purge_with_retry(backend_name, backend, backend_settings, urls, tags, attempt)
+
+
+def _purge_with_retry(
+    backend_name, backend, backend_settings, urls=None, tags=None, attempt=0
+):
+    """
+    Send a single batch of URLs or tags to the backend. If this fails, the
+    batch is retried in a new task with exponential backoff, up to
+    WAGTAILFRONTENDCACHE_PURGE_RETRIES times, unless the backend reports that
+    retrying won't help.
+    """
+    backend.raise_errors = True
+    try:
+        if urls:
             backend.purge_batch(urls)
+        if tags:
+            backend.purge_tags(tags)
+    except PurgeError as e:
+        if not e.retryable:
+            logger.error(
+                "[%s] Couldn't purge %d URL(s) and %d tag(s): %s",
+                backend_name,
+                len(urls or ()),
+                len(tags or ()),
+                e,
+            )
+            return
+        _retry_purge(backend_name, backend_settings, urls, tags, attempt)
+    except Exception:  # noqa: BLE001
+        _retry_purge(backend_name, backend_settings, urls, tags, attempt)
+
+
+def _retry_purge(backend_name, backend_settings, urls, tags, attempt):
+    """
+    Enqueue a retry of a failed purge, or give up once
+    WAGTAILFRONTENDCACHE_PURGE_RETRIES retries have been made
+    """
+    max_retries = getattr(settings, "WAGTAILFRONTENDCACHE_PURGE_RETRIES", 3)
+    if attempt >= max_retries:
+        logger.exception(
+            "[%s] Couldn't purge %d URL(s) and %d tag(s) after %d attempt(s)",
+            backend_name,
+            len(urls or ()),
+            len(tags or ()),
+            attempt + 1,
+        )
+        return
+
+    delay = getattr(settings, "WAGTAILFRONTENDCACHE_PURGE_RETRY_DELAY", 10) * (
+        2**attempt
+    )
+    logger.warning("[%s] Purge failed, retrying in %d seconds", backend_name, delay)
+
+    retry_task = retry_purge_task
+    if retry_task.get_backend().supports_defer:
+        retry_task = retry_task.using(
+            run_after=timezone.now() + timedelta(seconds=delay)
+        )
+    retry_task.enqueue(backend_name, backend_settings, urls, tags, attempt + 1)
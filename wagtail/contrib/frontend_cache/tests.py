@@ -5,6 +5,7 @@ import requests
 from azure.mgmt.cdn import CdnManagementClient
 from azure.mgmt.frontdoor import FrontDoorManagementClient
 from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
 from django.test import SimpleTestCase, TestCase
 from django.test.utils import override_settings
 
@@ -15,6 +16,7 @@ from wagtail.contrib.frontend_cache.backends import (
     CloudflareBackend,
     CloudfrontBackend,
     HTTPBackend,
+    PurgeError,
 )
 from wagtail.contrib.frontend_cache.utils import get_backends
 from wagtail.models import Page
@@ -24,6 +26,7 @@ from .utils import (
     PurgeBatch,
     purge_page_from_cache,
     purge_pages_from_cache,
+    purge_tags_from_cache,
     purge_url_from_cache,
     purge_urls_from_cache,
 )
@@ -302,6 +305,52 @@ class TestBackendConfiguration(SimpleTestCase):
             log_output.output[0],
         )
 
+    @mock.patch("wagtail.contrib.frontend_cache.backends.http.urlopen")
+    def test_http_error_raised_with_raise_errors(self, urlopen_mock):
+        backend = HTTPBackend({"LOCATION": "http://localhost:8000"})
+        backend.raise_errors = True
+        urlopen_mock.side_effect = HTTPError(
+            url="http://localhost:8000/",
+            code=429,
+            msg="Too Many Requests",
+            hdrs={},
+            fp=None,
+        )
+
+        with self.assertLogs(level="ERROR"), self.assertRaises(PurgeError) as cm:
+            backend.purge_batch(
+                ["http://www.wagtail.org/", "http://www.wagtail.org/blog/"]
+            )
+
+        # Both URLs are tried before the failures are reported
+        self.assertEqual(urlopen_mock.call_count, 2)
+        self.assertTrue(cm.exception.retryable)
+
+    @mock.patch("wagtail.contrib.frontend_cache.backends.cloudflare.requests.delete")
+    def test_cloudflare_purge_batch_sends_every_chunk(self, requests_delete_mock):
+        backend = CloudflareBackend({"BEARER_TOKEN": "token", "ZONEID": "zone"})
+        backend.raise_errors = True
+
+        success = mock.Mock(status_code=200)
+        success.json.return_value = {"success": True}
+        failure = mock.Mock(status_code=403)
+        failure.json.return_value = {
+            "success": False,
+            "errors": [{"message": "Authentication error"}],
+        }
+        requests_delete_mock.side_effect = [failure, success, success]
+
+        urls = [f"http://www.wagtail.org/{i}/" for i in range(65)]
+        with self.assertLogs(level="ERROR"), self.assertRaises(PurgeError) as cm:
+            backend.purge_batch(urls)
+
+        self.assertEqual(requests_delete_mock.call_count, 3)
+        self.assertEqual(
+            str(cm.exception),
+            "1 of 3 purge request(s) failed: Cloudflare errors 'Authentication error'",
+        )
+        self.assertFalse(cm.exception.retryable)
+
     @mock.patch("wagtail.contrib.frontend_cache.backends.http.urlopen")
     def _test_http_with_side_effect(self, urlopen_mock, urlopen_side_effect):
         # given a backends configuration with one HTTP backend
@@ -473,6 +522,28 @@ class MockCloudflareBackend(CloudflareBackend):
 
         PURGED_URLS.update(urls)
 
+    def _purge_tags(self, tags):
+        if len(tags) > self.CHUNK_SIZE:
+            raise Exception("Cloudflare backend is not chunking requests as expected")
+
+        PURGED_TAGS.update(tags)
+
+
+PURGED_TAGS = set()
+PURGED_BATCHES = []
+
+
+class MockBatchBackend(BaseBackend):
+    # Fails the first `FAILURES` calls, to test retrying
+    FAILURES = 0
+
+    def purge_batch(self, urls):
+        if MockBatchBackend.FAILURES:
+            MockBatchBackend.FAILURES -= 1
+            raise requests.exceptions.ConnectionError("Connection refused")
+
+        PURGED_BATCHES.append(urls)
+
 
 @override_settings(
     WAGTAILFRONTENDCACHE={
@@ -670,6 +741,272 @@ class TestCloudflareCachePurgingFunctions(TestCase):
         self.assertCountEqual(PURGED_URLS, set(urls))
 
 
+@override_settings(
+    WAGTAILFRONTENDCACHE={
+        "batch": {
+            "BACKEND": "wagtail.contrib.frontend_cache.tests.MockBatchBackend",
+        },
+    },
+    WAGTAILFRONTENDCACHE_PURGE_RETRY_DELAY=0,
+)
+class TestPurgeQueue(TestCase):
+    fixtures = ["test.json"]
+
+    def setUp(self):
+        PURGED_BATCHES.clear()
+        PURGED_TAGS.clear()
+        MockBatchBackend.FAILURES = 0
+
+    def test_purges_in_transaction_are_combined(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            purge_url_from_cache("http://localhost/foo")
+            purge_urls_from_cache(["http://localhost/bar", "http://localhost/foo"])
+            batch = PurgeBatch()
+            batch.add_urls(["http://localhost/baz", "http://localhost/bar"])
+            batch.purge()
+
+            # Nothing is sent until the transaction is committed
+            self.assertEqual(PURGED_BATCHES, [])
+
+        # Only the first flush of the queue enqueues a task. The other callbacks
+        # are the transaction's own hook and the enqueued task
+        self.assertEqual(len(callbacks), 5)
+        self.assertEqual(len(PURGED_BATCHES), 1)
+        self.assertCountEqual(
+            PURGED_BATCHES[0],
+            ["http://localhost/foo", "http://localhost/bar", "http://localhost/baz"],
+        )
+
+    def test_purges_with_different_backends_are_not_combined(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            purge_url_from_cache("http://localhost/foo")
+            purge_url_from_cache("http://localhost/bar", backends=["other"])
+
+        self.assertEqual(PURGED_BATCHES, [["http://localhost/foo"]])
+
+    def test_new_queue_after_flush(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            purge_url_from_cache("http://localhost/foo")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            purge_url_from_cache("http://localhost/bar")
+
+        self.assertEqual(
+            PURGED_BATCHES, [["http://localhost/foo"], ["http://localhost/bar"]]
+        )
+
+    def test_bulk_publish_purges_in_one_batch(self):
+        pages = list(Page.objects.type(EventPage).live().specific())
+        expected_urls = PurgeBatch()
+        expected_urls.add_pages(pages)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            for page in pages:
+                page.save_revision().publish()
+
+        self.assertEqual(len(PURGED_BATCHES), 1)
+        self.assertEqual(set(PURGED_BATCHES[0]), expected_urls.urls)
+
+    @override_settings(
+        WAGTAILFRONTENDCACHE={
+            "batch": {
+                "BACKEND": "wagtail.contrib.frontend_cache.tests.MockBatchBackend",
+                "BATCH_SIZE": 2,
+            },
+        }
+    )
+    def test_batch_size(self):
+        urls = [f"http://localhost/foo{i}" for i in range(5)]
+        with self.captureOnCommitCallbacks(execute=True):
+            purge_urls_from_cache(urls)
+
+        self.assertEqual([len(batch) for batch in PURGED_BATCHES], [2, 2, 1])
+        self.assertEqual(sum(PURGED_BATCHES, []), urls)
+
+    def test_purge_in_rolled_back_savepoint_is_sent(self):
+        with self.captureOnCommitCallbacks(execute=True), transaction.atomic():
+            purge_url_from_cache("http://localhost/foo")
+            try:
+                with transaction.atomic():
+                    purge_url_from_cache("http://localhost/bar")
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+
+            purge_url_from_cache("http://localhost/baz")
+
+        self.assertEqual(
+            PURGED_BATCHES,
+            [["http://localhost/foo", "http://localhost/bar", "http://localhost/baz"]],
+        )
+
+    def test_queue_from_rolled_back_savepoint_is_discarded(self):
+        with self.captureOnCommitCallbacks(execute=True), transaction.atomic():
+            try:
+                with transaction.atomic():
+                    purge_url_from_cache("http://localhost/foo")
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+
+            purge_url_from_cache("http://localhost/bar")
+
+        self.assertEqual(PURGED_BATCHES, [["http://localhost/bar"]])
+
+    def test_queue_from_rolled_back_transaction_is_discarded(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            purge_url_from_cache("http://localhost/foo")
+            # Leave the queue unflushed, as a rolled back transaction would
+            transaction.get_connection().run_on_commit.clear()
+
+        with transaction.atomic():
+            with self.captureOnCommitCallbacks(execute=True):
+                purge_url_from_cache("http://localhost/bar")
+
+        self.assertEqual(PURGED_BATCHES, [["http://localhost/bar"]])
+
+    def test_get_batches(self):
+        backend = MockBatchBackend({"BATCH_SIZE": 3})
+        self.assertEqual(backend.get_batches(range(7)), [[0, 1, 2], [3, 4, 5], [6]])
+        self.assertEqual(backend.get_batches([]), [])
+        self.assertEqual(MockBatchBackend({}).get_batches(range(4)), [[0, 1, 2, 3]])
+
+    def test_batch_limits(self):
+        self.assertEqual(CloudflareBackend.batch_size, 30)
+        self.assertEqual(CloudfrontBackend.batch_size, 3000)
+
+    def test_failed_batch_is_retried(self):
+        MockBatchBackend.FAILURES = 2
+
+        with self.assertLogs("wagtail.frontendcache", level="WARNING") as log_output:
+            with self.captureOnCommitCallbacks(execute=True):
+                purge_url_from_cache("http://localhost/foo")
+
+        self.assertEqual(PURGED_BATCHES, [["http://localhost/foo"]])
+        self.assertEqual(len(log_output.records), 2)
+        self.assertIn("Purge failed, retrying", log_output.output[0])
+
+    @override_settings(
+        WAGTAILFRONTENDCACHE={
+            "varnish": {
+                "BACKEND": "wagtail.contrib.frontend_cache.backends.HTTPBackend",
+                "LOCATION": "http://localhost:8000",
+            },
+        }
+    )
+    @mock.patch("wagtail.contrib.frontend_cache.backends.http.urlopen")
+    def test_rate_limited_purge_is_retried(self, urlopen_mock):
+        urlopen_mock.side_effect = [
+            HTTPError(
+                url="http://localhost:8000/foo",
+                code=429,
+                msg="Too Many Requests",
+                hdrs={},
+                fp=None,
+            ),
+            None,
+        ]
+
+        with self.assertLogs("wagtail.frontendcache", level="WARNING") as log_output:
+            with self.captureOnCommitCallbacks(execute=True):
+                purge_url_from_cache("http://localhost/foo")
+
+        self.assertEqual(urlopen_mock.call_count, 2)
+        self.assertIn("Purge failed, retrying", log_output.output[-1])
+
+    @override_settings(
+        WAGTAILFRONTENDCACHE={
+            "varnish": {
+                "BACKEND": "wagtail.contrib.frontend_cache.backends.HTTPBackend",
+                "LOCATION": "http://localhost:8000",
+            },
+        }
+    )
+    @mock.patch("wagtail.contrib.frontend_cache.backends.http.urlopen")
+    def test_client_error_is_not_retried(self, urlopen_mock):
+        urlopen_mock.side_effect = HTTPError(
+            url="http://localhost:8000/foo",
+            code=403,
+            msg="Forbidden",
+            hdrs={},
+            fp=None,
+        )
+
+        with self.assertLogs("wagtail.frontendcache", level="WARNING") as log_output:
+            with self.captureOnCommitCallbacks(execute=True):
+                purge_url_from_cache("http://localhost/foo")
+
+        self.assertEqual(urlopen_mock.call_count, 1)
+        self.assertEqual(
+            [record.levelname for record in log_output.records], ["ERROR", "ERROR"]
+        )
+        self.assertIn(
+            "Couldn't purge 1 URL(s) and 0 tag(s): 1 of 1 purge request(s) failed: HTTPError: 403 Forbidden",
+            log_output.output[-1],
+        )
+
+    @override_settings(WAGTAILFRONTENDCACHE_PURGE_RETRIES=1)
+    def test_gives_up_after_retries(self):
+        MockBatchBackend.FAILURES = 5
+
+        with self.assertLogs("wagtail.frontendcache", level="WARNING") as log_output:
+            with self.captureOnCommitCallbacks(execute=True):
+                purge_url_from_cache("http://localhost/foo")
+
+        self.assertEqual(PURGED_BATCHES, [])
+        self.assertEqual(MockBatchBackend.FAILURES, 3)
+        self.assertEqual(log_output.records[-1].levelname, "ERROR")
+        self.assertIn(
+            "Couldn't purge 1 URL(s) and 0 tag(s) after 2 attempt(s)",
+            log_output.output[-1],
+        )
+
+    @override_settings(
+        WAGTAILFRONTENDCACHE={
+            "batch": {
+                "BACKEND": "wagtail.contrib.frontend_cache.tests.MockBatchBackend",
+            },
+            "cloudflare": {
+                "BACKEND": "wagtail.contrib.frontend_cache.tests.MockCloudflareBackend",
+                "ZONEID": "zone",
+                "BEARER_TOKEN": "token",
+            },
+        }
+    )
+    def test_purge_tags(self):
+        tags = [f"page-{i}" for i in range(45)]
+        with self.captureOnCommitCallbacks(execute=True):
+            purge_tags_from_cache(tags[:20])
+            batch = PurgeBatch()
+            batch.add_tags(tags[10:])
+            batch.purge()
+
+        # Only backends that support tags are used
+        self.assertEqual(PURGED_TAGS, set(tags))
+        self.assertEqual(PURGED_BATCHES, [])
+
+    @mock.patch("wagtail.contrib.frontend_cache.backends.cloudflare.requests.delete")
+    def test_cloudflare_purge_tags_request(self, requests_delete_mock):
+        requests_delete_mock.return_value.json.return_value = {"success": True}
+        backend = CloudflareBackend({"ZONEID": "zone", "BEARER_TOKEN": "token"})
+
+        backend.purge_tags(["page-1", "page-2"])
+
+        requests_delete_mock.assert_called_once_with(
+            "https://api.cloudflare.com/client/v4/zones/zone/purge_cache",
+            json={"tags": ["page-1", "page-2"]},
+            headers={
+                "Content-Type": "application/json",
+                "Authorization": "Bearer token",
+            },
+        )
+
+    def test_base_backend_does_not_support_tags(self):
+        self.assertFalse(BaseBackend.supports_tags)
+        with self.assertRaises(NotImplementedError):
+            BaseBackend({}).purge_tags(["page-1"])
+
+
 @override_settings(
     WAGTAILFRONTENDCACHE={
         "varnish": {
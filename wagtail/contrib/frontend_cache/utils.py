@@ -1,9 +1,14 @@
 import logging
+from datetime import timedelta
 
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.utils import timezone
 from django.utils.module_loading import import_string
 
+from wagtail.utils.transactions import get_current_transaction
+
 logger = logging.getLogger("wagtail.frontendcache")
 
 
@@ -97,12 +102,114 @@ def purge_urls_from_cache(urls, backend_settings=None, backends=None):
     NOTE: This function also handles internationalization, creating language-specific URLs if
     ``WAGTAILFRONTENDCACHE_LANGUAGES`` is set and ``USE_I18N`` is ``True``.
     """
-    from .tasks import purge_urls_from_cache_task
-
     if not urls:
         return
 
-    purge_urls_from_cache_task.enqueue(list(urls), backend_settings, backends)
+    _queue_purge(backend_settings, backends, urls=urls)
+
+
+def purge_tags_from_cache(tags, backend_settings=None, backends=None):
+    """
+    Purge all cached responses labelled with any of the given tags (also known
+    as surrogate keys or cache tags) from the frontend cache.
+
+    :param tags: An iterable of tags to purge from the cache.
+    :type tags: iterable of str
+    :param backend_settings: Optional custom backend settings to use instead of those defined in ``settings.WAGTAILFRONTENDCACHE``.
+    :type backend_settings: dict, optional
+    :param backends: Optional list of strings referencing specific backends from ``settings.WAGTAILFRONTENDCACHE`` or provided as ``backend_settings``. Can be used to limit purge operations to specific backends.
+    :type backends: list, optional
+
+    Only backends that support tag-based purging (where ``supports_tags`` is
+    ``True``) are used; other backends are skipped.
+    """
+    if not tags:
+        return
+
+    _queue_purge(backend_settings, backends, tags=tags)
+
+
+class PurgeQueue:
+    """
+    Collects the URLs and tags purged during a transaction, so that they can
+    be deduplicated and sent to the task queue in as few tasks as possible
+    once the transaction is committed.
+    """
+
+    def __init__(self):
+        # A list of (backend_settings, backends, urls, tags) entries, where
+        # urls and tags are dicts used as ordered sets
+        self.entries = []
+        self.flushed = False
+
+    def add(self, backend_settings, backends, urls=(), tags=()):
+        for entry in self.entries:
+            if entry[0] == backend_settings and entry[1] == backends:
+                break
+        else:
+            entry = (backend_settings, backends, {}, {})
+            self.entries.append(entry)
+
+        entry[2].update(dict.fromkeys(urls))
+        entry[3].update(dict.fromkeys(tags))
+
+    def flush(self):
+        from .tasks import purge_tags_from_cache_task, purge_urls_from_cache_task
+
+        self.flushed = True
+
+        # The delay only defers this queue's tasks - queues from other
+        # transactions aren't merged into them
+        delay = getattr(settings, "WAGTAILFRONTENDCACHE_PURGE_DELAY", 0)
+
+        for backend_settings, backends, urls, tags in self.entries:
+            if urls:
+                _get_deferred_task(purge_urls_from_cache_task, delay).enqueue(
+                    list(urls), backend_settings, backends
+                )
+            if tags:
+                _get_deferred_task(purge_tags_from_cache_task, delay).enqueue(
+                    list(tags), backend_settings, backends
+                )
+
+        self.entries = []
+
+
+def _get_deferred_task(task, delay):
+    """
+    Return the task set to run after ``delay`` seconds, if the task backend
+    supports it
+    """
+    if delay and task.get_backend().supports_defer:
+        return task.using(run_after=timezone.now() + timedelta(seconds=delay))
+
+    return task
+
+
+def _queue_purge(backend_settings, backends, urls=(), tags=()):
+    current_transaction = get_current_transaction()
+
+    if current_transaction is None:
+        # Nothing else can be purged in the same transaction, so send it now
+        queue = PurgeQueue()
+        queue.add(backend_settings, backends, urls, tags)
+        queue.flush()
+        return
+
+    # Reuse the queue for the current transaction, unless it has already been
+    # flushed. The queue is kept with the transaction, so it's discarded if
+    # the transaction is rolled back
+    queue = getattr(current_transaction, "frontend_cache_purge_queue", None)
+    if queue is None or queue.flushed:
+        queue = PurgeQueue()
+        current_transaction.frontend_cache_purge_queue = queue
+
+    queue.add(backend_settings, backends, urls, tags)
+
+    # The flush is registered for every purge, so that it still happens if
+    # the savepoint that first registered it is rolled back. Only the first
+    # flush to run sends anything
+    transaction.on_commit(queue.flush)
 
 
 def _get_page_cached_urls(page, cache_object=None):
@@ -180,6 +287,7 @@ class PurgeBatch:
 
     def __init__(self, urls=None, *, cache_object=None):
         self.urls = set()
+        self.tags = set()
 
         if urls is not None:
             self.add_urls(urls)
@@ -199,6 +307,13 @@ class PurgeBatch:
         """
         self.urls.update(urls)
 
+    def add_tags(self, tags):
+        """
+        Adds multiple tags (surrogate keys), to be purged from the backends
+        that support tag-based purging
+        """
+        self.tags.update(tags)
+
     def add_page(self, page):
         """
         Adds all URLs for the specified page
@@ -220,7 +335,7 @@ class PurgeBatch:
 
     def purge(self, backend_settings=None, backends=None):
         """
-        Performs the purge of all the URLs in this batch
+        Performs the purge of all the URLs and tags in this batch
 
         This method takes two optional keyword arguments: backend_settings and backends
 
@@ -230,4 +345,5 @@ class PurgeBatch:
         - backends can be set to a list of backend names. When set, the invalidation request
           will only be sent to these backends
         """
-        purge_urls_from_cache(self.urls, backend_settings, backends)
+        if self.urls or self.tags:
+            _queue_purge(backend_settings, backends, urls=self.urls, tags=self.tags)
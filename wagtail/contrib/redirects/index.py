@@ -0,0 +1,206 @@
+import threading
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from wagtail.contrib.redirects.models import Redirect
+from wagtail.utils.transactions import (
+    has_uncommitted_changes,
+    mark_uncommitted_changes,
+)
+
+REDIRECT_INDEX_VERSION_CACHE_KEY = "wagtail_redirect_index_version"
+
+# The Redirect fields needed to construct an instance that can resolve its link
+REDIRECT_INDEX_FIELDS = (
+    "id",
+    "old_path",
+    "site_id",
+    "is_permanent",
+    "redirect_page_id",
+    "redirect_page_route_path",
+    "redirect_link",
+)
+
+
+def _redirect_from_values(values):
+    redirect = Redirect(**dict(zip(REDIRECT_INDEX_FIELDS, values)))
+    redirect._state.adding = False
+    return redirect
+
+
+def _choose_redirect(values_by_site, site_id):
+    """
+    Given a dict of redirect values for a single old_path, keyed by site ID,
+    return the one that applies to the given site - preferring a site-specific
+    redirect over a site-ambivalent one.
+    """
+    if not values_by_site:
+        return None
+    if site_id is not None and site_id in values_by_site:
+        return values_by_site[site_id]
+    if None in values_by_site:
+        return values_by_site[None]
+    if site_id is None and len(values_by_site) == 1:
+        # No site could be determined for the request, but the path only
+        # has one redirect
+        return next(iter(values_by_site.values()))
+    return None
+
+
+class RedirectIndex:
+    """
+    A per-process index of Redirect records, allowing the redirect for a path
+    to be found without a database query.
+
+    In ``"preload"`` mode, every redirect is loaded into memory on first use.
+    In ``"lru"`` mode, the redirects for each requested path are looked up on
+    demand and cached (including misses), up to ``max_size`` paths.
+    """
+
+    def __init__(self, mode="preload", max_size=10000, version=None):
+        self.mode = mode
+        self.max_size = max_size
+        self.version = version
+
+        if mode == "preload":
+            self._redirects = self._query_redirects()
+        elif mode == "lru":
+            self._redirects = OrderedDict()
+            self._lock = threading.Lock()
+        else:
+            raise ValueError(
+                "Unrecognised redirect index mode '%s'. Expected 'preload' or 'lru'."
+                % mode
+            )
+
+    def _query_redirects(self, paths=None):
+        queryset = Redirect.objects.all()
+        if paths is not None:
+            queryset = queryset.filter(old_path__in=paths)
+
+        result = {}
+        for values in queryset.values_list(*REDIRECT_INDEX_FIELDS):
+            result.setdefault(values[1], {})[values[2]] = values
+        return result
+
+    def get_redirects_for_paths(self, paths):
+        """
+        Return a dict mapping each of the given paths to a dict of redirect
+        values keyed by site ID.
+        """
+        if self.mode == "preload":
+            return {path: self._redirects.get(path, {}) for path in paths}
+
+        result = {}
+        missing = []
+        with self._lock:
+            for path in paths:
+                if path in self._redirects:
+                    self._redirects.move_to_end(path)
+                    result[path] = self._redirects[path]
+                else:
+                    missing.append(path)
+
+        if missing:
+            # Fetch all uncached paths in a single query, and remember the
+            # paths without redirects too
+            fetched = self._query_redirects(missing)
+            with self._lock:
+                for path in missing:
+                    result[path] = self._redirects[path] = fetched.get(path, {})
+                    self._redirects.move_to_end(path)
+                while len(self._redirects) > self.max_size:
+                    self._redirects.popitem(last=False)
+
+        return result
+
+    def find(self, site, paths):
+        """
+        Return the Redirect matching the first of ``paths`` that has one for
+        the given site, or None.
+        """
+        paths = [path for path in dict.fromkeys(paths) if "\0" not in path]
+        site_id = site.pk if site else None
+        redirects = self.get_redirects_for_paths(paths)
+        for path in paths:
+            if values := _choose_redirect(redirects[path], site_id):
+                return _redirect_from_values(values)
+        return None
+
+
+_redirect_index = None
+_redirect_index_lock = threading.Lock()
+
+
+def is_redirect_index_enabled():
+    return bool(getattr(settings, "WAGTAILREDIRECTS_INDEX_MODE", None))
+
+
+def get_redirect_index():
+    """
+    Return the process-wide RedirectIndex, rebuilding it if the version key in
+    the shared cache shows that Redirect records have changed since it was built.
+    """
+    global _redirect_index
+
+    mode = getattr(settings, "WAGTAILREDIRECTS_INDEX_MODE", None) or "preload"
+    max_size = getattr(settings, "WAGTAILREDIRECTS_INDEX_MAX_SIZE", 10000)
+
+    if has_uncommitted_changes(REDIRECT_INDEX_VERSION_CACHE_KEY):
+        # Redirects have changed within the current transaction, which may yet
+        # be rolled back, so look up just the requested paths and don't keep them
+        return RedirectIndex(mode="lru", max_size=max_size)
+
+    version = cache.get(REDIRECT_INDEX_VERSION_CACHE_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(REDIRECT_INDEX_VERSION_CACHE_KEY, version, None):
+            # another process set the version first
+            version = cache.get(REDIRECT_INDEX_VERSION_CACHE_KEY, version)
+
+    def is_stale(index):
+        return (
+            index is None
+            or index.version != version
+            or index.mode != mode
+            or index.max_size != max_size
+        )
+
+    index = _redirect_index
+    if is_stale(index):
+        with _redirect_index_lock:
+            index = _redirect_index
+            if is_stale(index):
+                index = RedirectIndex(mode=mode, max_size=max_size, version=version)
+                _redirect_index = index
+
+    return index
+
+
+def clear_redirect_index():
+    """
+    Discard the process-wide RedirectIndex, and bump the shared version key so
+    that all other processes rebuild theirs on their next lookup.
+    """
+
+    global _redirect_index
+
+    # Discard this process's index straight away, and don't keep another one
+    # until the current transaction is over, so that lookups reflect changes
+    # made within it but an index built from them can't outlive a rollback
+    _redirect_index = None
+    mark_uncommitted_changes(REDIRECT_INDEX_VERSION_CACHE_KEY)
+
+    def clear():
+        global _redirect_index
+
+        # Other processes must wait until the change is visible to them, so
+        # that they can't rebuild their index from the old data
+        _redirect_index = None
+        cache.delete(REDIRECT_INDEX_VERSION_CACHE_KEY)
+
+    transaction.on_commit(clear)
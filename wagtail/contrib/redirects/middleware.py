@@ -5,6 +5,10 @@ from django.utils.deprecation import MiddlewareMixin
 from django.utils.encoding import uri_to_iri
 
 from wagtail.contrib.redirects import models
+from wagtail.contrib.redirects.index import (
+    get_redirect_index,
+    is_redirect_index_enabled,
+)
 from wagtail.models import Site
 
 
@@ -25,6 +29,11 @@ def _get_redirect(request, path):
 
 
 def get_redirect(request, path):
+    if is_redirect_index_enabled():
+        return get_redirect_index().find(
+            Site.find_for_request(request), [path, uri_to_iri(path)]
+        )
+
     redirect = _get_redirect(request, path)
     if not redirect:
         # try unencoding the path
@@ -42,21 +51,29 @@ class RedirectMiddleware(MiddlewareMixin):
         # Get the path
         path = models.Redirect.normalise_path(request.get_full_path())
 
-        # Find redirect
-        redirect = get_redirect(request, path)
-        if redirect is None:
-            # Get the path without the query string or params
-            path_without_query = urlparse(path).path
+        # Get the path without the query string or params
+        path_without_query = urlparse(path).path
 
-            if path == path_without_query:
-                # don't try again if we know we will get the same response
-                return response
+        if is_redirect_index_enabled():
+            # Look up every variation of the path at once
+            redirect = get_redirect_index().find(
+                Site.find_for_request(request),
+                [
+                    path,
+                    uri_to_iri(path),
+                    path_without_query,
+                    uri_to_iri(path_without_query),
+                ],
+            )
+        else:
+            # Find redirect
+            redirect = get_redirect(request, path)
 
-            redirect = get_redirect(request, path_without_query)
-            if redirect is None:
-                return response
+            # don't try again if we know we will get the same response
+            if redirect is None and path != path_without_query:
+                redirect = get_redirect(request, path_without_query)
 
-        if redirect.link is None:
+        if redirect is None or redirect.link is None:
             return response
 
         if redirect.is_permanent:
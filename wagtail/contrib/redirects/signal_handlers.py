@@ -9,6 +9,7 @@ from wagtail.contrib.frontend_cache.utils import PurgeBatch
 from wagtail.coreutils import BatchCreator, get_dummy_request
 from wagtail.models import Page, Site
 
+from .index import clear_redirect_index, is_redirect_index_enabled
 from .models import Redirect
 
 logger = logging.getLogger(__name__)
@@ -30,6 +31,11 @@ class BatchRedirectCreator(BatchCreator):
         Redirect.objects.filter(automatically_created=True).filter(clashes_q).delete()
 
     def post_process(self):
+        # bulk_create() doesn't send post_save signals, so the redirect index
+        # must be cleared here
+        if is_redirect_index_enabled():
+            clear_redirect_index()
+
         if not apps.is_installed("wagtail.contrib.frontend_cache"):
             return
 
@@ -43,6 +49,13 @@ class BatchRedirectCreator(BatchCreator):
         batch.purge()
 
 
+def clear_redirect_index_on_change(**kwargs):
+    if kwargs.get("raw", False) or not is_redirect_index_enabled():
+        return
+
+    clear_redirect_index()
+
+
 def autocreate_redirects_on_slug_change(
     instance_before: Page, instance: Page, **kwargs
 ):
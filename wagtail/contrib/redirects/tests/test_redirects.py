@@ -2,6 +2,9 @@ from io import BytesIO
 
 from django.conf import settings
 from django.contrib.auth.models import Permission
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponseNotFound
 from django.test import TestCase, override_settings
 from django.urls import reverse
 from openpyxl.reader.excel import load_workbook
@@ -9,6 +12,10 @@ from openpyxl.reader.excel import load_workbook
 from wagtail.admin.admin_url_finder import AdminURLFinder
 from wagtail.contrib.frontend_cache.tests import PURGED_URLS
 from wagtail.contrib.redirects import models
+from wagtail.contrib.redirects.index import get_redirect_index
+from wagtail.contrib.redirects.middleware import RedirectMiddleware
+from wagtail.contrib.redirects.signal_handlers import BatchRedirectCreator
+from wagtail.coreutils import get_dummy_request
 from wagtail.log_actions import registry as log_registry
 from wagtail.models import Page, Site
 from wagtail.test.routablepage.models import RoutablePageTest
@@ -597,6 +604,133 @@ class TestRedirects(TestCase):
         self.assertIs(redirect.is_permanent, True)
 
 
+@override_settings(WAGTAILREDIRECTS_INDEX_MODE="preload")
+class TestRedirectsWithPreloadedIndex(TestRedirects):
+    pass
+
+
+@override_settings(WAGTAILREDIRECTS_INDEX_MODE="lru")
+class TestRedirectsWithLRUIndex(TestRedirects):
+    pass
+
+
+@override_settings(
+    ALLOWED_HOSTS=["testserver", "localhost"],
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+)
+class TestRedirectIndex(TestCase):
+    fixtures = ["test.json"]
+
+    def setUp(self):
+        cache.clear()
+        self.site = Site.objects.get(is_default_site=True)
+        # Run the commit hooks, so that the redirects are treated as committed
+        with self.captureOnCommitCallbacks(execute=True):
+            models.Redirect.objects.create(old_path="/generic", redirect_link="/a/")
+            models.Redirect.objects.create(
+                old_path="/specific", site=self.site, redirect_link="/b/"
+            )
+
+    def get_redirect(self, path):
+        return get_redirect_index().find(
+            self.site, [models.Redirect.normalise_path(path)]
+        )
+
+    def process_404(self, path):
+        request = get_dummy_request(path=path, site=self.site)
+        # Skip site lookup queries
+        request._wagtail_site = self.site
+        middleware = RedirectMiddleware(lambda request: HttpResponseNotFound())
+        return middleware(request)
+
+    @override_settings(WAGTAILREDIRECTS_INDEX_MODE="preload")
+    def test_preload_mode_not_found_uses_no_queries(self):
+        get_redirect_index()
+        with self.assertNumQueries(0):
+            response = self.process_404("/does-not-exist/?foo=bar")
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(WAGTAILREDIRECTS_INDEX_MODE="preload")
+    def test_preload_mode_redirect_to_url_uses_no_queries(self):
+        get_redirect_index()
+        with self.assertNumQueries(0):
+            response = self.process_404("/generic/?foo=bar")
+        self.assertRedirects(
+            response, "/a/", status_code=301, fetch_redirect_response=False
+        )
+
+    @override_settings(WAGTAILREDIRECTS_INDEX_MODE="lru")
+    def test_lru_mode_caches_misses(self):
+        get_redirect_index()
+
+        # a single query for all variations of a new path
+        with self.assertNumQueries(1):
+            response = self.process_404("/does-not-exist/?foo=bar")
+        self.assertEqual(response.status_code, 404)
+
+        with self.assertNumQueries(0):
+            response = self.process_404("/does-not-exist/?foo=bar")
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(
+        WAGTAILREDIRECTS_INDEX_MODE="lru", WAGTAILREDIRECTS_INDEX_MAX_SIZE=2
+    )
+    def test_lru_mode_max_size(self):
+        self.assertEqual(self.get_redirect("/generic").redirect_link, "/a/")
+        self.assertEqual(self.get_redirect("/specific").redirect_link, "/b/")
+        self.assertIsNone(self.get_redirect("/missing"))
+
+        index = get_redirect_index()
+        self.assertEqual(list(index._redirects), ["/specific", "/missing"])
+
+    @override_settings(WAGTAILREDIRECTS_INDEX_MODE="preload")
+    def test_index_cleared_when_redirect_saved(self):
+        index = get_redirect_index()
+        self.assertIsNone(self.get_redirect("/new"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            models.Redirect.objects.create(old_path="/new", redirect_link="/c/")
+
+        self.assertIsNot(get_redirect_index(), index)
+        self.assertEqual(self.get_redirect("/new").redirect_link, "/c/")
+
+    @override_settings(WAGTAILREDIRECTS_INDEX_MODE="preload")
+    def test_index_cleared_when_redirect_deleted(self):
+        self.assertIsNotNone(self.get_redirect("/generic"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            models.Redirect.objects.filter(old_path="/generic").delete()
+
+        self.assertIsNone(self.get_redirect("/generic"))
+
+    @override_settings(WAGTAILREDIRECTS_INDEX_MODE="preload")
+    def test_index_not_kept_from_rolled_back_transaction(self):
+        get_redirect_index()
+
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                models.Redirect.objects.create(old_path="/new", redirect_link="/c/")
+
+                # The change is visible within the transaction, but the index
+                # built from it isn't kept
+                self.assertEqual(self.get_redirect("/new").redirect_link, "/c/")
+                self.assertIsNot(get_redirect_index(), get_redirect_index())
+                raise RuntimeError
+
+        self.assertIsNone(self.get_redirect("/new"))
+        self.assertIs(get_redirect_index(), get_redirect_index())
+
+    @override_settings(WAGTAILREDIRECTS_INDEX_MODE="preload")
+    def test_index_cleared_on_batch_creation(self):
+        self.assertIsNone(self.get_redirect("/batch"))
+
+        batch = BatchRedirectCreator(max_size=10)
+        batch.add(old_path="/batch", redirect_link="/d/")
+        batch.process()
+
+        self.assertEqual(self.get_redirect("/batch").redirect_link, "/d/")
+
+
 @override_settings(
     CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
 )
@@ -0,0 +1,136 @@
+import gzip
+import tempfile
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files import File
+from django.core.files.storage import InvalidStorageError, default_storage, storages
+from django.core.management.base import BaseCommand, CommandError
+from django.template.loader import render_to_string
+from django.utils.module_loading import import_string
+
+from wagtail.contrib.sitemaps.sitemap_generator import Sitemap
+from wagtail.models import Site
+
+
+def get_sitemap_storage():
+    """
+    Return the storage that pre-generated sitemaps are written to, as set by
+    the ``WAGTAILSITEMAPS_STORAGE`` setting
+    """
+    storage = getattr(settings, "WAGTAILSITEMAPS_STORAGE", default_storage)
+    if isinstance(storage, str):
+        try:
+            # First see if the string is a storage alias
+            storage = storages[storage]
+        except InvalidStorageError:
+            # Otherwise treat the string as a dotted path
+            try:
+                storage = import_string(storage)()
+            except ImportError as e:
+                raise ImproperlyConfigured(
+                    "WAGTAILSITEMAPS_STORAGE must be either a valid storage alias or dotted module path."
+                ) from e
+
+    return storage
+
+
+class Command(BaseCommand):
+    help = (
+        "Writes the sitemap of each site to storage, as a sitemap index and "
+        "gzip-compressed sitemap sections, so that they can be served as static files"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--site",
+            action="append",
+            dest="hostnames",
+            metavar="HOSTNAME",
+            help="Only generate the sitemap of the site with this hostname. Can be passed more than once",
+        )
+        parser.add_argument(
+            "--directory",
+            default="sitemaps",
+            help="The directory in storage to write sitemaps to (default: sitemaps)",
+        )
+
+    def handle(self, **options):
+        self.verbosity = options["verbosity"]
+        self.storage = get_sitemap_storage()
+
+        sites = Site.objects.select_related("root_page").order_by("hostname", "port")
+        if options["hostnames"]:
+            sites = sites.filter(hostname__in=options["hostnames"])
+            if not sites:
+                raise CommandError("No sites found with the given hostnames")
+
+        for site in sites:
+            self.generate_sitemap(site, options["directory"])
+
+    def get_site_directory(self, site, directory):
+        if site.port in (80, 443):
+            return f"{directory}/{site.hostname}"
+        return f"{directory}/{site.hostname}_{site.port}"
+
+    def get_absolute_url(self, site, name):
+        url = self.storage.url(name)
+        if url.startswith("/"):
+            url = site.root_url + url
+        return url
+
+    def generate_sitemap(self, site, directory):
+        directory = self.get_site_directory(site, directory)
+        sitemap = Sitemap(site=site)
+        sitemap.keyset_pagination = True
+        django_site = SimpleNamespace(domain=site.hostname, name=site.site_name)
+
+        # Each section is fetched (by a range of paths), rendered and written
+        # to storage before moving on to the next, so only one is held in memory
+        sections = []
+        for page in sitemap.paginator.page_range:
+            urls = sitemap.get_urls(page=page, site=django_site)
+            name = f"{directory}/sitemap-{page}.xml.gz"
+            self.write_file(
+                name,
+                render_to_string("sitemap.xml", {"urlset": urls}),
+                compress=True,
+            )
+            sections.append(
+                SimpleNamespace(
+                    location=self.get_absolute_url(site, name),
+                    last_mod=getattr(sitemap, "latest_lastmod", None),
+                )
+            )
+            if hasattr(sitemap, "latest_lastmod"):
+                del sitemap.latest_lastmod
+
+        # Remove any sections left over from a previous, larger sitemap
+        page = len(sections) + 1
+        while self.storage.exists(name := f"{directory}/sitemap-{page}.xml.gz"):
+            self.storage.delete(name)
+            page += 1
+
+        name = f"{directory}/sitemap.xml"
+        self.write_file(
+            name, render_to_string("sitemap_index.xml", {"sitemaps": sections})
+        )
+
+        if self.verbosity:
+            self.stdout.write(
+                f"Wrote {name} with {len(sections)} section(s) for {site.hostname}"
+            )
+
+    def write_file(self, name, content, compress=False):
+        with tempfile.TemporaryFile() as file:
+            if compress:
+                with gzip.GzipFile(fileobj=file, mode="wb", mtime=0) as gzip_file:
+                    gzip_file.write(content.encode())
+            else:
+                file.write(content.encode())
+            file.seek(0)
+
+            if self.storage.exists(name):
+                self.storage.delete(name)
+            self.storage.save(name, File(file))
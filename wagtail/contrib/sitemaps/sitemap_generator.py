@@ -1,4 +1,11 @@
+from itertools import islice
+
 from django.contrib.sitemaps import Sitemap as DjangoSitemap
+from django.core.paginator import Paginator
+from django.db import connection
+from django.db.models import F, QuerySet, Window
+from django.db.models.functions import RowNumber
+from django.utils.functional import cached_property
 
 # Note: avoid importing models here. This module is imported from __init__.py
 # which causes it to be loaded early in startup if wagtail.contrib.sitemaps is
@@ -6,9 +13,57 @@ from django.contrib.sitemaps import Sitemap as DjangoSitemap
 # anyhow) leading to an AppRegistryNotReady exception.
 
 
+class PathKeysetPaginator(Paginator):
+    """
+    A paginator for querysets of pages ordered by path, which selects each page
+    of results by a range of paths rather than by an offset, so that later
+    pages are as quick to fetch as the first.
+    """
+
+    @cached_property
+    def boundaries(self):
+        """
+        The path of the first item of each page, found in a single query
+        """
+        paths = (
+            self.object_list.order_by()
+            .annotate(
+                _row_number=Window(RowNumber(), order_by=F("path").asc()),
+                _page_offset=(F("_row_number") - 1) % self.per_page,
+            )
+            .filter(_page_offset=0)
+            .values_list("path", flat=True)
+        )
+        return sorted(paths)
+
+    @cached_property
+    def num_pages(self):
+        if not self.boundaries and not self.allow_empty_first_page:
+            return 0
+        return max(len(self.boundaries), 1)
+
+    def page(self, number):
+        number = self.validate_number(number)
+        object_list = self.object_list
+        if self.boundaries:
+            object_list = object_list.filter(path__gte=self.boundaries[number - 1])
+            if number < len(self.boundaries):
+                object_list = object_list.filter(path__lt=self.boundaries[number])
+        return self._get_page(object_list, number, self)
+
+
 class Sitemap(DjangoSitemap):
-    def __init__(self, request=None):
+    # The number of pages whose URLs are found together
+    url_chunk_size = 2000
+
+    # Whether to split the pages into sections by ranges of path. Finding the
+    # first path of each section takes a query over all of the pages, which is
+    # only worth it when every section is generated, as by generate_sitemaps
+    keyset_pagination = False
+
+    def __init__(self, request=None, site=None):
         self.request = request
+        self.site = site
 
     def location(self, obj):
         return obj.get_full_url(self.request)
@@ -21,6 +76,9 @@ class Sitemap(DjangoSitemap):
     def get_wagtail_site(self):
         from wagtail.models import Site
 
+        if self.site is not None:
+            return self.site
+
         site = Site.find_for_request(self.request)
         if site is None:
             return Site.objects.select_related("root_page").get(is_default_site=True)
@@ -37,14 +95,64 @@ class Sitemap(DjangoSitemap):
             .specific()
         )
 
+    @property
+    def paginator(self):
+        from wagtail.models import Page
+
+        # Keep the keyset paginator, so that the boundaries of the sections
+        # are only found once for each sitemap
+        if paginator := getattr(self, "_keyset_paginator", None):
+            return paginator
+
+        items = self._items()
+        if (
+            self.keyset_pagination
+            and isinstance(items, QuerySet)
+            and issubclass(items.model, Page)
+            and items.query.order_by == ("path",)
+            and connection.features.supports_over_clause
+        ):
+            self._keyset_paginator = PathKeysetPaginator(items, self.limit)
+            return self._keyset_paginator
+        return Paginator(items, self.limit)
+
+    def get_sitemap_urls_for_pages(self, pages):
+        """
+        Return the sitemap entries of the given pages, finding the URLs of those
+        that don't customise their sitemap entries in bulk
+        """
+        from wagtail.models import Page
+
+        urls = Page.get_urls_for_pages(
+            [
+                page
+                for page in pages
+                if type(page).get_sitemap_urls is Page.get_sitemap_urls
+            ],
+            request=self.request,
+        )
+
+        for page in pages:
+            if page.pk not in urls:
+                yield from page.get_sitemap_urls(self.request)
+                continue
+
+            yield {
+                "location": urls[page.pk][1],
+                # fall back on latest_revision_created_at if last_published_at is null
+                # (for backwards compatibility from before last_published_at was added)
+                "lastmod": (page.last_published_at or page.latest_revision_created_at),
+            }
+
     def _urls(self, page, protocol, domain):
         urls = []
         last_mods = set()
 
-        for item in self.paginator.page(page).object_list.iterator():
-            url_info_items = item.get_sitemap_urls(self.request)
-
-            for url_info in url_info_items:
+        items = self.paginator.page(page).object_list.iterator(
+            chunk_size=self.url_chunk_size
+        )
+        while chunk := list(islice(items, self.url_chunk_size)):
+            for url_info in self.get_sitemap_urls_for_pages(chunk):
                 urls.append(url_info)
                 last_mods.add(url_info.get("lastmod"))
 
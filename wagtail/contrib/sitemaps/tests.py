@@ -1,15 +1,22 @@
 import datetime
+import gzip
+import shutil
+import tempfile
+from io import StringIO
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.sites.shortcuts import get_current_site
+from django.core.files.storage import FileSystemStorage
+from django.core.management import call_command
+from django.core.paginator import Paginator
 from django.test import RequestFactory, TestCase, override_settings
 from django.utils import timezone
 
 from wagtail.models import Page, PageViewRestriction, Site
 from wagtail.test.testapp.models import EventIndex, SimplePage
 
-from .sitemap_generator import Sitemap
+from .sitemap_generator import PathKeysetPaginator, Sitemap
 
 
 class TestSitemapGenerator(TestCase):
@@ -106,7 +113,7 @@ class TestSitemapGenerator(TestCase):
         req_protocol = request.scheme
 
         sitemap = Sitemap()
-        with self.assertNumQueries(17):
+        with self.assertNumQueries(15):
             urls = [
                 url["location"]
                 for url in sitemap.get_urls(1, django_site, req_protocol)
@@ -139,7 +146,7 @@ class TestSitemapGenerator(TestCase):
         req_protocol = request.scheme
 
         sitemap = Sitemap()
-        with self.assertNumQueries(19):
+        with self.assertNumQueries(17):
             urls = [
                 url["location"]
                 for url in sitemap.get_urls(1, django_site, req_protocol)
@@ -258,6 +265,86 @@ class TestSitemapGenerator(TestCase):
         self.assertIn(self.other_site_homepage.page_ptr.specific, pages)
         self.assertNotIn(self.child_page.page_ptr.specific, pages)
 
+    def test_keyset_paginator_matches_offset_paginator(self):
+        items = Page.objects.order_by("path")
+        keyset_paginator = PathKeysetPaginator(items, 2)
+        offset_paginator = Paginator(items, 2)
+
+        self.assertEqual(keyset_paginator.num_pages, offset_paginator.num_pages)
+        for number in offset_paginator.page_range:
+            self.assertEqual(
+                list(keyset_paginator.page(number).object_list),
+                list(offset_paginator.page(number).object_list),
+            )
+
+    def test_keyset_paginator_empty(self):
+        paginator = PathKeysetPaginator(Page.objects.none().order_by("path"), 2)
+
+        self.assertEqual(paginator.num_pages, 1)
+        self.assertEqual(list(paginator.page(1).object_list), [])
+
+    def test_get_urls_uses_keyset_paginator(self):
+        request, django_site = self.get_request_and_django_site("/sitemap.xml")
+        sitemap = Sitemap(site=self.site)
+        sitemap.keyset_pagination = True
+        sitemap.limit = 2
+
+        self.assertIsInstance(sitemap.paginator, PathKeysetPaginator)
+        urls = [
+            url["location"]
+            for page in sitemap.paginator.page_range
+            for url in sitemap.get_urls(page, django_site)
+        ]
+
+        self.assertEqual(
+            urls,
+            [page.get_full_url() for page in sitemap.items()],
+        )
+
+    def test_sitemap_view_uses_offset_paginator(self):
+        request, django_site = self.get_request_and_django_site("/sitemap.xml")
+        sitemap = Sitemap(request)
+
+        self.assertNotIsInstance(sitemap.paginator, PathKeysetPaginator)
+
+    def test_sitemap_urls_match_get_full_url(self):
+        request, django_site = self.get_request_and_django_site("/sitemap.xml")
+        sitemap = Sitemap(request)
+        pages = list(Page.objects.live().specific())
+
+        self.assertEqual(
+            [url["location"] for url in sitemap.get_sitemap_urls_for_pages(pages)],
+            [page.get_full_url(request) for page in pages],
+        )
+
+    @override_settings(
+        ROOT_URLCONF="wagtail.test.urls_multilang",
+        LANGUAGE_CODE="en",
+        WAGTAIL_I18N_ENABLED=True,
+        LANGUAGES=[("en", "English"), ("fr", "French")],
+        WAGTAIL_CONTENT_LANGUAGES=[("en", "English"), ("fr", "French")],
+    )
+    def test_sitemap_urls_match_get_full_url_with_i18n(self):
+        request, django_site = self.get_request_and_django_site("/sitemap.xml")
+        sitemap = Sitemap(request)
+        pages = list(Page.objects.live().specific())
+
+        self.assertEqual(
+            [url["location"] for url in sitemap.get_sitemap_urls_for_pages(pages)],
+            [page.get_full_url(request) for page in pages],
+        )
+
+    def test_sitemap_urls_use_custom_sitemap_urls(self):
+        event_index = self.home_page.add_child(
+            instance=EventIndex(title="Events", slug="events", live=True)
+        )
+        sitemap = Sitemap()
+
+        self.assertEqual(
+            list(sitemap.get_sitemap_urls_for_pages([event_index])),
+            event_index.get_sitemap_urls(),
+        )
+
 
 class TestIndexView(TestCase):
     def test_index_view(self):
@@ -284,3 +371,79 @@ class TestSitemapView(TestCase):
 
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response["Content-Type"], "application/xml")
+
+
+class TestGenerateSitemapsCommand(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.storage = FileSystemStorage(location=self.directory, base_url="/media/")
+
+        home_page = Page.objects.get(id=2)
+        for i in range(3):
+            home_page.add_child(
+                instance=SimplePage(
+                    title=f"Page {i}", slug=f"page-{i}", content="hello", live=True
+                )
+            )
+
+    def call_command(self, *args):
+        with override_settings(WAGTAILSITEMAPS_STORAGE=self.storage):
+            call_command("generate_sitemaps", *args, stdout=StringIO())
+
+    def read_section(self, name):
+        with self.storage.open(name) as f:
+            return gzip.decompress(f.read()).decode()
+
+    def test_generate_sitemaps(self):
+        self.call_command()
+
+        with self.storage.open("sitemaps/localhost/sitemap.xml") as f:
+            index = f.read().decode()
+        self.assertIn(
+            "<loc>http://localhost/media/sitemaps/localhost/sitemap-1.xml.gz</loc>",
+            index,
+        )
+
+        section = self.read_section("sitemaps/localhost/sitemap-1.xml.gz")
+        self.assertIn("<loc>http://localhost/</loc>", section)
+        for i in range(3):
+            self.assertIn(f"<loc>http://localhost/page-{i}/</loc>", section)
+
+    def test_generate_sitemaps_in_sections(self):
+        original_limit = Sitemap.limit
+        Sitemap.limit = 2
+        self.addCleanup(setattr, Sitemap, "limit", original_limit)
+        self.call_command()
+
+        self.assertTrue(self.storage.exists("sitemaps/localhost/sitemap-2.xml.gz"))
+        self.assertIn(
+            "<loc>http://localhost/page-2/</loc>",
+            self.read_section("sitemaps/localhost/sitemap-2.xml.gz"),
+        )
+
+        # Sections left over from a larger sitemap are removed
+        Sitemap.limit = original_limit
+        self.call_command()
+
+        self.assertTrue(self.storage.exists("sitemaps/localhost/sitemap-1.xml.gz"))
+        self.assertFalse(self.storage.exists("sitemaps/localhost/sitemap-2.xml.gz"))
+
+    def test_generate_sitemaps_for_site(self):
+        root_page = Page.objects.get(depth=1)
+        other_homepage = root_page.add_child(
+            instance=SimplePage(
+                title="Another site", slug="another-site", content="bonjour", live=True
+            )
+        )
+        Site.objects.create(
+            hostname="other.example.com", port=8080, root_page=other_homepage
+        )
+
+        self.call_command("--site", "other.example.com")
+
+        self.assertFalse(self.storage.exists("sitemaps/localhost/sitemap.xml"))
+        self.assertIn(
+            "<loc>http://other.example.com:8080/</loc>",
+            self.read_section("sitemaps/other.example.com_8080/sitemap-1.xml.gz"),
+        )
@@ -170,6 +170,123 @@ class TestServeView(TestCase):
     def test_has_etag_header(self):
         self.assertEqual(self.get()["ETag"], '"123456"')
 
+    def get_range(self, range_header, document=None, **headers):
+        document = document or self.document
+        self.response = self.client.get(
+            reverse("wagtaildocs_serve", args=(document.id, document.filename)),
+            headers={"range": range_header, **headers},
+        )
+        return self.response
+
+    def test_accept_ranges_header(self):
+        self.assertEqual(self.get()["Accept-Ranges"], "bytes")
+
+    def test_range(self):
+        response = self.get_range("bytes=2-7")
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], "bytes 2-7/25")
+        self.assertEqual(response["Content-Length"], "6")
+        self.assertEqual(response["Content-Type"], "application/msword")
+        self.assertEqual(response["ETag"], '"123456"')
+        self.assertEqual(
+            response["Content-Disposition"],
+            f'attachment; filename="{self.document.filename}"',
+        )
+        self.assertEqual(b"".join(response.streaming_content), b"boring")
+
+    def test_suffix_range(self):
+        response = self.get_range("bytes=-8")
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], "bytes 17-24/25")
+        self.assertEqual(b"".join(response.streaming_content), b"document")
+
+    def test_open_ended_range(self):
+        response = self.get_range("bytes=17-")
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], "bytes 17-24/25")
+        self.assertEqual(b"".join(response.streaming_content), b"document")
+
+    def test_multiple_ranges(self):
+        response = self.get_range("bytes=0-0, 2-7")
+
+        self.assertEqual(response.status_code, 206)
+        content_type, _, boundary = response["Content-Type"].partition("; boundary=")
+        self.assertEqual(content_type, "multipart/byteranges")
+
+        content = b"".join(response.streaming_content)
+        self.assertEqual(int(response["Content-Length"]), len(content))
+        self.assertEqual(
+            content.decode(),
+            f"\r\n--{boundary}\r\n"
+            "Content-Type: application/msword\r\n"
+            "Content-Range: bytes 0-0/25\r\n\r\n"
+            "A"
+            f"\r\n--{boundary}\r\n"
+            "Content-Type: application/msword\r\n"
+            "Content-Range: bytes 2-7/25\r\n\r\n"
+            "boring"
+            f"\r\n--{boundary}--\r\n",
+        )
+
+    def test_unsatisfiable_range(self):
+        response = self.get_range("bytes=100-200")
+
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], "bytes */25")
+        del self.response
+
+    def test_invalid_range_is_ignored(self):
+        response = self.get_range("bytes=7-2")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            b"".join(response.streaming_content), b"A boring example document"
+        )
+
+    def test_range_with_matching_if_range(self):
+        response = self.get_range("bytes=2-7", if_range='"123456"')
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b"".join(response.streaming_content), b"boring")
+
+    def test_range_with_outdated_if_range(self):
+        response = self.get_range("bytes=2-7", if_range='"654321"')
+
+        # The document has changed, so the whole of it is served
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            b"".join(response.streaming_content), b"A boring example document"
+        )
+
+    @mock.patch("wagtail.documents.views.serve.hooks")
+    @mock.patch("wagtail.documents.views.serve.get_object_or_404")
+    def test_non_local_filesystem_range(self, mock_get_object_or_404, mock_hooks):
+        # Create a mock document with no local file to hit the correct code path
+        mock_doc = mock.Mock()
+        mock_doc.filename = self.document.filename
+        mock_doc.content_type = self.document.content_type
+        mock_doc.content_disposition = self.document.content_disposition
+        mock_doc.file_hash = self.document.file_hash
+        mock_doc.file = ContentFile(b"0123456789" * 10)
+        mock_doc.file.path = None
+        mock_doc.file.url = None
+        mock_get_object_or_404.return_value = mock_doc
+
+        # Bypass 'before_serve_document' hooks
+        mock_hooks.get_hooks.return_value = []
+
+        response = self.get_range("bytes=95-, 10-12", if_range='"123456"')
+
+        self.assertEqual(response.status_code, 206)
+        content = b"".join(response.streaming_content)
+        self.assertEqual(int(response["Content-Length"]), len(content))
+        self.assertIn(b"Content-Range: bytes 95-99/100\r\n\r\n56789", content)
+        self.assertIn(b"Content-Range: bytes 10-12/100\r\n\r\n012", content)
+        self.assertEqual(response["Content-Security-Policy"], "default-src 'none'")
+
     def clear_sendfile_cache(self):
         from wagtail.utils.sendfile import _get_sendfile
 
@@ -1,9 +1,11 @@
+from functools import partial
+
 from django.conf import settings
 from django.http import FileResponse, Http404, HttpResponse
 from django.shortcuts import get_object_or_404, redirect
 from django.template.response import TemplateResponse
 from django.urls import reverse
-from django.utils.http import url_has_allowed_host_and_scheme
+from django.utils.http import quote_etag, url_has_allowed_host_and_scheme
 from django.views.decorators.http import etag
 
 from wagtail import hooks
@@ -12,6 +14,7 @@ from wagtail.documents.models import document_served
 from wagtail.forms import PasswordViewRestrictionForm
 from wagtail.models import CollectionViewRestriction
 from wagtail.utils import sendfile_streaming_backend
+from wagtail.utils.ranges import get_range_response
 from wagtail.utils.sendfile import sendfile
 
 
@@ -22,7 +25,7 @@ def document_etag(request, document_id, document_filename):
             Document.objects.filter(id=document_id)
             .values_list("file_hash", flat=True)
             .first()
-        )
+        ) or None
 
 
 @etag(document_etag)
@@ -74,9 +77,16 @@ def serve(request, document_id, document_filename):
         # backwards compatibility behaviour.
         return redirect(direct_url)
 
+    # Range requests conditional on If-Range are validated against a strong
+    # ETag derived from the file's contents
+    etag = None
+    if "if-range" in request.headers and getattr(doc, "file_hash", None):
+        etag = quote_etag(doc.file_hash)
+
     if local_path:
         # Use wagtail.utils.sendfile to serve the file;
-        # this provides support for mimetypes, if-modified-since and django-sendfile backends
+        # this provides support for mimetypes, if-modified-since, range requests
+        # and django-sendfile backends
 
         sendfile_opts = {
             "attachment": (doc.content_disposition != "inline"),
@@ -85,7 +95,9 @@ def serve(request, document_id, document_filename):
         }
         if not hasattr(settings, "SENDFILE_BACKEND"):
             # Fallback to streaming backend if user hasn't specified SENDFILE_BACKEND
-            sendfile_opts["backend"] = sendfile_streaming_backend.sendfile
+            sendfile_opts["backend"] = partial(
+                sendfile_streaming_backend.sendfile, etag=etag
+            )
 
         response = sendfile(request, local_path, **sendfile_opts)
 
@@ -94,16 +106,22 @@ def serve(request, document_id, document_filename):
         # (e.g. storages.backends.s3boto.S3BotoStorage) AND the developer has not allowed
         # redirecting to the file url directly.
         # Fall back on pre-sendfile behaviour of reading the file content and serving it
-        # as a FileResponse
-        response = FileResponse(doc.file, doc.content_type)
+        # as a FileResponse, or just the requested byte ranges of it
+        doc.file.open("rb")
+        # FIXME: storage backends are not guaranteed to implement 'size'
+        file_size = doc.file.size
+        response = get_range_response(
+            request, doc.file, file_size, doc.content_type, etag=etag
+        )
+        if response is None:
+            response = FileResponse(doc.file, doc.content_type)
+            response["Content-Length"] = file_size
+            response["Accept-Ranges"] = "bytes"
 
         # set filename and filename* to handle non-ascii characters in filename
         # see https://developer.mozilla.org/en-US/docs/Web/HTTP/Headers/Content-Disposition
         response["Content-Disposition"] = doc.content_disposition
 
-        # FIXME: storage backends are not guaranteed to implement 'size'
-        response["Content-Length"] = doc.file.size
-
     # Add a CSP header to prevent inline execution
     if getattr(settings, "WAGTAILDOCS_BLOCK_EMBEDDED_CONTENT", True):
         response["Content-Security-Policy"] = "default-src 'none'"
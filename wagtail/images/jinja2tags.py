@@ -1,4 +1,5 @@
 from django import template
+from jinja2 import pass_context
 from jinja2.ext import Extension
 
 from .models import Filter, Picture, ResponsiveImage
@@ -6,7 +7,7 @@ from .shortcuts import get_rendition_or_not_found, get_renditions_or_not_found
 from .templatetags.wagtailimages_tags import image_url
 
 
-def image(image, filterspec, **attrs):
+def _image(image, filterspec, attrs, request=None):
     if not image:
         return ""
 
@@ -16,7 +17,7 @@ def image(image, filterspec, **attrs):
             "(given filter: {})".format(filterspec)
         )
 
-    rendition = get_rendition_or_not_found(image, filterspec)
+    rendition = get_rendition_or_not_found(image, filterspec, request=request)
 
     if attrs:
         return rendition.img_tag(attrs)
@@ -24,7 +25,7 @@ def image(image, filterspec, **attrs):
         return rendition
 
 
-def srcset_image(image, filterspec, **attrs):
+def _srcset_image(image, filterspec, attrs, request=None):
     if not image:
         return ""
 
@@ -35,12 +36,12 @@ def srcset_image(image, filterspec, **attrs):
         )
 
     specs = Filter.expand_spec(filterspec)
-    renditions = get_renditions_or_not_found(image, specs)
+    renditions = get_renditions_or_not_found(image, specs, request=request)
 
     return ResponsiveImage(renditions, attrs)
 
 
-def picture(image, filterspec, **attrs):
+def _picture(image, filterspec, attrs, request=None):
     if not image:
         return ""
 
@@ -51,21 +52,52 @@ def picture(image, filterspec, **attrs):
         )
 
     specs = Filter.expand_spec(filterspec)
-    renditions = get_renditions_or_not_found(image, specs)
+    renditions = get_renditions_or_not_found(image, specs, request=request)
 
     return Picture(renditions, attrs)
 
 
+def image(image, filterspec, **attrs):
+    return _image(image, filterspec, attrs)
+
+
+def srcset_image(image, filterspec, **attrs):
+    return _srcset_image(image, filterspec, attrs)
+
+
+def picture(image, filterspec, **attrs):
+    return _picture(image, filterspec, attrs)
+
+
+# The versions registered with the environment share renditions across the
+# request being rendered, if there is one in the template context
+
+
+@pass_context
+def image_in_context(context, image, filterspec, **attrs):
+    return _image(image, filterspec, attrs, request=context.get("request"))
+
+
+@pass_context
+def srcset_image_in_context(context, image, filterspec, **attrs):
+    return _srcset_image(image, filterspec, attrs, request=context.get("request"))
+
+
+@pass_context
+def picture_in_context(context, image, filterspec, **attrs):
+    return _picture(image, filterspec, attrs, request=context.get("request"))
+
+
 class WagtailImagesExtension(Extension):
     def __init__(self, environment):
         super().__init__(environment)
 
         self.environment.globals.update(
             {
-                "image": image,
+                "image": image_in_context,
                 "image_url": image_url,
-                "srcset_image": srcset_image,
-                "picture": picture,
+                "srcset_image": srcset_image_in_context,
+                "picture": picture_in_context,
             }
         )
 
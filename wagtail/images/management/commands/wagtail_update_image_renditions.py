@@ -1,9 +1,16 @@
+import concurrent.futures
 import logging
+import os
 
-from django.core.management.base import BaseCommand
-from django.db import transaction
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.template import TemplateDoesNotExist, TemplateSyntaxError, engines
+from django.template.backends.django import DjangoTemplates
 
 from wagtail.images import get_image_model
+from wagtail.images.exceptions import InvalidFilterSpecError
+from wagtail.images.models import Filter
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +26,62 @@ def progress_bar(current, total, bar_length=50):
     return (f"Progress: [{arrow}{padding}] {int(fraction * 100)}%", ending)
 
 
+def get_template_filter_specs():
+    """
+    Return the filter specs used by image tags in all Django templates that
+    can be found by the configured template engines.
+    """
+    from wagtail.images.templatetags.wagtailimages_tags import (
+        ImageNode,
+        SrcsetImageNode,
+    )
+
+    filter_specs = set()
+    for engine in engines.all():
+        if not isinstance(engine, DjangoTemplates):
+            continue
+
+        for template_dir in engine.template_dirs:
+            for dirpath, _, filenames in os.walk(template_dir):
+                for filename in filenames:
+                    template_name = os.path.relpath(
+                        os.path.join(dirpath, filename), template_dir
+                    ).replace(os.sep, "/")
+                    try:
+                        template = engine.engine.get_template(template_name)
+                    except (
+                        TemplateDoesNotExist,
+                        TemplateSyntaxError,
+                        UnicodeDecodeError,
+                    ):
+                        continue
+
+                    for node in template.nodelist.get_nodes_by_type(ImageNode):
+                        if isinstance(node, SrcsetImageNode):
+                            filter_specs.update(Filter.expand_spec(node.filter_specs))
+                        else:
+                            filter_specs.add(node.get_filter().spec)
+
+    return filter_specs
+
+
+def get_api_field_filter_specs():
+    """
+    Return the filter specs of all ``ImageRenditionField`` serializers used in
+    the ``api_fields`` of installed models.
+    """
+    from wagtail.images.api.fields import ImageRenditionField
+
+    filter_specs = set()
+    for model in apps.get_models():
+        for api_field in getattr(model, "api_fields", None) or []:
+            serializer = getattr(api_field, "serializer", None)
+            if isinstance(serializer, ImageRenditionField):
+                filter_specs.add(serializer.filter_spec)
+
+    return filter_specs
+
+
 class Command(BaseCommand):
     """Command to create missing image renditions with the option to remove (purge) any existing ones."""
 
@@ -36,8 +99,40 @@ class Command(BaseCommand):
             default=50,
             help="Operate in x size chunks (default: %(default)s)",
         )
+        parser.add_argument(
+            "--warm-up",
+            action="store_true",
+            help="Generate missing renditions for the given filter specs, rather than regenerating existing ones",
+        )
+        parser.add_argument(
+            "--filter-spec",
+            action="append",
+            dest="filter_specs",
+            default=[],
+            help="A filter spec to generate renditions for, such as 'width-{400,800}'. Can be given multiple times",
+        )
+        parser.add_argument(
+            "--discover-filter-specs",
+            action="store_true",
+            help="Also generate renditions for the filter specs used in templates and API fields",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of images to generate renditions for concurrently (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--progress-file",
+            help="A file in which to record progress, so that an interrupted warm-up can be resumed",
+        )
 
     def handle(self, *args, **options):
+        if options["warm_up"]:
+            if options["purge_only"]:
+                raise CommandError("--warm-up cannot be used with --purge-only")
+            return self.warm_up(**options)
+
         Rendition = get_image_model().get_rendition_model()
 
         renditions = Rendition.objects.all()
@@ -98,3 +193,162 @@ class Command(BaseCommand):
             )
         else:
             self.stdout.write(self.style.WARNING("Could not process any renditions."))
+
+    def get_warm_up_filters(self, filter_specs, discover_filter_specs):
+        filter_specs = {
+            expanded_spec
+            for filter_spec in filter_specs
+            for expanded_spec in Filter.expand_spec(filter_spec)
+        }
+        if discover_filter_specs:
+            filter_specs |= get_template_filter_specs()
+            filter_specs |= get_api_field_filter_specs()
+
+        filters = []
+        for filter_spec in sorted(filter_specs):
+            filter = Filter(spec=filter_spec)
+            try:
+                filter.operations
+            except InvalidFilterSpecError as e:
+                raise CommandError(f"Invalid filter spec '{filter_spec}': {e}") from e
+            filters.append(filter)
+        return filters
+
+    def get_missing_filters(self, images, filters):
+        """
+        Return a dict mapping each of the given images to the filters that it
+        does not yet have a rendition for, using a single query to find the
+        renditions that already exist.
+        """
+        Rendition = get_image_model().get_rendition_model()
+
+        wanted = {}
+        for image in images:
+            for filter in filters:
+                filter = image.clean_filter_for_svg(filter)
+                wanted[(image.pk, filter.spec, filter.get_cache_key(image))] = (
+                    image,
+                    filter,
+                )
+
+        existing = Rendition.objects.filter(
+            image_id__in=[image.pk for image in images],
+            filter_spec__in={key[1] for key in wanted},
+        ).values_list("image_id", "filter_spec", "focal_point_key")
+
+        for key in existing:
+            wanted.pop(key, None)
+
+        missing = {}
+        for image, filter in wanted.values():
+            missing.setdefault(image, []).append(filter)
+        return missing
+
+    def generate_renditions(self, image, filters):
+        try:
+            image.create_renditions(*filters)
+        except Exception:
+            logger.exception("Error generating renditions for image %d", image.pk)
+            self.stderr.write(
+                self.style.ERROR(f"Failed to generate renditions for image {image.pk}")
+            )
+            return 0
+        return len(filters)
+
+    def generate_renditions_in_thread(self, image, filters):
+        try:
+            return self.generate_renditions(image, filters)
+        finally:
+            # Worker threads have their own database connections
+            connections.close_all()
+
+    def read_progress(self, progress_file):
+        try:
+            with open(progress_file) as f:
+                return int(f.read().strip())
+        except FileNotFoundError:
+            return None
+        except ValueError as e:
+            raise CommandError(f"Could not read progress from {progress_file}") from e
+
+    def write_progress(self, progress_file, last_image_id):
+        with open(progress_file, "w") as f:
+            f.write(str(last_image_id))
+
+    def warm_up(self, **options):
+        filters = self.get_warm_up_filters(
+            options["filter_specs"], options["discover_filter_specs"]
+        )
+        if not filters:
+            raise CommandError(
+                "No filter specs to warm up. Use --filter-spec or --discover-filter-specs."
+            )
+
+        workers = options["workers"]
+        if workers < 1:
+            raise CommandError("--workers must be at least 1")
+
+        images = get_image_model().objects.order_by("pk")
+        progress_file = options["progress_file"]
+        last_image_id = self.read_progress(progress_file) if progress_file else None
+        if last_image_id is not None:
+            self.stdout.write(
+                self.style.HTTP_INFO(f"Resuming after image {last_image_id}")
+            )
+            num_images = images.filter(pk__gt=last_image_id).count()
+        else:
+            num_images = images.count()
+        if not num_images:
+            self.stdout.write(self.style.WARNING("No images found."))
+            return
+
+        self.stdout.write(
+            self.style.HTTP_INFO(
+                f"Warming up {len(filters)} filter spec(s) for {num_images} image(s)"
+            )
+        )
+
+        chunk_size = options["chunk_size"]
+        num_processed = 0
+        num_created = 0
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            while True:
+                # Fetch images in keyset-paginated chunks, so that progress can
+                # be resumed from the last image ID
+                chunk = images
+                if last_image_id is not None:
+                    chunk = chunk.filter(pk__gt=last_image_id)
+                chunk = list(chunk[:chunk_size])
+                if not chunk:
+                    break
+
+                missing = self.get_missing_filters(chunk, filters)
+                if workers > 1:
+                    num_created += sum(
+                        executor.map(
+                            lambda item: self.generate_renditions_in_thread(*item),
+                            missing.items(),
+                        )
+                    )
+                else:
+                    for image, image_filters in missing.items():
+                        num_created += self.generate_renditions(image, image_filters)
+
+                num_processed += len(chunk)
+                last_image_id = chunk[-1].pk
+                if progress_file:
+                    self.write_progress(progress_file, last_image_id)
+
+                _progress_bar = progress_bar(num_processed, num_images)
+                self.stdout.write(_progress_bar[0], ending=_progress_bar[1])
+
+        if progress_file:
+            # The warm-up is complete, so the next one should start afresh
+            os.remove(progress_file)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Successfully created {num_created} rendition(s) for {num_processed} image(s)"
+            )
+        )
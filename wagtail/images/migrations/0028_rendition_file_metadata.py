@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("wagtailimages", "0027_image_description"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="rendition",
+            name="created_at",
+            field=models.DateTimeField(auto_now_add=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="rendition",
+            name="file_format",
+            field=models.CharField(
+                blank=True, default="", editable=False, max_length=10
+            ),
+        ),
+        migrations.AddField(
+            model_name="rendition",
+            name="file_size",
+            field=models.PositiveIntegerField(editable=False, null=True),
+        ),
+    ]
@@ -4,8 +4,11 @@ import concurrent.futures
 import hashlib
 import itertools
 import logging
+import math
+import multiprocessing
 import os.path
 import re
+import threading
 import time
 from collections import OrderedDict, defaultdict, namedtuple
 from collections.abc import Iterable
@@ -22,8 +25,9 @@ from django.core.cache import DEFAULT_CACHE_ALIAS, InvalidCacheBackendError, cac
 from django.core.cache.backends.base import BaseCache
 from django.core.exceptions import ImproperlyConfigured
 from django.core.files import File
+from django.core.files.base import ContentFile
 from django.core.files.storage import InvalidStorageError, default_storage, storages
-from django.db import models
+from django.db import models, transaction
 from django.db.models import Q
 from django.forms.utils import flatatt
 from django.urls import reverse
@@ -66,6 +70,39 @@ IMAGE_FORMAT_EXTENSIONS = {
     "heic": ".heic",
 }
 
+IMAGE_FORMAT_MIME_TYPES = {
+    "avif": "image/avif",
+    "jpeg": "image/jpeg",
+    "png": "image/png",
+    "gif": "image/gif",
+    "webp": "image/webp",
+    "svg": "image/svg+xml",
+    "ico": "image/x-icon",
+    "heic": "image/heic",
+}
+
+
+# An original image that has been decoded and orientated, ready to be shared by
+# several filters. See AbstractImage.decode_rendition_source()
+DecodedImage = namedtuple(
+    "DecodedImage",
+    ["willow_image", "original_format", "original_size", "source_rect"],
+    # The area of the original image that willow_image covers, if it is a
+    # rendition rather than the whole image
+    defaults=[None],
+)
+
+# JPEG images are decoded at a reduced size (via Pillow's draft mode) when every
+# requested rendition is at least this many times smaller than the original
+JPEG_DRAFT_MODE_MIN_REDUCTION = 2
+
+EXIF_ORIENTATION_TAG = 0x0112
+
+# How long to wait between checks for a rendition that another process is
+# generating, in seconds. See AbstractImage.create_rendition()
+RENDITION_LOCK_POLL_INTERVAL = 0.05
+RENDITION_LOCK_MAX_POLL_INTERVAL = 0.5
+
 
 class SourceImageIOError(IOError):
     """
@@ -149,6 +186,145 @@ def get_rendition_storage():
     return storage
 
 
+def get_rendition_file_metadata(file: File) -> dict[str, Any]:
+    """
+    Return the ``file_format`` and ``file_size`` field values for a newly
+    generated rendition file, so that the rendition can be served without
+    opening the file again.
+    """
+    _, extension = os.path.splitext(file.name)
+    file_format = next(
+        (
+            format_name
+            for format_name, format_extension in IMAGE_FORMAT_EXTENSIONS.items()
+            if format_extension == extension.lower()
+        ),
+        "",
+    )
+    return {"file_format": file_format, "file_size": file.size}
+
+
+class InlineExecutor(concurrent.futures.Executor):
+    """
+    An executor that runs each task immediately, in the calling thread.
+    """
+
+    def submit(self, fn, /, *args, **kwargs):
+        future = concurrent.futures.Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:  # noqa: BLE001
+            future.set_exception(e)
+        return future
+
+
+_rendition_process_pool = None
+_rendition_process_pool_max_workers = None
+_rendition_process_pool_lock = threading.Lock()
+
+
+def _init_rendition_worker():
+    # Worker processes started with the 'spawn' or 'forkserver' methods have to
+    # set up Django before any rendition tasks can be unpickled
+    import django
+
+    django.setup()
+
+
+def get_rendition_process_pool(max_workers=None):
+    """
+    Return the process pool used to generate renditions when
+    ``WAGTAILIMAGES_RENDITION_EXECUTOR`` is ``"process"``. The pool is shared
+    by all calls within this process, so that worker processes are only
+    started once.
+    """
+    global _rendition_process_pool, _rendition_process_pool_max_workers
+
+    with _rendition_process_pool_lock:
+        if (
+            _rendition_process_pool is None
+            or _rendition_process_pool_max_workers != max_workers
+        ):
+            if _rendition_process_pool is not None:
+                _rendition_process_pool.shutdown(wait=False)
+            _rendition_process_pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=max_workers, initializer=_init_rendition_worker
+            )
+            _rendition_process_pool_max_workers = max_workers
+        return _rendition_process_pool
+
+
+def shutdown_rendition_process_pool(wait=True):
+    """
+    Shut down the shared rendition process pool, if one has been started.
+    """
+    global _rendition_process_pool, _rendition_process_pool_max_workers
+
+    with _rendition_process_pool_lock:
+        if _rendition_process_pool is not None:
+            _rendition_process_pool.shutdown(wait=wait)
+        _rendition_process_pool = None
+        _rendition_process_pool_max_workers = None
+
+
+@contextmanager
+def get_rendition_executor():
+    """
+    A context manager that provides the ``concurrent.futures.Executor`` to use
+    for generating multiple renditions, as configured by the
+    ``WAGTAILIMAGES_RENDITION_EXECUTOR`` and
+    ``WAGTAILIMAGES_RENDITION_MAX_WORKERS`` settings.
+    """
+    executor_type = getattr(settings, "WAGTAILIMAGES_RENDITION_EXECUTOR", "thread")
+    max_workers = getattr(settings, "WAGTAILIMAGES_RENDITION_MAX_WORKERS", None)
+
+    if executor_type == "thread":
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers or 3
+        ) as executor:
+            yield executor
+    elif executor_type == "process":
+        if multiprocessing.current_process().daemon:
+            # Daemonic processes (such as some task queue workers) cannot start
+            # child processes, so use threads instead
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=max_workers or 3
+            ) as executor:
+                yield executor
+        else:
+            yield get_rendition_process_pool(max_workers)
+    elif executor_type == "inline":
+        yield InlineExecutor()
+    else:
+        raise ImproperlyConfigured(
+            "WAGTAILIMAGES_RENDITION_EXECUTOR must be one of 'thread', 'process' or 'inline'."
+        )
+
+
+def generate_rendition_file_in_worker(
+    image_model_label: str,
+    image_field_values: dict[str, Any],
+    filter_class: type[Filter],
+    filter_spec: str,
+    original_image_bytes: bytes,
+) -> tuple[str, bytes]:
+    """
+    Generate a rendition image within a worker process, returning its filename
+    and contents. Only plain values are passed between processes, so the image
+    and filter are reconstructed from their field values and spec here.
+    """
+    image = apps.get_model(image_model_label)(**image_field_values)
+    filter = filter_class(spec=filter_spec)
+
+    file = image.generate_rendition_file(
+        filter,
+        source=File(BytesIO(original_image_bytes), name=image.file.name),
+        decoded_source=image.decode_rendition_source(original_image_bytes, [filter]),
+    )
+    file.seek(0)
+    return file.name, file.read()
+
+
 class ImageFileMixin:
     def is_stored_locally(self):
         """
@@ -553,10 +729,12 @@ class AbstractImage(ImageFileMixin, CollectionMember, index.Indexed, models.Mode
             # Reuse this rendition if requested again from this object
             self._add_to_prefetched_renditions(rendition)
 
-        cache_key = Rendition.construct_cache_key(
-            self, filter.get_cache_key(self), filter.spec
-        )
-        Rendition.cache_backend.set(cache_key, rendition)
+        # prevent writing of cached data back to the cache
+        if not getattr(rendition, "_from_cache", False):
+            cache_key = Rendition.construct_cache_key(
+                self, filter.get_cache_key(self), filter.spec
+            )
+            Rendition.cache_backend.set(cache_key, rendition)
 
         return rendition
 
@@ -591,15 +769,82 @@ class AbstractImage(ImageFileMixin, CollectionMember, index.Indexed, models.Mode
         Note: If using custom image models, an instance of the custom rendition
         model will be returned.
         """
-        # Because of unique constraints applied to the model, we use
-        # get_or_create() to guard against race conditions
-        rendition, created = self.renditions.get_or_create(
-            filter_spec=filter.spec,
-            focal_point_key=filter.get_cache_key(self),
-            defaults={"file": self.generate_rendition_file(filter)},
-        )
+        Rendition = self.get_rendition_model()
+        focal_point_key = filter.get_cache_key(self)
+
+        lock_timeout = getattr(settings, "WAGTAILIMAGES_RENDITION_LOCK_TIMEOUT", None)
+        lock_key = None
+        if lock_timeout:
+            # Only one process generates each rendition at a time. Any others
+            # wait for its rendition rather than generating their own copy
+            lock_key = self._get_rendition_lock_key(filter)
+            if not Rendition.cache_backend.add(lock_key, True, lock_timeout):
+                rendition = self._wait_for_rendition(
+                    filter, focal_point_key, lock_key, lock_timeout
+                )
+                if rendition is not None:
+                    return rendition
+                # The other process didn't finish in time, so generate the
+                # rendition here instead
+                lock_key = None
+
+        try:
+            # Because of unique constraints applied to the model, we use
+            # get_or_create() to guard against race conditions
+            file = self.generate_rendition_file(
+                filter,
+                decoded_source=self.decode_rendition_source_from_renditions(filter),
+            )
+            rendition, created = self.renditions.get_or_create(
+                filter_spec=filter.spec,
+                focal_point_key=focal_point_key,
+                defaults={"file": file, **get_rendition_file_metadata(file)},
+            )
+        except BaseException:
+            if lock_key:
+                Rendition.cache_backend.delete(lock_key)
+            raise
+
+        if lock_key:
+            # Waiting processes can't see the rendition until it is committed
+            transaction.on_commit(lambda: Rendition.cache_backend.delete(lock_key))
+
         return rendition
 
+    def _get_rendition_lock_key(self, filter: Filter) -> str:
+        Rendition = self.get_rendition_model()
+        return (
+            Rendition.construct_cache_key(self, filter.get_cache_key(self), filter.spec)
+            + "-lock"
+        )
+
+    def _wait_for_rendition(
+        self, filter: Filter, focal_point_key: str, lock_key: str, timeout: float
+    ) -> AbstractRendition | None:
+        """
+        Wait for another process holding the lock to create the rendition for
+        the given filter, and return it. Returns ``None`` if the rendition
+        does not exist once the lock is released or the timeout has passed.
+        """
+        Rendition = self.get_rendition_model()
+        deadline = time.monotonic() + timeout
+        interval = RENDITION_LOCK_POLL_INTERVAL
+
+        while True:
+            time.sleep(min(interval, max(deadline - time.monotonic(), 0)))
+
+            lock_released = Rendition.cache_backend.get(lock_key) is None
+            rendition = self.renditions.filter(
+                filter_spec=filter.spec, focal_point_key=focal_point_key
+            ).first()
+            if rendition is not None:
+                return rendition
+
+            if lock_released or time.monotonic() >= deadline:
+                return None
+
+            interval = min(interval * 2, RENDITION_LOCK_MAX_POLL_INTERVAL)
+
     def get_renditions(self, *filters: Filter | str) -> dict[str, AbstractRendition]:
         """
         Returns a ``dict`` of ``Rendition`` instances with image files reflecting
@@ -704,6 +949,8 @@ class AbstractImage(ImageFileMixin, CollectionMember, index.Indexed, models.Mode
                 # The retrieved rendition needs to be associated with the current image instance, so that any
                 # locally-set properties such as contextual_alt_text are respected
                 rendition.image = self
+                # to prevent writing of cached data back to the cache
+                rendition._from_cache = True
                 found[filter] = rendition
 
             # For items not found in the cache, look in the database
@@ -745,6 +992,64 @@ class AbstractImage(ImageFileMixin, CollectionMember, index.Indexed, models.Mode
             filter = filters[0]
             return {filter: self.create_rendition(filter)}
 
+        lock_timeout = getattr(settings, "WAGTAILIMAGES_RENDITION_LOCK_TIMEOUT", None)
+        if not lock_timeout:
+            return self._create_renditions(filters)
+
+        # As in create_rendition(), take a lock for each rendition. Those
+        # locked by another process are waited for once the others are done
+        lock_keys: dict[Filter, str] = {}
+        locked_elsewhere: dict[Filter, str] = {}
+        for filter in filters:
+            lock_key = self._get_rendition_lock_key(filter)
+            if Rendition.cache_backend.add(lock_key, True, lock_timeout):
+                lock_keys[filter] = lock_key
+            else:
+                locked_elsewhere[filter] = lock_key
+
+        try:
+            return_value = self._create_renditions(list(lock_keys))
+
+            deadline = time.monotonic() + lock_timeout
+            not_finished = []
+            for filter, lock_key in locked_elsewhere.items():
+                rendition = self._wait_for_rendition(
+                    filter,
+                    filter.get_cache_key(self),
+                    lock_key,
+                    max(deadline - time.monotonic(), 0),
+                )
+                if rendition is None:
+                    not_finished.append(filter)
+                else:
+                    return_value[filter] = rendition
+
+            # Generate any renditions that other processes didn't finish in time
+            return_value.update(self._create_renditions(not_finished))
+        except BaseException:
+            Rendition.cache_backend.delete_many(list(lock_keys.values()))
+            raise
+
+        if lock_keys:
+            # Waiting processes can't see the renditions until they are committed
+            transaction.on_commit(
+                lambda: Rendition.cache_backend.delete_many(list(lock_keys.values()))
+            )
+
+        return return_value
+
+    def _create_renditions(
+        self, filters: list[Filter]
+    ) -> dict[Filter, AbstractRendition]:
+        """
+        Generate the renditions for the given filters in bulk, for
+        ``create_renditions()``
+        """
+        Rendition = self.get_rendition_model()
+
+        if not filters:
+            return {}
+
         return_value: dict[Filter, AbstractRendition] = {}
         filter_map: dict[str, Filter] = {f.spec: f for f in filters}
 
@@ -754,16 +1059,28 @@ class AbstractImage(ImageFileMixin, CollectionMember, index.Indexed, models.Mode
 
         to_create = []
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
-            for future in concurrent.futures.as_completed(
-                executor.submit(
-                    self.generate_rendition_instance,
-                    filter,
-                    BytesIO(original_image_bytes),
+        with get_rendition_executor() as executor:
+            if isinstance(executor, concurrent.futures.ProcessPoolExecutor):
+                to_create = self._generate_rendition_instances_in_processes(
+                    executor, filters, original_image_bytes
                 )
-                for filter in filters
-            ):
-                to_create.append(future.result())
+            else:
+                # Decode the image once, to be shared by all filters. A larger
+                # existing rendition is used in place of the original if there
+                # is one that is large enough for all of them
+                decoded_source = self.decode_rendition_source_from_renditions(
+                    *filters
+                ) or self.decode_rendition_source(original_image_bytes, filters)
+                for future in concurrent.futures.as_completed(
+                    executor.submit(
+                        self.generate_rendition_instance,
+                        filter,
+                        BytesIO(original_image_bytes),
+                        decoded_source=decoded_source,
+                    )
+                    for filter in filters
+                ):
+                    to_create.append(future.result())
 
         # Rendition generation can take a while. So, if other processes have created
         # identical renditions in the meantime, we should find them to avoid clashes.
@@ -804,24 +1121,279 @@ class AbstractImage(ImageFileMixin, CollectionMember, index.Indexed, models.Mode
 
         return return_value
 
+    def _generate_rendition_instances_in_processes(
+        self,
+        executor: concurrent.futures.Executor,
+        filters: Iterable[Filter],
+        original_image_bytes: bytes,
+    ) -> list[AbstractRendition]:
+        image_field_values = {
+            field.attname: getattr(self, field.attname)
+            for field in self._meta.concrete_fields
+        }
+        # Send the file name rather than the FieldFile, which references the
+        # image instance
+        image_field_values["file"] = self.file.name
+
+        futures = {
+            executor.submit(
+                generate_rendition_file_in_worker,
+                self._meta.label,
+                image_field_values,
+                type(filter),
+                filter.spec,
+                original_image_bytes,
+            ): filter
+            for filter in filters
+        }
+
+        Rendition = self.get_rendition_model()
+        renditions = []
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                filter = futures[future]
+                filename, content = future.result()
+                file = ContentFile(content, name=filename)
+                renditions.append(
+                    Rendition(
+                        image=self,
+                        filter_spec=filter.spec,
+                        focal_point_key=filter.get_cache_key(self),
+                        file=file,
+                        **get_rendition_file_metadata(file),
+                    )
+                )
+        except concurrent.futures.process.BrokenProcessPool:
+            # Start a fresh pool for the next call
+            shutdown_rendition_process_pool(wait=False)
+            raise
+
+        return renditions
+
+    def decode_rendition_source(
+        self, original_image_bytes: bytes, filters: Iterable[Filter]
+    ) -> DecodedImage | None:
+        """
+        Decodes and orientates the original image once, so that the result can
+        be shared by all of the supplied ``filters`` when generating renditions,
+        rather than each filter decoding the image again.
+
+        When every filter reduces a JPEG image by at least
+        ``JPEG_DRAFT_MODE_MIN_REDUCTION`` times, the image is decoded at a
+        reduced size using Pillow's draft mode, which is considerably faster
+        for large images.
+
+        Returns ``None`` if the image cannot be shared in this way (for example,
+        SVG images, or filters with a custom ``run()`` method), in which case
+        each filter opens the image itself.
+        """
+        filters = list(filters)
+        if self.is_svg() or not filters:
+            return None
+
+        if any(not filter.supports_decoded_source for filter in filters):
+            return None
+
+        from PIL import Image as PILImage
+        from willow.plugins.pillow import PillowImage
+
+        try:
+            willow_image = willow.Image.open(BytesIO(original_image_bytes))
+            original_format = willow_image.format_name
+            if original_format not in ("jpeg", "png"):
+                # Leave formats with animation or other special handling to Willow
+                return None
+
+            pillow_image = PILImage.open(BytesIO(original_image_bytes))
+            exif_orientation = pillow_image.getexif().get(EXIF_ORIENTATION_TAG)
+            original_size = pillow_image.size
+            if exif_orientation in (5, 6, 7, 8):
+                # The image will be rotated by 90 degrees when orientated
+                original_size = (original_size[1], original_size[0])
+
+            if original_format == "jpeg":
+                scale = max(filter.get_scale(self, original_size) for filter in filters)
+                if scale * JPEG_DRAFT_MODE_MIN_REDUCTION < 1:
+                    draft_scale = scale * JPEG_DRAFT_MODE_MIN_REDUCTION
+                    pillow_image.draft(
+                        None,
+                        (
+                            math.ceil(pillow_image.width * draft_scale),
+                            math.ceil(pillow_image.height * draft_scale),
+                        ),
+                    )
+
+            pillow_image.load()
+        except Exception:  # noqa: BLE001
+            # Fall back on letting each filter open the image, so that any
+            # errors are reported in the usual way
+            return None
+
+        return DecodedImage(
+            PillowImage(pillow_image).auto_orient(), original_format, original_size
+        )
+
+    def decode_rendition_source_from_renditions(
+        self, *filters: Filter
+    ) -> DecodedImage | None:
+        """
+        Finds an existing rendition of this image that all of the supplied
+        ``filters`` can be applied to instead of the original image, and
+        decodes it.
+
+        A rendition is suitable if it covers the whole of the area that each
+        filter crops from the original, with the same focal point, and has at
+        least ``WAGTAILIMAGES_RENDITION_REUSE_MIN_SCALE`` times the resolution
+        needed for the largest of the new renditions. The smallest suitable
+        rendition is used.
+
+        Returns ``None`` if reusing renditions is disabled or there is no
+        suitable rendition, in which case the original image is used.
+        """
+        min_scale = getattr(settings, "WAGTAILIMAGES_RENDITION_REUSE_MIN_SCALE", None)
+        if not min_scale or self.is_svg() or not filters:
+            return None
+
+        if any(not filter.supports_decoded_source for filter in filters):
+            return None
+
+        filter_specs = {filter.spec for filter in filters}
+        renditions = self._get_prefetched_renditions()
+        if renditions is None:
+            renditions = self.renditions.exclude(filter_spec__in=filter_specs)
+        renditions = [
+            rendition
+            for rendition in renditions
+            if rendition.filter_spec not in filter_specs and rendition.width
+        ]
+        if not renditions:
+            return None
+
+        from PIL import Image as PILImage
+        from willow.plugins.pillow import PillowImage
+
+        try:
+            # Only the header of the original is read, for its format, size
+            # and orientation
+            with self.open_file() as image_file:
+                pillow_image = PILImage.open(image_file)
+                original_format = pillow_image.format.lower()
+                exif_orientation = pillow_image.getexif().get(EXIF_ORIENTATION_TAG)
+                original_size = pillow_image.size
+        except Exception:  # noqa: BLE001
+            return None
+
+        if original_format not in ("jpeg", "png"):
+            return None
+        if exif_orientation in (5, 6, 7, 8):
+            # The image will be rotated by 90 degrees when orientated
+            original_size = (original_size[1], original_size[0])
+
+        rects = [
+            filter.get_transform(self, original_size).get_rect() for filter in filters
+        ]
+        required_scale = max(
+            filter.get_scale(self, original_size) for filter in filters
+        ) * max(min_scale, 1)
+
+        best = None
+        for rendition in renditions:
+            rendition_filter = Filter(spec=rendition.filter_spec)
+            try:
+                if (
+                    rendition_filter.filter_operations
+                    or rendition.focal_point_key != rendition_filter.get_cache_key(self)
+                ):
+                    # The rendition may have been changed other than by
+                    # resizing, or was cropped around a different focal point
+                    continue
+                transform = rendition_filter.get_transform(self, original_size)
+            except InvalidFilterSpecError:
+                continue
+
+            source_rect = transform.get_rect().round()
+            if (
+                (rendition.width, rendition.height) != tuple(transform.size)
+                # No quicker to decode than the original
+                or rendition.width * rendition.height
+                >= original_size[0] * original_size[1]
+                or any(
+                    rect.left < source_rect.left
+                    or rect.top < source_rect.top
+                    or rect.right > source_rect.right
+                    or rect.bottom > source_rect.bottom
+                    for rect in rects
+                )
+            ):
+                continue
+
+            scale = min(
+                transform.size[0] / source_rect.width,
+                transform.size[1] / source_rect.height,
+            )
+            if scale < required_scale:
+                continue
+
+            if best is None or rendition.width * rendition.height < (
+                best[0].width * best[0].height
+            ):
+                best = (rendition, source_rect)
+
+        if best is None:
+            return None
+
+        rendition, source_rect = best
+        try:
+            with rendition.open_file() as rendition_file:
+                pillow_image = PILImage.open(rendition_file)
+                if pillow_image.format.lower() != original_format:
+                    return None
+                pillow_image.load()
+        except Exception:  # noqa: BLE001
+            # Fall back on the original image
+            return None
+
+        logger.debug(
+            "Using '%s' rendition as the source for '%s' rendition(s) of image %d",
+            rendition.filter_spec,
+            "', '".join(filter.spec for filter in filters),
+            self.pk,
+        )
+        return DecodedImage(
+            PillowImage(pillow_image).auto_orient(),
+            original_format,
+            original_size,
+            source_rect,
+        )
+
     def generate_rendition_instance(
-        self, filter: Filter, source: BytesIO
+        self, filter: Filter, source: BytesIO, *, decoded_source: DecodedImage = None
     ) -> AbstractRendition:
         """
         Use the supplied ``source`` image to create and return an
         **unsaved** ``Rendition`` instance, with a ``file`` value reflecting
         the supplied ``filter`` value and focal point values from this object.
         """
+        file = self.generate_rendition_file(
+            filter,
+            source=File(source, name=self.file.name),
+            decoded_source=decoded_source,
+        )
         return self.get_rendition_model()(
             image=self,
             filter_spec=filter.spec,
             focal_point_key=filter.get_cache_key(self),
-            file=self.generate_rendition_file(
-                filter, source=File(source, name=self.file.name)
-            ),
+            file=file,
+            **get_rendition_file_metadata(file),
         )
 
-    def generate_rendition_file(self, filter: Filter, *, source: File = None) -> File:
+    def generate_rendition_file(
+        self,
+        filter: Filter,
+        *,
+        source: File = None,
+        decoded_source: DecodedImage = None,
+    ) -> File:
         """
         Generates an in-memory image matching the supplied ``filter`` value
         and focal point value from this object, wraps it in a ``File`` object
@@ -832,6 +1404,8 @@ class AbstractImage(ImageFileMixin, CollectionMember, index.Indexed, models.Mode
         If the contents of ``self.file`` has already been read into memory, the
         ``source`` keyword can be used to provide a reference to the in-memory
         ``File``, bypassing the need to reload the image contents from storage.
+        Similarly, ``decoded_source`` can be used to provide an image that has
+        already been decoded by ``decode_rendition_source()``.
 
         NOTE: The responsibility of generating the new image from the original
         falls to the supplied ``filter`` object. If you want to do anything
@@ -851,11 +1425,18 @@ class AbstractImage(ImageFileMixin, CollectionMember, index.Indexed, models.Mode
         start_time = time.time()
 
         try:
-            generated_image = filter.run(
-                self,
-                SpooledTemporaryFile(max_size=settings.FILE_UPLOAD_MAX_MEMORY_SIZE),
-                source=source,
-            )
+            output = SpooledTemporaryFile(max_size=settings.FILE_UPLOAD_MAX_MEMORY_SIZE)
+            if decoded_source is not None and filter.supports_decoded_source:
+                generated_image = filter.run_on_willow_image(
+                    self,
+                    decoded_source.willow_image,
+                    output,
+                    original_format=decoded_source.original_format,
+                    original_size=decoded_source.original_size,
+                    source_rect=decoded_source.source_rect,
+                )
+            else:
+                generated_image = filter.run(self, output, source=source)
 
             logger.debug(
                 "Generated '%s' rendition for image %d in %.1fms",
@@ -942,6 +1523,112 @@ class Image(AbstractImage):
         ]
 
 
+def get_renditions_for_images(
+    images: Iterable[AbstractImage], *filters: Filter | str
+) -> dict[AbstractImage, dict[str, AbstractRendition]]:
+    """
+    Returns the renditions of many images at once, as a ``dict`` mapping each
+    image to a ``dict`` of ``Rendition`` instances keyed by filter spec, as
+    ``Image.get_renditions()`` would return for that image.
+
+    Rather than looking up each image's renditions in turn, this makes one
+    cache request and one database query to find the existing renditions of
+    all of the images, and one cache request to store any found in the
+    database. Images with prefetched renditions are looked up in those alone.
+    Any renditions that don't exist yet are created.
+    """
+    filters = [Filter(spec=f) if isinstance(f, str) else f for f in filters]
+
+    # Remove empty values and duplicate images while preserving order
+    images = list(dict.fromkeys(image for image in images if image))
+
+    image_filters: dict[AbstractImage, list[Filter]] = {}
+    found: dict[AbstractImage, dict[Filter, AbstractRendition]] = {}
+    to_look_up: dict[BaseCache, dict[str, tuple[AbstractImage, Filter]]] = defaultdict(
+        dict
+    )
+
+    for image in images:
+        image_filters[image] = list(
+            dict.fromkeys(image.clean_filter_for_svg(filter) for filter in filters)
+        )
+        if image._get_prefetched_renditions() is not None:
+            found[image] = image.find_existing_renditions(*image_filters[image])
+            continue
+
+        found[image] = {}
+        Rendition = image.get_rendition_model()
+        for filter in image_filters[image]:
+            cache_key = Rendition.construct_cache_key(
+                image, filter.get_cache_key(image), filter.spec
+            )
+            to_look_up[Rendition.cache_backend][cache_key] = (image, filter)
+
+    # Query the cache first
+    for cache_backend, lookups in to_look_up.items():
+        for cache_key, rendition in cache_backend.get_many(lookups.keys()).items():
+            image, filter = lookups[cache_key]
+            # The retrieved rendition needs to be associated with the current image
+            # instance, so that locally-set properties such as contextual_alt_text
+            # are respected
+            rendition.image = image
+            # to prevent writing of cached data back to the cache
+            rendition._from_cache = True
+            found[image][filter] = rendition
+
+    # For items not found in the cache, look in the database
+    not_found: dict[type[AbstractRendition], dict[tuple, tuple]] = defaultdict(dict)
+    for lookups in to_look_up.values():
+        for image, filter in lookups.values():
+            if filter not in found[image]:
+                not_found[image.get_rendition_model()][
+                    (image.pk, filter.spec, filter.get_cache_key(image))
+                ] = (image, filter)
+
+    for Rendition, lookups in not_found.items():
+        for rendition in Rendition.objects.filter(
+            image_id__in={image.pk for image, filter in lookups.values()},
+            filter_spec__in={filter.spec for image, filter in lookups.values()},
+        ):
+            try:
+                image, filter = lookups[
+                    (
+                        rendition.image_id,
+                        rendition.filter_spec,
+                        rendition.focal_point_key,
+                    )
+                ]
+            except KeyError:
+                continue  # this rendition can be ignored
+            rendition.image = image
+            found[image][filter] = rendition
+
+    # Create any renditions not found in prefetched values, cache or database
+    for image in images:
+        missing = [f for f in image_filters[image] if f not in found[image]]
+        for filter, rendition in image.create_renditions(*missing).items():
+            image._add_to_prefetched_renditions(rendition)
+            found[image][filter] = rendition
+
+    # Update the cache
+    cache_additions: dict[BaseCache, dict[str, AbstractRendition]] = defaultdict(dict)
+    for image in images:
+        Rendition = image.get_rendition_model()
+        for filter, rendition in found[image].items():
+            if not getattr(rendition, "_from_cache", False):
+                cache_key = Rendition.construct_cache_key(
+                    image, filter.get_cache_key(image), filter.spec
+                )
+                cache_additions[Rendition.cache_backend][cache_key] = rendition
+    for cache_backend, additions in cache_additions.items():
+        cache_backend.set_many(additions)
+
+    return {
+        image: {filter.spec: found[image][filter] for filter in image_filters[image]}
+        for image in images
+    }
+
+
 class Filter:
     """
     Represents one or more operations that can be applied to an Image to produce a rendition
@@ -1058,110 +1745,169 @@ class Filter:
             # Fix orientation of image
             willow = willow.auto_orient()
 
-            # Transform the image
-            transform = self.get_transform(
-                image, (willow.image.width, willow.image.height)
+            return self.run_on_willow_image(
+                image, willow, output, original_format=original_format
             )
-            willow = willow.crop(transform.get_rect().round())
-            willow = willow.resize(transform.size)
 
-            # Apply filters
-            env = {
-                "original-format": original_format,
+    @property
+    def supports_decoded_source(self) -> bool:
+        """
+        Whether this filter can be applied to an image decoded in advance by
+        ``AbstractImage.decode_rendition_source()``. Subclasses that override
+        ``run()`` are given the original image file instead, so that their
+        customisations are respected.
+        """
+        return type(self).run is Filter.run
+
+    def get_scale(self, image: AbstractImage, size) -> float:
+        """
+        Returns the largest factor by which this filter scales the source image
+        of the given (orientated) size - for example, 0.25 when reducing a
+        4000px wide image to 1000px wide.
+        """
+        transform = self.get_transform(image, size)
+        rect = transform.get_rect()
+        return max(
+            transform.size[0] / rect.width,
+            transform.size[1] / rect.height,
+        )
+
+    def run_on_willow_image(
+        self,
+        image: AbstractImage,
+        willow,
+        output: BytesIO,
+        *,
+        original_format: str,
+        original_size: tuple[int, int] | None = None,
+        source_rect: Rect | None = None,
+    ):
+        """
+        Applies this filter to an already opened and orientated Willow image,
+        and saves the result to ``output``. The Willow image is not modified,
+        so the same decoded image can be shared between several filters.
+
+        If the image was decoded at a reduced size (using JPEG draft mode),
+        ``original_size`` gives the size of the full image, so that crops and
+        focal points are calculated exactly as they would be for the full image.
+        If the Willow image is an existing rendition, ``source_rect`` gives the
+        area of the full image that it covers.
+        """
+        size = (willow.image.width, willow.image.height)
+
+        # Transform the image
+        transform = self.get_transform(image, original_size or size)
+        rect = transform.get_rect()
+        if source_rect is None and original_size and original_size != size:
+            source_rect = Rect(0, 0, *original_size)
+        if source_rect is not None:
+            # Map the crop from the full image onto the reduced one
+            scale_x = size[0] / source_rect.width
+            scale_y = size[1] / source_rect.height
+            rect = Rect(
+                (rect.left - source_rect.left) * scale_x,
+                (rect.top - source_rect.top) * scale_y,
+                (rect.right - source_rect.left) * scale_x,
+                (rect.bottom - source_rect.top) * scale_y,
+            )
+        willow = willow.crop(rect.round())
+        willow = willow.resize(transform.size)
+
+        # Apply filters
+        env = {
+            "original-format": original_format,
+        }
+        for operation in self.filter_operations:
+            willow = operation.run(willow, image, env) or willow
+
+        # Find the output format to use
+        if "output-format" in env:
+            # Developer specified an output format
+            output_format = env["output-format"]
+        else:
+            # Convert avif, bmp and webp to png, and heic to jpg, by default
+            default_conversions = {
+                "avif": "png",
+                "bmp": "png",
+                "webp": "png",
+                "heic": "jpeg",
             }
-            for operation in self.filter_operations:
-                willow = operation.run(willow, image, env) or willow
 
-            # Find the output format to use
-            if "output-format" in env:
-                # Developer specified an output format
-                output_format = env["output-format"]
-            else:
-                # Convert avif, bmp and webp to png, and heic to jpg, by default
-                default_conversions = {
-                    "avif": "png",
-                    "bmp": "png",
-                    "webp": "png",
-                    "heic": "jpeg",
-                }
-
-                # Convert unanimated GIFs to PNG as well
-                if not willow.has_animation():
-                    default_conversions["gif"] = "png"
-
-                # Allow the user to override the conversions
-                conversion = getattr(settings, "WAGTAILIMAGES_FORMAT_CONVERSIONS", {})
-                default_conversions.update(conversion)
-
-                # Get the converted output format falling back to the original
-                output_format = default_conversions.get(
-                    original_format, original_format
-                )
+            # Convert unanimated GIFs to PNG as well
+            if not willow.has_animation():
+                default_conversions["gif"] = "png"
 
-            if output_format == "jpeg":
-                # Allow changing of JPEG compression quality
-                if "jpeg-quality" in env:
-                    quality = env["jpeg-quality"]
-                else:
-                    quality = getattr(settings, "WAGTAILIMAGES_JPEG_QUALITY", 85)
+            # Allow the user to override the conversions
+            conversion = getattr(settings, "WAGTAILIMAGES_FORMAT_CONVERSIONS", {})
+            default_conversions.update(conversion)
 
-                # If the image has an alpha channel, give it a white background
-                if willow.has_alpha():
-                    willow = willow.set_background_color_rgb((255, 255, 255))
+            # Get the converted output format falling back to the original
+            output_format = default_conversions.get(original_format, original_format)
 
-                return willow.save_as_jpeg(
-                    output, quality=quality, progressive=True, optimize=True
-                )
-            elif output_format == "png":
-                return willow.save_as_png(output, optimize=True)
-            elif output_format == "gif":
-                return willow.save_as_gif(output)
-            elif output_format == "webp":
-                # Allow changing of WebP compression quality
-                if (
-                    "output-format-options" in env
-                    and "lossless" in env["output-format-options"]
-                ):
-                    return willow.save_as_webp(output, lossless=True)
-                elif "webp-quality" in env:
-                    quality = env["webp-quality"]
-                else:
-                    quality = getattr(settings, "WAGTAILIMAGES_WEBP_QUALITY", 80)
+        if output_format == "jpeg":
+            # Allow changing of JPEG compression quality
+            if "jpeg-quality" in env:
+                quality = env["jpeg-quality"]
+            else:
+                quality = getattr(settings, "WAGTAILIMAGES_JPEG_QUALITY", 85)
 
-                return willow.save_as_webp(output, quality=quality)
-            elif output_format == "avif":
-                # Allow changing of AVIF compression quality
-                if (
-                    "output-format-options" in env
-                    and "lossless" in env["output-format-options"]
-                ):
-                    return willow.save_as_avif(output, lossless=True)
-                elif "avif-quality" in env:
-                    quality = env["avif-quality"]
-                else:
-                    quality = getattr(settings, "WAGTAILIMAGES_AVIF_QUALITY", 80)
-                return willow.save_as_avif(output, quality=quality)
-            elif output_format == "heic":
-                # Allow changing of HEIC compression quality. Safari is the only browser that supports HEIC,
-                # so there is little value in outputting it - for that reason, we make it work if someone
-                # explicitly requests it, but these settings are not documented.
-                if (
-                    "output-format-options" in env
-                    and "lossless" in env["output-format-options"]
-                ):
-                    return willow.save_as_heic(output, lossless=True)
-                elif "heic-quality" in env:
-                    quality = env["heic-quality"]
-                else:
-                    quality = getattr(settings, "WAGTAILIMAGES_HEIC_QUALITY", 80)
-                return willow.save_as_heic(output, quality=quality)
-            elif output_format == "svg":
-                return willow.save_as_svg(output)
-            elif output_format == "ico":
-                return willow.save_as_ico(output)
-            raise UnknownOutputImageFormatError(
-                f"Unknown output image format '{output_format}'"
+            # If the image has an alpha channel, give it a white background
+            if willow.has_alpha():
+                willow = willow.set_background_color_rgb((255, 255, 255))
+
+            return willow.save_as_jpeg(
+                output, quality=quality, progressive=True, optimize=True
             )
+        elif output_format == "png":
+            return willow.save_as_png(output, optimize=True)
+        elif output_format == "gif":
+            return willow.save_as_gif(output)
+        elif output_format == "webp":
+            # Allow changing of WebP compression quality
+            if (
+                "output-format-options" in env
+                and "lossless" in env["output-format-options"]
+            ):
+                return willow.save_as_webp(output, lossless=True)
+            elif "webp-quality" in env:
+                quality = env["webp-quality"]
+            else:
+                quality = getattr(settings, "WAGTAILIMAGES_WEBP_QUALITY", 80)
+
+            return willow.save_as_webp(output, quality=quality)
+        elif output_format == "avif":
+            # Allow changing of AVIF compression quality
+            if (
+                "output-format-options" in env
+                and "lossless" in env["output-format-options"]
+            ):
+                return willow.save_as_avif(output, lossless=True)
+            elif "avif-quality" in env:
+                quality = env["avif-quality"]
+            else:
+                quality = getattr(settings, "WAGTAILIMAGES_AVIF_QUALITY", 80)
+            return willow.save_as_avif(output, quality=quality)
+        elif output_format == "heic":
+            # Allow changing of HEIC compression quality. Safari is the only browser that supports HEIC,
+            # so there is little value in outputting it - for that reason, we make it work if someone
+            # explicitly requests it, but these settings are not documented.
+            if (
+                "output-format-options" in env
+                and "lossless" in env["output-format-options"]
+            ):
+                return willow.save_as_heic(output, lossless=True)
+            elif "heic-quality" in env:
+                quality = env["heic-quality"]
+            else:
+                quality = getattr(settings, "WAGTAILIMAGES_HEIC_QUALITY", 80)
+            return willow.save_as_heic(output, quality=quality)
+        elif output_format == "svg":
+            return willow.save_as_svg(output)
+        elif output_format == "ico":
+            return willow.save_as_ico(output)
+        raise UnknownOutputImageFormatError(
+            f"Unknown output image format '{output_format}'"
+        )
 
     def get_cache_key(self, image):
         vary_parts = []
@@ -1326,6 +2072,11 @@ class AbstractRendition(ImageFileMixin, models.Model):
     focal_point_key = models.CharField(
         max_length=16, blank=True, default="", editable=False
     )
+    file_format = models.CharField(
+        max_length=10, blank=True, default="", editable=False
+    )
+    file_size = models.PositiveIntegerField(null=True, editable=False)
+    created_at = models.DateTimeField(auto_now_add=True, null=True, editable=False)
 
     wagtail_reference_index_ignore = True
 
@@ -1375,6 +2126,14 @@ class AbstractRendition(ImageFileMixin, models.Model):
             url = settings.WAGTAILADMIN_BASE_URL + url
         return url
 
+    @property
+    def mime_type(self):
+        """
+        The MIME type of the rendition's file, or ``None`` if it was not
+        recorded when the rendition was created.
+        """
+        return IMAGE_FORMAT_MIME_TYPES.get(self.file_format)
+
     @property
     def filter(self):
         return Filter(self.filter_spec)
@@ -1,14 +1,24 @@
-from wagtail.images.models import SourceImageIOError
+import copy
 
+from wagtail.images.models import (
+    Filter,
+    SourceImageIOError,
+    get_renditions_for_images,
+)
 
-def get_rendition_or_not_found(image, specs):
+
+def get_rendition_or_not_found(image, specs, request=None):
     """
     Tries to get / create the rendition for the image or renders a not-found image if it does not exist.
 
     :param image: AbstractImage
     :param specs: str or Filter
+    :param request: If given, the rendition is kept in the request's RenditionRegistry
     :return: Rendition
     """
+    if registry := get_rendition_registry(request):
+        return registry.get_rendition(image, specs)
+
     try:
         return image.get_rendition(specs)
     except SourceImageIOError:
@@ -23,14 +33,18 @@ def get_rendition_or_not_found(image, specs):
         return rendition
 
 
-def get_renditions_or_not_found(image, specs):
+def get_renditions_or_not_found(image, specs, request=None):
     """
     Like get_rendition_or_not_found, but for multiple renditions.
     Tries to get / create the renditions for the image or renders not-found images if the image does not exist.
 
     :param image: AbstractImage
     :param specs: iterable of str or Filter
+    :param request: If given, the renditions are kept in the request's RenditionRegistry
     """
+    if registry := get_rendition_registry(request):
+        return registry.get_renditions(image, specs)
+
     try:
         return image.get_renditions(*specs)
     except SourceImageIOError:
@@ -40,3 +54,114 @@ def get_renditions_or_not_found(image, specs):
         return {
             spec if isinstance(spec, str) else spec.spec: rendition for spec in specs
         }
+
+
+def get_rendition_registry(request):
+    """
+    Return the RenditionRegistry for the given request, creating it if needed.
+    Returns ``None`` if there is no request.
+    """
+    if request is None:
+        return None
+
+    try:
+        return request._wagtail_rendition_registry
+    except AttributeError:
+        request._wagtail_rendition_registry = RenditionRegistry()
+        return request._wagtail_rendition_registry
+
+
+class RenditionRegistry:
+    """
+    Keeps the renditions used while handling a request, so that each rendition
+    is only looked up once. The renditions for many images can be looked up
+    together ahead of rendering with ``prefetch()``, after which the image
+    template tags find them here rather than looking up each one in turn.
+    """
+
+    def __init__(self):
+        self.renditions = {}
+
+    def get_key(self, image, filter):
+        return (
+            image.get_rendition_model(),
+            image.pk,
+            image.file_hash,
+            filter.get_cache_key(image),
+            filter.spec,
+        )
+
+    def prefetch(self, images, *specs):
+        """
+        Look up the renditions of all of the given images for the given filter
+        specs, using ``get_renditions_for_images()``.
+        """
+        filters = [
+            Filter(spec=spec) if isinstance(spec, str) else spec for spec in specs
+        ]
+        images = [image for image in images if image]
+        try:
+            renditions = get_renditions_for_images(images, *filters)
+        except SourceImageIOError:
+            # Leave the images to be looked up one at a time, so that only the
+            # images with missing files are shown as not found
+            return
+
+        for image, image_renditions in renditions.items():
+            for filter in filters:
+                spec = image.clean_filter_for_svg(filter).spec
+                self.renditions[self.get_key(image, filter)] = image_renditions[spec]
+
+    def get_rendition(self, image, spec):
+        """
+        Return the rendition of the image for the given filter spec, as
+        ``get_rendition_or_not_found`` would.
+        """
+        filter = Filter(spec=spec) if isinstance(spec, str) else spec
+        key = self.get_key(image, filter)
+        try:
+            rendition = self.renditions[key]
+        except KeyError:
+            rendition = self.renditions[key] = get_rendition_or_not_found(image, filter)
+        return self.get_rendition_for_image(rendition, image)
+
+    def get_rendition_for_image(self, rendition, image):
+        """
+        Return a copy of the kept rendition, associated with the given image
+        instance so that locally set properties such as contextual_alt_text are
+        respected. Other instances of the same image may be using the kept
+        rendition at the same time.
+        """
+        rendition = copy.copy(rendition)
+        rendition.image = image
+        return rendition
+
+    def get_renditions(self, image, specs):
+        """
+        Return the renditions of the image for the given filter specs, as
+        ``get_renditions_or_not_found`` would.
+        """
+        filters = [
+            Filter(spec=spec) if isinstance(spec, str) else spec for spec in specs
+        ]
+        missing = [f for f in filters if self.get_key(image, f) not in self.renditions]
+        if missing:
+            renditions = get_renditions_or_not_found(image, missing)
+            for filter in missing:
+                try:
+                    spec = image.clean_filter_for_svg(filter).spec
+                    rendition = renditions[spec]
+                except KeyError:
+                    # The image file is missing, so the not-found rendition is
+                    # keyed by the original spec
+                    rendition = renditions[filter.spec]
+                self.renditions[self.get_key(image, filter)] = rendition
+
+        result = {}
+        for filter in filters:
+            spec = image.clean_filter_for_svg(filter).spec
+            if spec not in result:
+                result[spec] = self.get_rendition_for_image(
+                    self.renditions[self.get_key(image, filter)], image
+                )
+        return result
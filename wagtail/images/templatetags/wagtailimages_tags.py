@@ -141,6 +141,7 @@ class ImageNode(template.Node):
         rendition = get_rendition_or_not_found(
             image,
             self.get_filter(),
+            request=context.get("request"),
         )
 
         if self.output_var_name:
@@ -167,7 +168,9 @@ class SrcsetImageNode(ImageNode):
             return ""
 
         specs = self.get_filters()
-        renditions = get_renditions_or_not_found(image, specs)
+        renditions = get_renditions_or_not_found(
+            image, specs, request=context.get("request")
+        )
 
         if self.output_var_name:
             # Wrap the renditions in ResponsiveImage object, to support both
@@ -192,6 +195,7 @@ class PictureNode(SrcsetImageNode):
         renditions = get_renditions_or_not_found(
             image,
             self.get_filters(),
+            request=context.get("request"),
         )
 
         if self.output_var_name:
@@ -4,6 +4,7 @@ from django.apps import apps
 from django.template import TemplateSyntaxError, engines
 from django.test import TestCase
 
+from wagtail.images import jinja2tags
 from wagtail.models import Site
 
 from .utils import (
@@ -55,6 +56,17 @@ class TestImageJinja(JinjaImagesTestCase):
         rendered = self.render('{{ image(myimage, "width-2") }}', {"myimage": None})
         self.assertEqual(rendered, "")
 
+    def test_call_functions_directly(self):
+        # The module-level functions don't take a template context
+        rendition = jinja2tags.image(self.image, "width-200")
+        self.assertEqual(rendition.width, 200)
+        self.assertEqual(
+            len(jinja2tags.srcset_image(self.image, "width-{100,200}").renditions), 2
+        )
+        self.assertEqual(
+            len(jinja2tags.picture(self.image, "format-{jpeg,webp}").renditions), 2
+        )
+
     def test_image_attributes(self):
         self.assertHTMLEqual(
             self.render(
@@ -1,11 +1,24 @@
+import os
 import re
+import tempfile
 import warnings
 from io import StringIO
+from unittest import mock
 
 from django.core import management
+from django.core.management.base import CommandError
+from django.db import connection
 from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 
-from ..management.commands.wagtail_update_image_renditions import progress_bar
+from wagtail.images.models import Filter
+
+from ..management.commands.wagtail_update_image_renditions import (
+    Command,
+    get_api_field_filter_specs,
+    get_template_filter_specs,
+    progress_bar,
+)
 from .utils import Image, get_test_image_file
 
 # note .utils.Image already does get_image_model()
@@ -138,3 +151,169 @@ class TestUpdateImageRenditions(TestCase):
         self.assertIn(
             f"Successfully processed {total_renditions} rendition(s)\n", output_string
         )
+
+
+class TestWarmUpImageRenditions(TestCase):
+    REAESC = re.compile(r"\x1b[^m]*m")
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.images = [
+            Image.objects.create(
+                title=f"Test image {i}",
+                file=get_test_image_file(filename=f"test_image_{i}.png"),
+            )
+            for i in range(3)
+        ]
+        # The first image already has one of the renditions
+        cls.images[0].get_rendition("width-100")
+
+    def run_command(self, **options):
+        output = StringIO()
+        management.call_command(
+            "wagtail_update_image_renditions",
+            warm_up=True,
+            stdout=output,
+            stderr=StringIO(),
+            **options,
+        )
+        output.seek(0)
+        return self.REAESC.sub("", output.read())
+
+    def get_rendition_specs(self, image):
+        return set(image.renditions.values_list("filter_spec", flat=True))
+
+    def test_warm_up(self):
+        output = self.run_command(filter_specs=["width-{100,200}", "fill-50x50"])
+
+        self.assertIn("Warming up 3 filter spec(s) for 3 image(s)\n", output)
+        self.assertIn("Successfully created 8 rendition(s) for 3 image(s)\n", output)
+        for image in self.images:
+            self.assertEqual(
+                self.get_rendition_specs(image),
+                {"width-100", "width-200", "fill-50x50"},
+            )
+
+        # Nothing is left to generate on a second run
+        output = self.run_command(filter_specs=["width-{100,200}", "fill-50x50"])
+        self.assertIn("Successfully created 0 rendition(s) for 3 image(s)\n", output)
+
+    def test_warm_up_creates_renditions_for_new_focal_point(self):
+        image = self.images[0]
+        image.focal_point_x = 10
+        image.focal_point_y = 10
+        image.focal_point_width = 5
+        image.focal_point_height = 5
+        image.save()
+
+        self.run_command(filter_specs=["width-100", "fill-50x50"])
+
+        # width-100 doesn't depend on the focal point, so the existing rendition
+        # is still valid
+        self.assertEqual(image.renditions.filter(filter_spec="width-100").count(), 1)
+        self.assertTrue(
+            image.renditions.filter(
+                filter_spec="fill-50x50",
+                focal_point_key=Filter("fill-50x50").get_cache_key(image),
+            ).exists()
+        )
+
+    def test_warm_up_finds_missing_renditions_in_one_query_per_chunk(self):
+        command = Command()
+        filters = [Filter("width-100"), Filter("width-200")]
+        with self.assertNumQueries(1):
+            missing = command.get_missing_filters(self.images, filters)
+
+        self.assertEqual(missing[self.images[0]], [Filter("width-200")])
+        self.assertEqual(missing[self.images[1]], filters)
+        self.assertEqual(missing[self.images[2]], filters)
+
+    def test_warm_up_resumes_from_progress_file(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            progress_file = os.path.join(tmpdir, "progress")
+            with open(progress_file, "w") as f:
+                f.write(str(self.images[1].pk))
+
+            output = self.run_command(
+                filter_specs=["width-200"], progress_file=progress_file
+            )
+
+            self.assertIn(f"Resuming after image {self.images[1].pk}\n", output)
+            self.assertIn("for 1 image(s)\n", output)
+            # The progress file is removed once the warm-up is complete
+            self.assertFalse(os.path.exists(progress_file))
+
+        self.assertEqual(self.get_rendition_specs(self.images[1]), set())
+        self.assertEqual(self.get_rendition_specs(self.images[2]), {"width-200"})
+
+    def test_warm_up_records_progress(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            progress_file = os.path.join(tmpdir, "progress")
+            with mock.patch.object(
+                Command, "generate_renditions", side_effect=[1, KeyboardInterrupt]
+            ):
+                with self.assertRaises(KeyboardInterrupt):
+                    self.run_command(
+                        filter_specs=["width-200"],
+                        progress_file=progress_file,
+                        chunk_size=1,
+                    )
+
+            with open(progress_file) as f:
+                self.assertEqual(f.read(), str(self.images[0].pk))
+
+    def test_warm_up_filters_each_chunk_once(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.run_command(filter_specs=["width-100"], chunk_size=1)
+
+        image_table = connection.ops.quote_name(Image._meta.db_table)
+        chunk_queries = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith("SELECT")
+            and f"FROM {image_table}" in query["sql"]
+            and "LIMIT 1" in query["sql"]
+        ]
+        self.assertEqual(len(chunk_queries), 4)
+        # Later chunks only filter on the last image ID of the previous chunk
+        for sql in chunk_queries:
+            self.assertLessEqual(sql.count(" > "), 1)
+
+    def test_warm_up_with_no_workers(self):
+        with self.assertRaisesMessage(CommandError, "--workers must be at least 1"):
+            self.run_command(filter_specs=["width-100"], workers=0)
+
+    def test_warm_up_without_filter_specs(self):
+        with self.assertRaisesMessage(CommandError, "No filter specs to warm up"):
+            self.run_command()
+
+    def test_warm_up_with_invalid_filter_spec(self):
+        with self.assertRaisesMessage(CommandError, "Invalid filter spec 'wdth-100'"):
+            self.run_command(filter_specs=["wdth-100"])
+
+    def test_warm_up_with_purge_only(self):
+        with self.assertRaises(CommandError):
+            self.run_command(filter_specs=["width-100"], purge_only=True)
+
+    def test_discover_filter_specs(self):
+        # Used in the event page template
+        self.assertIn("width-200", get_template_filter_specs())
+        # Used in the demo site's API fields
+        self.assertIn("fill-300x300", get_api_field_filter_specs())
+
+        with (
+            mock.patch(
+                "wagtail.images.management.commands.wagtail_update_image_renditions.get_template_filter_specs",
+                return_value={"width-200"},
+            ),
+            mock.patch(
+                "wagtail.images.management.commands.wagtail_update_image_renditions.get_api_field_filter_specs",
+                return_value={"fill-300x300"},
+            ),
+        ):
+            self.run_command(discover_filter_specs=True)
+
+        for image in self.images:
+            self.assertTrue(
+                {"width-200", "fill-300x300"} <= self.get_rendition_specs(image)
+            )
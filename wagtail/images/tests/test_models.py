@@ -7,6 +7,7 @@ from django.conf import settings
 from django.contrib.auth.models import Group, Permission
 from django.core import checks, management
 from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
 from django.core.files import File
 from django.core.files.storage import Storage, default_storage, storages
 from django.core.files.uploadedfile import SimpleUploadedFile
@@ -24,6 +25,8 @@ from wagtail.images.models import (
     ResponsiveImage,
     SourceImageIOError,
     get_rendition_storage,
+    get_renditions_for_images,
+    shutdown_rendition_process_pool,
 )
 from wagtail.images.rect import Rect
 from wagtail.models import Collection, GroupCollectionPermission, Page, ReferenceIndex
@@ -43,6 +46,7 @@ from wagtail.test.utils import WagtailTestUtils
 from .utils import (
     Image,
     get_test_image_file,
+    get_test_image_file_jpeg,
     get_test_image_file_svg,
     get_test_image_filename,
 )
@@ -834,6 +838,428 @@ class TestRenditions(TestCase):
         # But, we should see equality on the keys
         self.assertEqual(third_result.keys(), result.keys())
 
+    def test_create_renditions_decodes_source_once(self):
+        filter_list = [Filter(spec) for spec in self.SPECS]
+
+        with mock.patch.object(Filter, "run") as run:
+            result = self.image.create_renditions(*filter_list)
+
+        # The filters were applied to the shared decoded image, instead of
+        # opening the original file themselves
+        run.assert_not_called()
+        self.assertEqual(len(result), len(filter_list))
+
+    def test_create_renditions_with_custom_run_method(self):
+        class CustomFilter(Filter):
+            def run(self, image, output, source=None):
+                return super().run(image, output, source=source)
+
+        filter_list = [Filter("width-400"), CustomFilter("fill-100x100")]
+        self.assertIsNone(
+            self.image.decode_rendition_source(self.image.file.read(), filter_list)
+        )
+
+        result = self.image.create_renditions(*filter_list)
+        self.assertEqual(result[filter_list[0]].width, 400)
+        self.assertEqual(result[filter_list[1]].width, 100)
+
+    def test_decode_rendition_source_uses_jpeg_draft_mode(self):
+        image = Image.objects.create(
+            title="Large JPEG",
+            file=get_test_image_file_jpeg(size=(2000, 1500)),
+        )
+        filter_list = [Filter("width-400"), Filter("fill-200x200")]
+
+        with image.open_file() as f:
+            decoded = image.decode_rendition_source(f.read(), filter_list)
+
+        self.assertEqual(decoded.original_format, "jpeg")
+        self.assertEqual(decoded.original_size, (2000, 1500))
+        # Decoded at a reduced size, but still large enough for every filter
+        self.assertEqual(decoded.willow_image.get_size(), (1000, 750))
+
+        result = image.create_renditions(*filter_list)
+        self.assertEqual(
+            (result[filter_list[0]].width, result[filter_list[0]].height), (400, 300)
+        )
+        self.assertEqual(
+            (result[filter_list[1]].width, result[filter_list[1]].height), (200, 200)
+        )
+
+    def test_decode_rendition_source_without_draft_mode(self):
+        image = Image.objects.create(
+            title="Large JPEG",
+            file=get_test_image_file_jpeg(size=(2000, 1500)),
+        )
+
+        # One of the renditions needs the image at full size
+        with image.open_file() as f:
+            decoded = image.decode_rendition_source(
+                f.read(), [Filter("width-400"), Filter("original")]
+            )
+
+        self.assertEqual(decoded.willow_image.get_size(), (2000, 1500))
+
+    def _test_create_renditions_with_executor(self):
+        filter_list = [Filter(spec) for spec in self.SPECS]
+        result = self.image.create_renditions(*filter_list)
+
+        self.assertEqual(set(result.keys()), set(filter_list))
+        for filter, rendition in result.items():
+            self.assertEqual(rendition.filter_spec, filter.spec)
+            with rendition.get_willow_image() as willow_image:
+                self.assertEqual(
+                    willow_image.get_size(), (rendition.width, rendition.height)
+                )
+        return result
+
+    @override_settings(WAGTAILIMAGES_RENDITION_EXECUTOR="inline")
+    def test_create_renditions_with_inline_executor(self):
+        with mock.patch(
+            "concurrent.futures.ThreadPoolExecutor.submit"
+        ) as thread_pool_submit:
+            self._test_create_renditions_with_executor()
+        thread_pool_submit.assert_not_called()
+
+    @override_settings(
+        WAGTAILIMAGES_RENDITION_EXECUTOR="thread",
+        WAGTAILIMAGES_RENDITION_MAX_WORKERS=1,
+    )
+    def test_create_renditions_with_thread_executor(self):
+        self._test_create_renditions_with_executor()
+
+    @override_settings(
+        WAGTAILIMAGES_RENDITION_EXECUTOR="process",
+        WAGTAILIMAGES_RENDITION_MAX_WORKERS=2,
+    )
+    def test_create_renditions_with_process_executor(self):
+        self.addCleanup(shutdown_rendition_process_pool)
+        result = self._test_create_renditions_with_executor()
+
+        # The same images are generated as within this process
+        for filter, rendition in result.items():
+            generated_file = self.image.generate_rendition_file(filter)
+            generated_file.seek(0)
+            with rendition.open_file() as f:
+                self.assertEqual(f.read(), generated_file.read())
+
+    @override_settings(WAGTAILIMAGES_RENDITION_EXECUTOR="process")
+    def test_create_renditions_with_process_executor_in_daemonic_process(self):
+        with (
+            mock.patch(
+                "multiprocessing.current_process", return_value=mock.Mock(daemon=True)
+            ),
+            mock.patch(
+                "wagtail.images.models.get_rendition_process_pool"
+            ) as get_rendition_process_pool,
+        ):
+            self._test_create_renditions_with_executor()
+        get_rendition_process_pool.assert_not_called()
+
+    @override_settings(WAGTAILIMAGES_RENDITION_EXECUTOR="fibres")
+    def test_create_renditions_with_invalid_executor(self):
+        with self.assertRaises(ImproperlyConfigured):
+            self.image.create_renditions(Filter("width-400"), Filter("width-200"))
+
+    def get_rendition_lock_key(self, spec):
+        filter = Filter(spec)
+        return (
+            Rendition.construct_cache_key(
+                self.image, filter.get_cache_key(self.image), filter.spec
+            )
+            + "-lock"
+        )
+
+    @override_settings(
+        CACHES={
+            "renditions": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            },
+        },
+        WAGTAILIMAGES_RENDITION_LOCK_TIMEOUT=10,
+    )
+    def test_create_rendition_releases_lock(self):
+        lock_key = self.get_rendition_lock_key("width-400")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            rendition = self.image.create_rendition(Filter("width-400"))
+            # The lock is held until the rendition is committed
+            self.assertTrue(Rendition.cache_backend.get(lock_key))
+
+        self.assertEqual(rendition.filter_spec, "width-400")
+        self.assertIsNone(Rendition.cache_backend.get(lock_key))
+
+    @override_settings(
+        CACHES={
+            "renditions": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            },
+        },
+        WAGTAILIMAGES_RENDITION_LOCK_TIMEOUT=10,
+    )
+    def test_create_rendition_waits_for_locked_rendition(self):
+        lock_key = self.get_rendition_lock_key("width-400")
+        Rendition.cache_backend.add(lock_key, True, 10)
+        other_rendition = None
+
+        def finish_other_rendition(seconds):
+            # Another process finishes the rendition while this one waits
+            nonlocal other_rendition
+            if other_rendition is None:
+                other_rendition = self.image.renditions.create(
+                    filter_spec="width-400",
+                    focal_point_key=Filter("width-400").get_cache_key(self.image),
+                    file=get_test_image_file(),
+                )
+                Rendition.cache_backend.delete(lock_key)
+
+        with (
+            mock.patch("wagtail.images.models.time.sleep", finish_other_rendition),
+            mock.patch.object(
+                self.image, "generate_rendition_file"
+            ) as generate_rendition_file,
+        ):
+            rendition = self.image.create_rendition(Filter("width-400"))
+
+        generate_rendition_file.assert_not_called()
+        self.assertEqual(rendition, other_rendition)
+
+    @override_settings(
+        CACHES={
+            "renditions": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            },
+        },
+        WAGTAILIMAGES_RENDITION_LOCK_TIMEOUT=1,
+    )
+    def test_create_rendition_after_lock_timeout(self):
+        lock_key = self.get_rendition_lock_key("width-400")
+        Rendition.cache_backend.add(lock_key, True, 10)
+        self.addCleanup(Rendition.cache_backend.delete, lock_key)
+
+        with mock.patch("wagtail.images.models.time.sleep") as sleep:
+            with mock.patch(
+                "wagtail.images.models.time.monotonic", side_effect=[0, 0, 0.5, 0.5, 2]
+            ):
+                rendition = self.image.create_rendition(Filter("width-400"))
+
+        self.assertEqual(sleep.call_count, 2)
+        self.assertEqual(rendition.filter_spec, "width-400")
+        # The lock belongs to the other process, so is left alone
+        self.assertTrue(Rendition.cache_backend.get(lock_key))
+
+    @override_settings(
+        CACHES={
+            "renditions": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            },
+        },
+        WAGTAILIMAGES_RENDITION_LOCK_TIMEOUT=10,
+    )
+    def test_create_rendition_releases_lock_on_error(self):
+        lock_key = self.get_rendition_lock_key("width-400")
+
+        with mock.patch.object(
+            self.image, "generate_rendition_file", side_effect=SourceImageIOError
+        ):
+            with self.assertRaises(SourceImageIOError):
+                self.image.create_rendition(Filter("width-400"))
+
+        self.assertIsNone(Rendition.cache_backend.get(lock_key))
+
+    @override_settings(
+        CACHES={
+            "renditions": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            },
+        },
+        WAGTAILIMAGES_RENDITION_LOCK_TIMEOUT=10,
+    )
+    def test_create_renditions_releases_locks(self):
+        lock_keys = [
+            self.get_rendition_lock_key(spec) for spec in ["width-400", "width-200"]
+        ]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            renditions = self.image.create_renditions(
+                Filter("width-400"), Filter("width-200")
+            )
+            # The locks are held until the renditions are committed
+            for lock_key in lock_keys:
+                self.assertTrue(Rendition.cache_backend.get(lock_key))
+
+        self.assertEqual(
+            {rendition.filter_spec for rendition in renditions.values()},
+            {"width-400", "width-200"},
+        )
+        for lock_key in lock_keys:
+            self.assertIsNone(Rendition.cache_backend.get(lock_key))
+
+    @override_settings(
+        CACHES={
+            "renditions": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            },
+        },
+        WAGTAILIMAGES_RENDITION_LOCK_TIMEOUT=10,
+    )
+    def test_create_renditions_waits_for_locked_rendition(self):
+        lock_key = self.get_rendition_lock_key("width-400")
+        Rendition.cache_backend.add(lock_key, True, 10)
+        other_rendition = None
+
+        def finish_other_rendition(seconds):
+            # Another process finishes the rendition while this one waits
+            nonlocal other_rendition
+            if other_rendition is None:
+                other_rendition = self.image.renditions.create(
+                    filter_spec="width-400",
+                    focal_point_key=Filter("width-400").get_cache_key(self.image),
+                    file=get_test_image_file(),
+                )
+                Rendition.cache_backend.delete(lock_key)
+
+        with mock.patch("wagtail.images.models.time.sleep", finish_other_rendition):
+            renditions = self.image.create_renditions(
+                Filter("width-400"), Filter("width-200")
+            )
+
+        self.assertEqual(renditions[Filter("width-400")], other_rendition)
+        self.assertEqual(renditions[Filter("width-200")].filter_spec, "width-200")
+        # Only the rendition that wasn't locked was generated here
+        self.assertEqual(
+            self.image.renditions.filter(filter_spec="width-400").count(), 1
+        )
+
+    @override_settings(
+        CACHES={
+            "renditions": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            },
+        },
+        WAGTAILIMAGES_RENDITION_LOCK_TIMEOUT=10,
+    )
+    def test_create_renditions_releases_locks_on_error(self):
+        lock_keys = [
+            self.get_rendition_lock_key(spec) for spec in ["width-400", "width-200"]
+        ]
+
+        with mock.patch.object(self.image, "open_file", side_effect=SourceImageIOError):
+            with self.assertRaises(SourceImageIOError):
+                self.image.create_renditions(Filter("width-400"), Filter("width-200"))
+
+        for lock_key in lock_keys:
+            self.assertIsNone(Rendition.cache_backend.get(lock_key))
+
+    def test_decode_rendition_source_svg(self):
+        image = Image.objects.create(
+            title="SVG", file=get_test_image_file_svg(), width=100, height=100
+        )
+        with image.open_file() as f:
+            self.assertIsNone(
+                image.decode_rendition_source(f.read(), [Filter("width-400")])
+            )
+
+    def test_decode_rendition_source_from_renditions_disabled(self):
+        self.image.get_rendition("fill-400x300")
+
+        self.assertIsNone(
+            self.image.decode_rendition_source_from_renditions(Filter("fill-200x150"))
+        )
+
+    @override_settings(WAGTAILIMAGES_RENDITION_REUSE_MIN_SCALE=2)
+    def test_decode_rendition_source_from_renditions(self):
+        self.image.get_rendition("fill-400x300")
+        self.image.get_rendition("width-500")
+
+        # The smallest rendition that is large enough is used
+        decoded_source = self.image.decode_rendition_source_from_renditions(
+            Filter("fill-100x100")
+        )
+        self.assertEqual(decoded_source.original_format, "png")
+        self.assertEqual(decoded_source.original_size, (640, 480))
+        self.assertEqual(decoded_source.willow_image.get_size(), (400, 300))
+        self.assertEqual(decoded_source.source_rect, Rect(0, 0, 640, 480))
+
+        # Neither rendition is twice the size of the new one
+        self.assertIsNone(
+            self.image.decode_rendition_source_from_renditions(Filter("fill-300x225"))
+        )
+
+        # The rendition must be large enough for all of the filters
+        self.assertIsNone(
+            self.image.decode_rendition_source_from_renditions(
+                Filter("fill-100x100"), Filter("fill-300x225")
+            )
+        )
+
+    @override_settings(WAGTAILIMAGES_RENDITION_REUSE_MIN_SCALE=2)
+    def test_decode_rendition_source_from_renditions_with_crop(self):
+        self.image.get_rendition("fill-320x120")
+
+        # fill-160x60 crops the same area of the original
+        decoded_source = self.image.decode_rendition_source_from_renditions(
+            Filter("fill-160x60")
+        )
+        self.assertEqual(decoded_source.source_rect, Rect(0, 120, 640, 360))
+
+        # fill-100x100 needs more of the original than the rendition covers
+        self.assertIsNone(
+            self.image.decode_rendition_source_from_renditions(Filter("fill-100x100"))
+        )
+
+    @override_settings(WAGTAILIMAGES_RENDITION_REUSE_MIN_SCALE=2)
+    def test_decode_rendition_source_from_renditions_ignores_unsuitable(self):
+        # Changed other than by resizing
+        self.image.get_rendition("fill-400x300|format-webp")
+        # Cropped around a different focal point
+        self.image.get_rendition("fill-400x300-c100")
+        self.image.focal_point_x = 100
+        self.image.focal_point_y = 100
+        self.image.focal_point_width = 50
+        self.image.focal_point_height = 50
+
+        self.assertIsNone(
+            self.image.decode_rendition_source_from_renditions(Filter("fill-100x75"))
+        )
+
+    @override_settings(WAGTAILIMAGES_RENDITION_REUSE_MIN_SCALE=2)
+    def test_create_rendition_from_larger_rendition(self):
+        self.image.get_rendition("fill-400x300")
+
+        with mock.patch.object(Filter, "run") as run:
+            rendition = self.image.create_rendition(Filter("fill-200x150"))
+
+        # The original image isn't used
+        run.assert_not_called()
+        self.assertEqual((rendition.width, rendition.height), (200, 150))
+        with rendition.get_willow_image() as willow_image:
+            self.assertEqual(willow_image.get_size(), (200, 150))
+
+    @override_settings(WAGTAILIMAGES_RENDITION_REUSE_MIN_SCALE=2)
+    def test_create_renditions_from_larger_rendition(self):
+        self.image.get_rendition("fill-400x300")
+
+        with (
+            mock.patch.object(
+                Image, "decode_rendition_source"
+            ) as decode_rendition_source,
+            mock.patch.object(Filter, "run") as run,
+        ):
+            renditions = self.image.create_renditions(
+                Filter("fill-200x150"), Filter("fill-100x75")
+            )
+
+        # The original image isn't decoded
+        decode_rendition_source.assert_not_called()
+        run.assert_not_called()
+        self.assertEqual(
+            sorted(
+                (rendition.width, rendition.height) for rendition in renditions.values()
+            ),
+            [(100, 75), (200, 150)],
+        )
+
     def test_alt_attribute(self):
         rendition = self.image.get_rendition("width-400")
         self.assertEqual(rendition.alt, "Test image")
@@ -1092,6 +1518,113 @@ class TestRenditions(TestCase):
         self.assertEqual(renditions["width-200"].url, filename2)
 
 
+@override_settings(
+    CACHES={
+        "renditions": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        },
+    },
+)
+class TestGetRenditionsForImages(TestCase):
+    SPECS = ("width-200", "width-400")
+
+    def setUp(self):
+        self.images = [
+            Image.objects.create(title=f"Test image {i}", file=get_test_image_file())
+            for i in range(3)
+        ]
+        self.svg_image = Image.objects.create(
+            title="Test SVG image", file=get_test_image_file_svg()
+        )
+        Rendition.cache_backend.clear()
+
+    def test_get_renditions_for_images(self):
+        result = get_renditions_for_images(self.images, *self.SPECS)
+
+        self.assertEqual(list(result.keys()), self.images)
+        for image in self.images:
+            renditions = result[image]
+            self.assertEqual(tuple(renditions.keys()), self.SPECS)
+            self.assertEqual(renditions["width-200"].width, 200)
+            self.assertEqual(renditions["width-400"].image, image)
+            self.assertEqual(
+                {spec: r.file.name for spec, r in renditions.items()},
+                {
+                    spec: r.file.name
+                    for spec, r in image.get_renditions(*self.SPECS).items()
+                },
+            )
+
+    def test_existing_renditions_are_found_in_one_query(self):
+        for image in self.images:
+            image.get_renditions(*self.SPECS)
+        Rendition.cache_backend.clear()
+        images = list(Image.objects.filter(pk__in=[i.pk for i in self.images]))
+
+        with (
+            mock.patch.object(
+                Rendition.cache_backend,
+                "get_many",
+                wraps=Rendition.cache_backend.get_many,
+            ) as get_many,
+            self.assertNumQueries(1),
+        ):
+            result = get_renditions_for_images(images, *self.SPECS)
+
+        get_many.assert_called_once()
+        self.assertEqual(len(result), 3)
+
+        # The renditions found in the database have been added to the cache
+        images = list(Image.objects.filter(pk__in=[i.pk for i in self.images]))
+        with (
+            mock.patch.object(Rendition.cache_backend, "set_many") as set_many,
+            self.assertNumQueries(0),
+        ):
+            result = get_renditions_for_images(images, *self.SPECS)
+
+        # Renditions from the cache are not written back to it
+        set_many.assert_not_called()
+        for image in images:
+            self.assertEqual(result[image]["width-200"].image, image)
+
+    def test_get_rendition_does_not_rewrite_cached_rendition(self):
+        image = self.images[0]
+        image.get_rendition("width-200")
+
+        image = Image.objects.get(pk=image.pk)
+        with mock.patch.object(Rendition.cache_backend, "set") as cache_set:
+            image.get_rendition("width-200")
+        cache_set.assert_not_called()
+
+    def test_prefetched_renditions(self):
+        get_renditions_for_images(self.images, *self.SPECS)
+        images = Image.objects.filter(
+            pk__in=[i.pk for i in self.images]
+        ).prefetch_renditions(*self.SPECS)
+        images = list(images)
+
+        with self.assertNumQueries(0):
+            result = get_renditions_for_images(images, *self.SPECS)
+
+        self.assertEqual(result[images[0]]["width-400"].width, 400)
+
+    def test_svg_image(self):
+        result = get_renditions_for_images(
+            [self.images[0], self.svg_image], "width-200|format-png|preserve-svg"
+        )
+
+        self.assertEqual(list(result[self.images[0]].keys()), ["width-200|format-png"])
+        self.assertEqual(list(result[self.svg_image].keys()), ["width-200"])
+
+    def test_empty_images(self):
+        self.assertEqual(
+            get_renditions_for_images(
+                [None, self.images[0], self.images[0]], "width-200"
+            ).keys(),
+            {self.images[0]: None}.keys(),
+        )
+
+
 @override_settings(
     CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
 )
@@ -1609,3 +2142,31 @@ class TestRenditionOrientation(TestCase):
         self.assertEqual(rendition.height, 450)
         # Check actual image dimensions and orientation
         self.assert_orientation_landscape_image_is_correct(rendition)
+
+    def test_create_renditions_with_orientation_and_jpeg_draft_mode(self):
+        with open("wagtail/images/tests/image_files/landscape_6.jpg", "rb") as f:
+            image = Image.objects.create(title="Test image", file=File(f))
+
+        filter_list = [Filter("width-150"), Filter("fill-100x100")]
+        with image.open_file() as f:
+            decoded = image.decode_rendition_source(f.read(), filter_list)
+        # The image is decoded at half size, after being rotated
+        self.assertEqual(decoded.original_size, (600, 450))
+        self.assertEqual(decoded.willow_image.get_size(), (300, 225))
+
+        result = image.create_renditions(*filter_list)
+        rendition = result[filter_list[0]]
+        self.assertEqual((rendition.width, rendition.height), (150, 112))
+
+        from willow.plugins.pillow import PillowImage
+
+        with rendition.get_willow_image() as willow_image:
+            pillow_image = PillowImage.open(willow_image).image.convert("RGB")
+        # Check that the red flower is in the bottom left
+        colour = pillow_image.getpixel((39, 70))
+        self.assertAlmostEqual(colour[0], 217, delta=40)
+        self.assertAlmostEqual(colour[1], 38, delta=40)
+        self.assertAlmostEqual(colour[2], 46, delta=40)
+
+        rendition = result[filter_list[1]]
+        self.assertEqual((rendition.width, rendition.height), (100, 100))
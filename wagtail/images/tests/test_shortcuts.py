@@ -1,8 +1,9 @@
-from django.test import TestCase
+from django.test import RequestFactory, TestCase
 
 from wagtail.images.models import Filter
 from wagtail.images.shortcuts import (
     get_rendition_or_not_found,
+    get_rendition_registry,
     get_renditions_or_not_found,
 )
 
@@ -62,3 +63,127 @@ class TestShortcuts(TestCase):
         self.assertEqual(tuple(renditions.keys()), ("width-200", "width-400"))
         self.assertEqual(renditions["width-200"].file.name, "not-found")
         self.assertEqual(renditions["width-400"].file.name, "not-found")
+
+
+class TestRenditionRegistry(TestCase):
+    fixtures = ["test.json"]
+
+    def setUp(self):
+        self.request = RequestFactory().get("/")
+        self.images = [
+            Image.objects.create(title=f"Test image {i}", file=get_test_image_file())
+            for i in range(3)
+        ]
+
+    def test_get_rendition_registry(self):
+        registry = get_rendition_registry(self.request)
+
+        self.assertIs(get_rendition_registry(self.request), registry)
+        self.assertIsNone(get_rendition_registry(None))
+
+    def test_get_rendition(self):
+        image = self.images[0]
+        rendition = get_rendition_or_not_found(image, "width-400", request=self.request)
+        self.assertEqual(rendition.width, 400)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                get_rendition_or_not_found(image, "width-400", request=self.request),
+                rendition,
+            )
+
+    def test_get_rendition_respects_image_instance(self):
+        image = self.images[0]
+        get_rendition_or_not_found(image, "width-400", request=self.request)
+
+        other_instance = Image.objects.get(pk=image.pk)
+        other_instance.contextual_alt_text = "Contextual alt text"
+        rendition = get_rendition_or_not_found(
+            other_instance, "width-400", request=self.request
+        )
+        self.assertEqual(rendition.alt, "Contextual alt text")
+
+    def test_renditions_are_not_shared_between_image_instances(self):
+        image = self.images[0]
+        image.contextual_alt_text = "First alt text"
+        rendition = get_rendition_or_not_found(image, "width-400", request=self.request)
+        renditions = get_renditions_or_not_found(
+            image, ("width-400",), request=self.request
+        )
+
+        other_instance = Image.objects.get(pk=image.pk)
+        other_instance.contextual_alt_text = "Second alt text"
+        other_rendition = get_rendition_or_not_found(
+            other_instance, "width-400", request=self.request
+        )
+        other_renditions = get_renditions_or_not_found(
+            other_instance, ("width-400",), request=self.request
+        )
+
+        # Renditions returned earlier keep their own image instance
+        self.assertEqual(rendition.alt, "First alt text")
+        self.assertEqual(renditions["width-400"].alt, "First alt text")
+        self.assertEqual(other_rendition.alt, "Second alt text")
+        self.assertEqual(other_renditions["width-400"].alt, "Second alt text")
+
+    def test_get_renditions(self):
+        image = self.images[0]
+        renditions = get_renditions_or_not_found(
+            image, ("width-200", "width-400"), request=self.request
+        )
+        self.assertEqual(tuple(renditions.keys()), ("width-200", "width-400"))
+        self.assertEqual(renditions["width-200"].width, 200)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                {
+                    spec: rendition.file.name
+                    for spec, rendition in get_renditions_or_not_found(
+                        image, ("width-200", "width-400"), request=self.request
+                    ).items()
+                },
+                {spec: rendition.file.name for spec, rendition in renditions.items()},
+            )
+            self.assertEqual(
+                get_rendition_or_not_found(
+                    image, "width-200", request=self.request
+                ).file.name,
+                renditions["width-200"].file.name,
+            )
+
+    def test_prefetch(self):
+        registry = get_rendition_registry(self.request)
+        registry.prefetch(self.images, "width-200", Filter("width-400"))
+
+        with self.assertNumQueries(0):
+            for image in self.images:
+                rendition = get_rendition_or_not_found(
+                    image, "width-200", request=self.request
+                )
+                self.assertEqual(rendition.image, image)
+                self.assertEqual(rendition.width, 200)
+
+                renditions = get_renditions_or_not_found(
+                    image, ("width-200", "width-400"), request=self.request
+                )
+                self.assertEqual(renditions["width-400"].width, 400)
+
+    def test_prefetch_with_missing_image_file(self):
+        bad_image = Image.objects.get(id=1)
+        registry = get_rendition_registry(self.request)
+        registry.prefetch([bad_image, self.images[0]], "width-400")
+
+        rendition = get_rendition_or_not_found(
+            bad_image, "width-400", request=self.request
+        )
+        self.assertEqual(rendition.file.name, "not-found")
+
+        renditions = get_renditions_or_not_found(
+            bad_image, ("width-200", "width-400"), request=self.request
+        )
+        self.assertEqual(renditions["width-200"].file.name, "not-found")
+
+        rendition = get_rendition_or_not_found(
+            self.images[0], "width-400", request=self.request
+        )
+        self.assertEqual(rendition.width, 400)
@@ -1,5 +1,5 @@
 from django.template import Context, Engine, TemplateSyntaxError, Variable
-from django.test import TestCase
+from django.test import RequestFactory, TestCase
 
 from wagtail.images.models import Image, Rendition
 from wagtail.images.templatetags.wagtailimages_tags import ImageNode
@@ -232,6 +232,21 @@ class ImageTagTestCase(ImagesTestCase):
                 {"myimage": self.image},
             )
 
+    def test_image_uses_request_rendition_registry(self):
+        request = RequestFactory().get("/")
+        context = {"myimage": self.image, "request": request}
+        template = (
+            "{% image myimage width-200 %}{% srcset_image myimage width-{200,400} %}"
+        )
+        self.render(template, context)
+
+        # Subsequent lookups in the same request should be kept on the request
+        with self.assertNumQueries(0):
+            rendered = self.render(template, context)
+
+        self.assertIn('<img alt="Test image" height="150"', rendered)
+        self.assertIn(" 400w", rendered)
+
 
 class SrcsetImageTagTestCase(ImagesTestCase):
     def test_srcset_image(self):
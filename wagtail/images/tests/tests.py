@@ -1,6 +1,7 @@
 import os
 import unittest
 from io import BytesIO
+from unittest import mock
 
 import willow
 from django import forms, template
@@ -10,6 +11,7 @@ from django.core.files.uploadedfile import InMemoryUploadedFile, TemporaryUpload
 from django.test import TestCase, override_settings
 from django.test.signals import setting_changed
 from django.urls import reverse
+from django.utils.http import http_date
 from taggit.forms import TagField, TagWidget
 from willow.image import (
     AvifImageFile,
@@ -407,6 +409,85 @@ class TestFrontendServeView(TestCase):
         image = willow.Image.open(b"".join(response.streaming_content))
         self.assertIsInstance(image, AvifImageFile)
 
+    def test_get_sets_metadata_headers_without_reading_file(self):
+        rendition = self.image.get_rendition("fill-800x600")
+        self.assertEqual(rendition.file_format, "png")
+        self.assertEqual(rendition.mime_type, "image/png")
+        self.assertEqual(rendition.file_size, rendition.file.size)
+        self.assertIsNotNone(rendition.created_at)
+
+        signature = generate_signature(self.image.id, "fill-800x600")
+        url = reverse(
+            "wagtailimages_serve", args=(signature, self.image.id, "fill-800x600")
+        )
+
+        with mock.patch(
+            "wagtail.images.models.AbstractRendition.get_willow_image"
+        ) as get_willow_image:
+            response = self.client.get(url)
+        get_willow_image.assert_not_called()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "image/png")
+        self.assertEqual(response["Content-Length"], str(rendition.file_size))
+        self.assertEqual(
+            response["Last-Modified"],
+            http_date(int(rendition.created_at.timestamp())),
+        )
+        self.assertEqual(len(b"".join(response.streaming_content)), rendition.file_size)
+
+        # The same rendition always has the same ETag
+        self.assertEqual(self.client.get(url)["ETag"], response["ETag"])
+
+    def test_get_not_modified(self):
+        signature = generate_signature(self.image.id, "fill-800x600")
+        url = reverse(
+            "wagtailimages_serve", args=(signature, self.image.id, "fill-800x600")
+        )
+        response = self.client.get(url)
+        etag = response["ETag"]
+        last_modified = response["Last-Modified"]
+
+        # Conditional requests are answered without opening the file
+        with mock.patch("django.db.models.fields.files.FieldFile.open") as open:
+            response = self.client.get(url, headers={"if-none-match": etag})
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response["ETag"], etag)
+
+            response = self.client.get(
+                url, headers={"if-modified-since": last_modified}
+            )
+            self.assertEqual(response.status_code, 304)
+        open.assert_not_called()
+
+        response = self.client.get(url, headers={"if-none-match": '"other"'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_get_rendition_without_metadata(self):
+        # Renditions created before the file metadata was recorded fall back
+        # on reading the file
+        rendition = self.image.get_rendition("fill-800x600")
+        Rendition = self.image.get_rendition_model()
+        Rendition.objects.filter(pk=rendition.pk).update(
+            file_format="", file_size=None, created_at=None
+        )
+        Rendition.cache_backend.clear()
+
+        signature = generate_signature(self.image.id, "fill-800x600")
+        response = self.client.get(
+            reverse(
+                "wagtailimages_serve", args=(signature, self.image.id, "fill-800x600")
+            ),
+            headers={"if-none-match": "*"},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "image/png")
+        self.assertNotIn("ETag", response)
+        self.assertNotIn("Last-Modified", response)
+        image = willow.Image.open(b"".join(response.streaming_content))
+        self.assertIsInstance(image, PNGImageFile)
+
     def test_get_with_extra_component(self):
         """
         Test that a filename can be optionally added to the end of the URL.
@@ -1,8 +1,12 @@
+import hashlib
+
 from django.core.exceptions import ImproperlyConfigured, PermissionDenied
 from django.http import FileResponse, HttpResponse
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse
+from django.utils.cache import get_conditional_response
 from django.utils.decorators import classonlymethod, method_decorator
+from django.utils.http import http_date, quote_etag
 from django.views.decorators.cache import cache_control
 from django.views.generic import View
 
@@ -60,14 +64,52 @@ class ServeView(View):
 
         return getattr(self, self.action)(rendition)
 
+    def get_etag(self, rendition):
+        # Rendition files are never modified once created, so the file name
+        # and size identify the content
+        return quote_etag(
+            hashlib.sha1(
+                f"{rendition.file.name}:{rendition.file_size}".encode()
+            ).hexdigest()
+        )
+
+    def get_last_modified(self, rendition):
+        if rendition.created_at:
+            return int(rendition.created_at.timestamp())
+
+    def set_validator_headers(self, response, etag, last_modified):
+        if etag:
+            response["ETag"] = etag
+        if last_modified:
+            response["Last-Modified"] = http_date(last_modified)
+
     def serve(self, rendition):
-        with rendition.get_willow_image() as willow_image:
-            mime_type = willow_image.mime_type
+        if rendition.mime_type and rendition.file_size is not None:
+            # The file's metadata was recorded when the rendition was created,
+            # so conditional requests can be answered without opening the file
+            mime_type = rendition.mime_type
+            etag = self.get_etag(rendition)
+            last_modified = self.get_last_modified(rendition)
+
+            response = get_conditional_response(
+                self.request, etag=etag, last_modified=last_modified
+            )
+            if response is not None:
+                self.set_validator_headers(response, etag, last_modified)
+                return response
+        else:
+            with rendition.get_willow_image() as willow_image:
+                mime_type = willow_image.mime_type
+            etag = last_modified = None
 
         # Serve the file
         rendition.file.open("rb")
         response = FileResponse(rendition.file, content_type=mime_type)
 
+        if etag:
+            response["Content-Length"] = rendition.file_size
+        self.set_validator_headers(response, etag, last_modified)
+
         # Add a CSP header to prevent inline execution
         response["Content-Security-Policy"] = "default-src 'none'"
 
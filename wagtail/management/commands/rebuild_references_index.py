@@ -1,8 +1,12 @@
+from contextlib import nullcontext
+
 from django.apps import apps
-from django.core.management.base import BaseCommand
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 
 from wagtail.models import ReferenceIndex
+from wagtail.models.reference_index import clear_reference_index_digests
 from wagtail.signal_handlers import disable_reference_index_auto_update
 
 DEFAULT_CHUNK_SIZE = 1000
@@ -27,41 +31,132 @@ class Command(BaseCommand):
             type=int,
             help="Set number of records to be fetched at once for inserting into the index",
         )
+        parser.add_argument(
+            "--model",
+            action="append",
+            dest="models",
+            metavar="APP_LABEL.MODEL_NAME",
+            help=(
+                "Only rebuild the references of the given model. "
+                "Can be passed more than once"
+            ),
+        )
+        parser.add_argument(
+            "--start-pk",
+            action="store",
+            dest="start_pk",
+            help="Only rebuild the references of objects with a primary key from this value",
+        )
+        parser.add_argument(
+            "--end-pk",
+            action="store",
+            dest="end_pk",
+            help="Only rebuild the references of objects with a primary key up to (and including) this value",
+        )
+        parser.add_argument(
+            "--commit-per-chunk",
+            action="store_true",
+            dest="commit_per_chunk",
+            help=(
+                "Commit after each chunk of objects, rather than rebuilding the "
+                "whole index in a single transaction"
+            ),
+        )
+
+    def get_models(self, labels):
+        if not labels:
+            return [
+                model for model in apps.get_models() if ReferenceIndex.is_indexed(model)
+            ]
+
+        models = []
+        for label in labels:
+            try:
+                model = apps.get_model(label)
+            except (LookupError, ValueError) as e:
+                raise CommandError(str(e)) from e
+            if not ReferenceIndex.is_indexed(model):
+                raise CommandError(f"{label} is not indexed in the reference index")
+            models.append(model)
+        return models
 
     def handle(self, **options):
         self.verbosity = options["verbosity"]
 
         chunk_size = options.get("chunk_size")
+        models = self.get_models(options.get("models"))
+        start_pk = options.get("start_pk")
+        end_pk = options.get("end_pk")
+        commit_per_chunk = options.get("commit_per_chunk")
+
+        # When only part of the index is rebuilt, the existing references of
+        # each chunk are deleted before it is indexed. Otherwise, the whole
+        # table is emptied first
+        partial = (
+            bool(options.get("models")) or start_pk is not None or end_pk is not None
+        )
+
         object_count = 0
 
         self.write("Rebuilding reference index")
 
-        with transaction.atomic():
-            with disable_reference_index_auto_update():
-                # Use `_raw_delete` to avoid loading instances into memory
-                all_references = ReferenceIndex.objects.all()
-                all_references._raw_delete(using=all_references.db)
-
-            for model in apps.get_models():
-                if not ReferenceIndex.is_indexed(model):
-                    continue
-
+        if commit_per_chunk:
+            # Commit the deletion and each chunk separately, so that the table
+            # isn't locked for the whole run
+            outer_transaction = nullcontext()
+            chunk_transaction = transaction.atomic
+        else:
+            outer_transaction = transaction.atomic()
+            chunk_transaction = nullcontext
+
+        with outer_transaction:
+            if not partial:
+                with transaction.atomic(), disable_reference_index_auto_update():
+                    # Use `_raw_delete` to avoid loading instances into memory
+                    all_references = ReferenceIndex.objects.all()
+                    all_references._raw_delete(using=all_references.db)
+
+            for model in models:
                 self.write(str(model))
 
-                # Add items (chunk_size at a time)
+                queryset = model.objects.all()
+                if start_pk is not None:
+                    queryset = queryset.filter(pk__gte=start_pk)
+                if end_pk is not None:
+                    queryset = queryset.filter(pk__lte=end_pk)
+
                 for chunk in self.print_iter_progress(
-                    self.queryset_chunks(model.objects.all().order_by("pk"), chunk_size)
+                    self.queryset_chunks(queryset, chunk_size)
                 ):
-                    for instance in chunk:
-                        ReferenceIndex.create_or_update_for_object(instance)
+                    with chunk_transaction():
+                        if partial:
+                            self.delete_references(model, chunk)
+                        ReferenceIndex.create_for_objects(chunk)
 
                     object_count += len(chunk)
 
                 self.print_newline()
 
+        # The references recorded for each object have changed without going
+        # through `ReferenceIndex.create_or_update_for_object`
+        clear_reference_index_digests()
+
         self.write("Indexed %d objects" % object_count)
         self.print_newline()
 
+    def delete_references(self, model, objects):
+        """
+        Delete the references recorded for the given objects of ``model``. References
+        recorded against a more specific model are left to be rebuilt with that model.
+        """
+        ReferenceIndex.objects.filter(
+            content_type=ContentType.objects.get_for_model(
+                model, for_concrete_model=False
+            ),
+            base_content_type=ReferenceIndex._get_base_content_type(model),
+            object_id__in=[str(obj.pk) for obj in objects],
+        ).delete()
+
     def print_newline(self):
         self.write("")
 
@@ -88,19 +183,18 @@ class Command(BaseCommand):
 
             self.stdout.flush()
 
-    # Atomic so the count of models doesn't change as it is iterated
-    @transaction.atomic
     def queryset_chunks(self, qs, chunk_size=DEFAULT_CHUNK_SIZE):
         """
         Yield a queryset in chunks of at most ``chunk_size``. The chunk yielded
-        will be a list, not a queryset. Iterating over the chunks is done in a
-        transaction so that the order and count of items in the queryset
-        remains stable.
+        will be a list, not a queryset. Chunks are fetched in primary key order,
+        filtering on the last primary key seen rather than using an offset, so
+        that each query is equally fast and objects are not skipped or repeated
+        if the queryset changes while it is iterated.
         """
-        i = 0
-        while True:
-            items = list(qs[i * chunk_size :][:chunk_size])
-            if not items:
-                break
+        qs = qs.order_by("pk")
+        items = list(qs[:chunk_size])
+        while items:
             yield items
-            i += 1
+            if len(items) < chunk_size:
+                break
+            items = list(qs.filter(pk__gt=items[-1].pk)[:chunk_size])
@@ -130,6 +130,21 @@ class Collection(MP_Node):
         # Output unicode plain-text version
         return "{}↳ {}".format(" " * 4 * display_depth, self.name)
 
+    def move(self, target, pos=None):
+        super().move(target, pos)
+
+        if getattr(settings, "WAGTAIL_PERMISSION_CACHE", False):
+            from wagtail.permission_policies.base import clear_tree_permissions_cache
+
+            # The paths of the moved collections change, as may those of their
+            # new siblings, so permissions cached against the old paths are stale
+            new_path = Collection.objects.values_list("path", flat=True).get(pk=self.pk)
+            clear_tree_permissions_cache(
+                GroupCollectionPermission,
+                new_path[: -self.steplen],
+                "collection",
+            )
+
     def natural_key(self):
         """Return the hierarchical path as the natural key"""
         return tuple(
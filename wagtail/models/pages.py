@@ -70,7 +70,7 @@ from .locking import LockableMixin
 from .panels import CommentPanelPlaceholder, PanelPlaceholder
 from .preview import PreviewableMixin
 from .revisions import Revision, RevisionMixin
-from .sites import Site
+from .sites import Site, get_site_root_path_matcher
 from .specific import SpecificMixin
 from .view_restrictions import BaseViewRestriction
 from .workflows import WorkflowMixin
@@ -503,11 +503,19 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
                     path_components = [
                         component for component in path.split("/") if component
                     ]
-                    request._wagtail_route_for_request = (
-                        site.root_page.localized.specific.route(
+                    root_page = site.root_page.localized.specific
+                    if getattr(settings, "WAGTAIL_PREFETCH_ROUTE_PAGES", True):
+                        # Fetch every page along the requested path up-front, so
+                        # that Page.route() doesn't need a query for each level
+                        request._wagtail_route_candidates = (
+                            root_page.get_route_candidates(path_components)
+                        )
+                    try:
+                        request._wagtail_route_for_request = root_page.route(
                             request, path_components
                         )
-                    )
+                    finally:
+                        request.__dict__.pop("_wagtail_route_candidates", None)
                 else:
                     request._wagtail_route_for_request = None
             except Http404:
@@ -901,21 +909,48 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
         else:
             return self.specific_class.get_verbose_name()
 
+    def get_route_candidates(self, path_components):
+        """
+        Return a dict mapping ``url_path`` to specific page instance for every
+        descendant of this page that lies along ``path_components``, fetched
+        with a single query (plus one per distinct page type).
+
+        Used by ``route_for_request`` so that ``route()`` can resolve each
+        level of the URL without querying the database again. Pages that
+        override ``route()`` are still called in the usual way.
+        """
+        url_paths = []
+        url_path = self.url_path
+        for component in path_components:
+            url_path += component + "/"
+            url_paths.append(url_path)
+
+        if not url_paths:
+            return {}
+
+        pages = (
+            Page.objects.descendant_of(self).filter(url_path__in=url_paths).specific()
+        )
+        return {page.url_path: page for page in pages}
+
     def route(self, request, path_components):
         if path_components:
             # request is for a child of this page
             child_slug = path_components[0]
             remaining_components = path_components[1:]
 
-            try:
-                subpage = self.get_children().get(slug=child_slug)
-                # Cache the parent page on the subpage to avoid another db query
-                # Treebeard's get_parent will use the `_cached_parent_obj` attribute if it exists
-                # And update = False
-                subpage._cached_parent_obj = self
+            candidates = getattr(request, "_wagtail_route_candidates", None) or {}
+            subpage = candidates.get(self.url_path + child_slug + "/")
+            if subpage is None or not subpage.is_child_of(self):
+                try:
+                    subpage = self.get_children().get(slug=child_slug)
+                except Page.DoesNotExist as e:
+                    raise Http404 from e
 
-            except Page.DoesNotExist as e:
-                raise Http404 from e
+            # Cache the parent page on the subpage to avoid another db query
+            # Treebeard's get_parent will use the `_cached_parent_obj` attribute if it exists
+            # And update = False
+            subpage._cached_parent_obj = self
 
             return subpage.specific.route(request, remaining_components)
 
@@ -1286,15 +1321,36 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
             cache_object._wagtail_cached_site_root_paths = Site.get_site_root_paths()
             return cache_object._wagtail_cached_site_root_paths
 
+    def _get_site_root_path_matcher(self, request=None):
+        """
+        Return a ``SiteRootPathMatcher`` for ``Site.get_site_root_paths()``,
+        using the cached copy on the request object if available.
+        """
+        site_root_paths = self._get_site_root_paths(request)
+
+        # if we have a request, use that to cache the matcher; otherwise, use self
+        cache_object = request if request else self
+        try:
+            cached_site_root_paths, matcher = (
+                cache_object._wagtail_cached_site_root_path_matcher
+            )
+            if cached_site_root_paths is site_root_paths:
+                return matcher
+        except AttributeError:
+            pass
+
+        matcher = get_site_root_path_matcher(site_root_paths)
+        cache_object._wagtail_cached_site_root_path_matcher = (
+            site_root_paths,
+            matcher,
+        )
+        return matcher
+
     def _get_relevant_site_root_paths(self, cache_object=None):
         """
         Returns a tuple of root paths for all sites this page belongs to.
         """
-        return tuple(
-            srp
-            for srp in self._get_site_root_paths(cache_object)
-            if self.url_path.startswith(srp.root_path)
-        )
+        return self._get_site_root_path_matcher(cache_object).match(self.url_path)
 
     def get_url_parts(self, request=None):
         """
@@ -1422,9 +1478,7 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
 
         # Get number of unique sites in root paths
         # Note: there may be more root paths to sites if there are multiple languages
-        num_sites = len(
-            {root_path[0] for root_path in self._get_site_root_paths(request)}
-        )
+        num_sites = self._get_site_root_path_matcher(request).num_sites
 
         if (current_site is not None and site_id == current_site.id) or num_sites == 1:
             # the site matches OR we're only running a single site, so a local URL is sufficient
@@ -1434,6 +1488,57 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
 
     url = property(get_url)
 
+    @classmethod
+    def get_urls_for_pages(cls, pages, request=None):
+        """
+        Return the URLs of many pages at once, as a dict mapping each page's ID
+        to a tuple of ``(url, full_url)``, where ``url`` is the value that
+        ``get_url`` would return and ``full_url`` is the value that
+        ``get_full_url`` would return. Both are ``None`` for pages that are
+        not routable.
+
+        The current site and the root paths of all sites are found once, rather
+        than for every page. Pages with custom URL routing are handled by their
+        own ``get_url_parts`` methods.
+        """
+        current_site = Site.find_for_request(request) if request is not None else None
+        site_root_paths = None
+        matcher = None
+
+        urls = {}
+        for page in pages:
+            if request is None:
+                # Without a request to cache them on, share the site root paths
+                # between the pages
+                if site_root_paths is None:
+                    site_root_paths = page._get_site_root_paths()
+                    matcher = page._get_site_root_path_matcher()
+                page._wagtail_cached_site_root_paths = site_root_paths
+                page._wagtail_cached_site_root_path_matcher = (
+                    site_root_paths,
+                    matcher,
+                )
+
+            url_parts = page.get_url_parts(request=request)
+
+            if url_parts is None or url_parts[1] is None and url_parts[2] is None:
+                # page is not routable
+                urls[page.pk] = (None, None)
+                continue
+
+            site_id, root_url, page_path = url_parts
+            num_sites = page._get_site_root_path_matcher(request).num_sites
+
+            if (
+                current_site is not None and site_id == current_site.id
+            ) or num_sites == 1:
+                url = page_path
+            else:
+                url = root_url + page_path
+            urls[page.pk] = (url, root_url + page_path)
+
+        return urls
+
     def relative_url(self, current_site, request=None):
         """
         Return the 'most appropriate' URL for this page taking into account the site we're currently on;
@@ -2135,9 +2240,10 @@ class PagePermissionTester:
             self.permissions = {
                 # Get the 'action' part of the permission codename, e.g.
                 # 'add' instead of 'add_page'
-                perm.permission.codename.rsplit("_", maxsplit=1)[0]
-                for perm in self.permission_policy.get_cached_permissions_for_user(user)
-                if self.page.path.startswith(perm.page.path)
+                codename.rsplit("_", maxsplit=1)[0]
+                for codename in self.permission_policy.get_permission_index_for_user(
+                    user
+                ).get_codenames_for_path(self.page.path)
             }
 
     def user_has_lock(self):
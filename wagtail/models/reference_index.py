@@ -1,10 +1,13 @@
+import hashlib
 import uuid
 from itertools import groupby
 
+from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey, GenericRel
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
 from django.core.exceptions import FieldDoesNotExist
-from django.db import connection, models
+from django.db import connection, models, transaction
 from django.db.models import CharField, Count, OuterRef, Subquery
 from django.db.models.functions import Cast, Coalesce
 from django.utils.functional import cached_property
@@ -17,6 +20,35 @@ from taggit.models import ItemBase
 from wagtail.blocks import StreamBlock
 from wagtail.fields import StreamField
 
+REFERENCE_INDEX_DIGEST_VERSION_CACHE_KEY = "wagtail_reference_index_digest_version"
+
+
+def get_reference_index_digest_version():
+    version = cache.get(REFERENCE_INDEX_DIGEST_VERSION_CACHE_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(REFERENCE_INDEX_DIGEST_VERSION_CACHE_KEY, version, None):
+            # another process set the version first
+            version = cache.get(REFERENCE_INDEX_DIGEST_VERSION_CACHE_KEY, version)
+    return version
+
+
+def clear_reference_index_digests():
+    """
+    Discard the digests of the references recorded for each object, so that
+    the next update of every object writes its references to the index. Use
+    this after changing ReferenceIndex records other than through
+    ``ReferenceIndex.create_or_update_for_object`` and
+    ``ReferenceIndex.remove_for_object``.
+    """
+    cache.delete(REFERENCE_INDEX_DIGEST_VERSION_CACHE_KEY)
+
+    # Digests may be recorded by other processes until the change is visible
+    # to them, so start a new version again once it is
+    transaction.on_commit(
+        lambda: cache.delete(REFERENCE_INDEX_DIGEST_VERSION_CACHE_KEY)
+    )
+
 
 class ReferenceGroups:
     """
@@ -195,6 +227,9 @@ class ReferenceIndex(models.Model):
     # by ParentalKey (object references on those are recorded under the parent).
     indexed_models = set()
 
+    # A cache of the results of `get_reference_field_names`, keyed by model
+    _reference_field_names = {}
+
     class Meta:
         unique_together = [
             (
@@ -324,6 +359,47 @@ class ReferenceIndex(models.Model):
     def is_indexed(cls, model):
         return model in cls.indexed_models
 
+    @classmethod
+    def get_reference_field_names(cls, model):
+        """
+        Returns the names (and attribute names) of the fields of the given model
+        that references may be extracted from, or that link it to a parent object.
+        Saving an object with ``update_fields`` that don't include any of these
+        can't change its references.
+        """
+        try:
+            return cls._reference_field_names[model]
+        except KeyError:
+            pass
+
+        field_names = set()
+        for field in model._meta.get_fields():
+            # Skip the same relations as `_extract_references_from_object`, so
+            # that saving ignored fields (such as a page's latest revision or
+            # lock owner) doesn't update the index
+            if field.is_relation and field.many_to_one:
+                if getattr(field, "wagtail_reference_index_ignore", False):
+                    continue
+
+                if getattr(
+                    field.related_model, "wagtail_reference_index_ignore", False
+                ):
+                    continue
+
+            if isinstance(field, GenericForeignKey):
+                for name in (field.ct_field, field.fk_field):
+                    field_names.add(name)
+                    field_names.add(model._meta.get_field(name).attname)
+            elif field.is_relation and field.many_to_one and field.concrete:
+                field_names.add(field.name)
+                field_names.add(field.attname)
+
+            if hasattr(field, "extract_references"):
+                field_names.add(field.name)
+
+        cls._reference_field_names[model] = field_names = frozenset(field_names)
+        return field_names
+
     @classmethod
     def _extract_references_from_object(cls, object):
         """
@@ -449,6 +525,20 @@ class ReferenceIndex(models.Model):
             uuid.UUID("bdc70d8b-e7a2-4c2a-bf43-2a3e3fcbbe86"), content_path
         )
 
+    @classmethod
+    def _get_digest_cache_key(cls, base_content_type, object_id):
+        object_key = hashlib.sha1(f"{base_content_type.id}:{object_id}".encode())
+        return "wagtail_reference_index_digest:%s:%s" % (
+            get_reference_index_digest_version(),
+            object_key.hexdigest(),
+        )
+
+    @classmethod
+    def _get_references_digest(cls, content_type, references):
+        return hashlib.sha1(
+            repr((content_type.id, sorted(references))).encode()
+        ).hexdigest()
+
     @classmethod
     def create_or_update_for_object(cls, object):
         """
@@ -479,6 +569,17 @@ class ReferenceIndex(models.Model):
         base_content_type = content_types[-1]
         known_content_type_ids = [ct.id for ct in content_types]
 
+        # If the digest of the references last recorded for this object is
+        # kept in the cache, there is nothing to do unless they have changed
+        digest_timeout = getattr(
+            settings, "WAGTAIL_REFERENCE_INDEX_DIGEST_CACHE_TIMEOUT", None
+        )
+        if digest_timeout:
+            digest_cache_key = cls._get_digest_cache_key(base_content_type, object.pk)
+            digest = cls._get_references_digest(content_type, references)
+            if cache.get(digest_cache_key) == digest:
+                return
+
         # Find existing references in the database so we know what to add/delete.
         # Construct a dict mapping reference records to the (content_type_id, id) pair that the
         # existing database entry is found under
@@ -549,6 +650,63 @@ class ReferenceIndex(models.Model):
         # Perform the deletion
         cls.objects.filter(id__in=deleted_reference_ids).delete()
 
+        if digest_timeout:
+            # Only record the digest once the references are visible to others
+            transaction.on_commit(
+                lambda: cache.set(digest_cache_key, digest, digest_timeout)
+            )
+
+    @classmethod
+    def create_for_objects(cls, objects, batch_size=None):
+        """
+        Creates ReferenceIndex records for the given objects, using multi-row inserts.
+
+        Unlike `create_or_update_for_object`, this does not look for existing records
+        to update or delete, so it should only be used for objects whose records
+        have been removed beforehand, such as when rebuilding the index. Records
+        that already exist are left in place.
+
+        Note: This method must be called within a `django.db.transaction.atomic()` block.
+
+        Args:
+            objects (iterable): The model instances to create ReferenceIndex records for
+            batch_size (int): The maximum number of records to insert per query
+
+        Returns:
+            The number of reference records extracted from the objects
+        """
+        if not connection.features.supports_ignore_conflicts:
+            # References found on a parent model may already have been recorded,
+            # so fall back to comparing against the existing records
+            for object in objects:
+                cls.create_or_update_for_object(object)
+            return None
+
+        records = []
+        for object in objects:
+            content_type = ContentType.objects.get_for_model(
+                object, for_concrete_model=False
+            )
+            base_content_type = cls._get_base_content_type(object)
+            records.extend(
+                cls(
+                    content_type=content_type,
+                    base_content_type=base_content_type,
+                    object_id=object.pk,
+                    to_content_type_id=to_content_type_id,
+                    to_object_id=to_object_id,
+                    model_path=model_path,
+                    content_path=content_path,
+                    content_path_hash=cls._get_content_path_hash(content_path),
+                )
+                for to_content_type_id, to_object_id, model_path, content_path in set(
+                    cls._extract_references_from_object(object)
+                )
+            )
+
+        cls.objects.bulk_create(records, batch_size=batch_size, ignore_conflicts=True)
+        return len(records)
+
     @classmethod
     def remove_for_object(cls, object):
         """
@@ -564,6 +722,9 @@ class ReferenceIndex(models.Model):
             base_content_type=base_content_type, object_id=object.pk
         ).delete()
 
+        if getattr(settings, "WAGTAIL_REFERENCE_INDEX_DIGEST_CACHE_TIMEOUT", None):
+            cache.delete(cls._get_digest_cache_key(base_content_type, object.pk))
+
     @classmethod
     def get_references_for_object(cls, object):
         """
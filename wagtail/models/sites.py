@@ -1,3 +1,6 @@
+import copy
+import threading
+import uuid
 from collections import namedtuple
 
 from django.apps import apps
@@ -5,22 +8,150 @@ from django.conf import settings
 from django.contrib.auth.models import Group, Permission
 from django.core.cache import cache
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
 from django.db.models import Case, IntegerField, Q, When
 from django.db.models.functions import Lower
 from django.http.request import split_domain_port
 from django.utils.translation import gettext_lazy as _
 
+from wagtail.utils.transactions import (
+    has_uncommitted_changes,
+    mark_uncommitted_changes,
+)
+
 MATCH_HOSTNAME_PORT = 0
 MATCH_HOSTNAME_DEFAULT = 1
 MATCH_DEFAULT = 2
 MATCH_HOSTNAME = 3
 
 
+SITE_MATCHING_TABLE_VERSION_CACHE_KEY = "wagtail_site_matching_table_version"
+
+
+class SiteMatchingTable:
+    """
+    An in-memory lookup table of all Site records, used to match a hostname
+    and port to a site without a database query. Applies the same precedence
+    rules as the query in ``get_site_for_hostname``.
+    """
+
+    def __init__(self, sites, version=None):
+        self.version = version
+        self.sites_by_hostname_port = {}
+        self.sites_by_hostname = {}
+        self.default_site = None
+        self.root_page_ids = set()
+
+        for site in sites:
+            self.sites_by_hostname_port[(site.hostname, site.port)] = site
+            self.sites_by_hostname.setdefault(site.hostname, []).append(site)
+            self.root_page_ids.add(site.root_page_id)
+            if site.is_default_site:
+                self.default_site = site
+
+    def match(self, hostname, port):
+        """
+        Return the Site for the given hostname and port, or None if there is
+        no suitable site.
+        """
+        try:
+            port = int(port)
+        except (TypeError, ValueError):
+            port = None
+
+        if site := self.sites_by_hostname_port.get((hostname, port)):
+            return site
+
+        hostname_sites = self.sites_by_hostname.get(hostname, [])
+        default_site = self.default_site
+
+        if default_site is not None and default_site.hostname == hostname:
+            return default_site
+
+        # If there is a single site for this hostname (on a different port),
+        # prefer it over the default site
+        if len(hostname_sites) == 1:
+            return hostname_sites[0]
+
+        return default_site
+
+
+_site_matching_table = None
+_site_matching_table_lock = threading.Lock()
+
+
+def get_site_matching_table():
+    """
+    Return the process-wide SiteMatchingTable, rebuilding it if the version
+    key in the shared cache shows that Site records have changed since it was
+    built.
+    """
+    global _site_matching_table
+
+    if has_uncommitted_changes(SITE_MATCHING_TABLE_VERSION_CACHE_KEY):
+        # Sites have changed within the current transaction, which may yet be
+        # rolled back, so build a table just for this lookup
+        Site = apps.get_model("wagtailcore.Site")
+        return SiteMatchingTable(Site.objects.select_related("root_page"))
+
+    version = cache.get(SITE_MATCHING_TABLE_VERSION_CACHE_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(SITE_MATCHING_TABLE_VERSION_CACHE_KEY, version, None):
+            # another process set the version first
+            version = cache.get(SITE_MATCHING_TABLE_VERSION_CACHE_KEY, version)
+
+    table = _site_matching_table
+    if table is None or table.version != version:
+        with _site_matching_table_lock:
+            table = _site_matching_table
+            if table is None or table.version != version:
+                Site = apps.get_model("wagtailcore.Site")
+                table = SiteMatchingTable(
+                    Site.objects.select_related("root_page"), version=version
+                )
+                _site_matching_table = table
+
+    return table
+
+
+def clear_site_matching_table():
+    """
+    Discard the process-wide SiteMatchingTable, and bump the shared version key
+    so that all other processes rebuild theirs on their next lookup.
+    """
+
+    global _site_matching_table
+
+    # Discard this process's table straight away, and don't keep another one
+    # until the current transaction is over, so that lookups reflect changes
+    # made within it but a table built from them can't outlive a rollback
+    _site_matching_table = None
+    mark_uncommitted_changes(SITE_MATCHING_TABLE_VERSION_CACHE_KEY)
+
+    def clear():
+        global _site_matching_table
+
+        # Other processes must wait until the change is visible to them, so
+        # that they can't rebuild their table from the old data
+        _site_matching_table = None
+        cache.delete(SITE_MATCHING_TABLE_VERSION_CACHE_KEY)
+
+    transaction.on_commit(clear)
+
+
 def get_site_for_hostname(hostname, port):
     """Return the wagtailcore.Site object for the given hostname and port."""
     Site = apps.get_model("wagtailcore.Site")
 
+    if getattr(settings, "WAGTAIL_SITE_MATCHING_CACHE", False):
+        site = get_site_matching_table().match(hostname, port)
+        if site is None:
+            raise Site.DoesNotExist()
+        # The table is shared between requests, so hand out a copy that can be
+        # modified freely
+        return copy.deepcopy(site)
+
     sites = list(
         Site.objects.annotate(
             match=Case(
@@ -77,6 +208,73 @@ SITE_ROOT_PATHS_CACHE_KEY = "wagtail_site_root_paths"
 SITE_ROOT_PATHS_CACHE_VERSION = 2
 
 
+class SiteRootPathMatcher:
+    """
+    An index of ``SiteRootPath`` records by root path, used to find the sites
+    that a page belongs to by looking up the prefixes of its url_path, rather
+    than by testing every root path in turn.
+    """
+
+    def __init__(self, site_root_paths):
+        self.site_root_paths = tuple(site_root_paths)
+        self.num_sites = len({srp.site_id for srp in self.site_root_paths})
+        self.by_root_path = {}
+
+        for index, srp in enumerate(self.site_root_paths):
+            self.by_root_path.setdefault(srp.root_path, []).append((index, srp))
+
+        # Root paths end with a slash, as url_paths do, so only the prefixes
+        # of a url_path that end at a slash need to be looked up. Any other
+        # root paths are looked up by their length instead
+        self.other_root_path_lengths = sorted(
+            {
+                len(root_path)
+                for root_path in self.by_root_path
+                if not root_path.endswith("/")
+            }
+        )
+
+    def match(self, url_path):
+        """
+        Return a tuple of the root paths that the given url_path is within,
+        in the same order as ``Site.get_site_root_paths()``.
+        """
+        matches = []
+        end = url_path.find("/")
+        while end != -1:
+            matches.extend(self.by_root_path.get(url_path[: end + 1], ()))
+            end = url_path.find("/", end + 1)
+
+        for length in self.other_root_path_lengths:
+            if length > len(url_path):
+                break
+            matches.extend(self.by_root_path.get(url_path[:length], ()))
+
+        if len(matches) > 1:
+            matches.sort(key=lambda match: match[0])
+        return tuple(srp for index, srp in matches)
+
+
+_site_root_path_matcher = None
+
+
+def get_site_root_path_matcher(site_root_paths):
+    """
+    Return a SiteRootPathMatcher for the given list of root paths, as returned
+    by ``Site.get_site_root_paths()``. The most recently built matcher is kept
+    for the whole process, and reused for as long as the root paths in the
+    cache are unchanged.
+    """
+    global _site_root_path_matcher
+
+    matcher = _site_root_path_matcher
+    if matcher is None or matcher.site_root_paths != tuple(site_root_paths):
+        matcher = SiteRootPathMatcher(site_root_paths)
+        _site_root_path_matcher = matcher
+
+    return matcher
+
+
 class Site(models.Model):
     hostname = models.CharField(
         verbose_name=_("hostname"), max_length=255, db_index=True
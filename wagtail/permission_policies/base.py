@@ -1,12 +1,92 @@
+import uuid
+
+from django.conf import settings
 from django.contrib.auth import get_permission_codename, get_user_model
 from django.contrib.auth.models import Permission
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
 from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db import transaction
 from django.db.models import Q
 from django.utils.functional import cached_property
 
 from wagtail.coreutils import resolve_model_string
 
+PERMISSIONS_CACHE_KEY_PREFIX = "wagtail_permissions"
+
+
+def get_group_permissions_version_key(group_id):
+    return f"{PERMISSIONS_CACHE_KEY_PREFIX}_group_version:{group_id}"
+
+
+def get_user_groups_version_key(user_id):
+    return f"{PERMISSIONS_CACHE_KEY_PREFIX}_user_version:{user_id}"
+
+
+def get_permissions_versions(keys):
+    """
+    Return a dict of the current values of the given version keys in the
+    shared cache, setting a new version for any that are missing.
+    """
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            version = uuid.uuid4().hex
+            if not cache.add(key, version, None):
+                # another process set the version first
+                version = cache.get(key, version)
+            versions[key] = version
+    return versions
+
+
+def _clear_permissions_versions(keys):
+    if not keys:
+        return
+
+    # Bump the versions straight away, so that permissions cached from within
+    # the current transaction are discarded once it commits, and again on
+    # commit so that other processes can't cache the old permissions under
+    # the new versions
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def clear_group_permissions_cache(group_ids):
+    """
+    Invalidate the permissions cached in the shared cache for all members of
+    the given groups, after the groups' permissions have changed.
+    """
+    _clear_permissions_versions(
+        [get_group_permissions_version_key(group_id) for group_id in group_ids]
+    )
+
+
+def clear_tree_permissions_cache(permission_model, path, node_field_name):
+    """
+    Invalidate the permissions cached in the shared cache for all members of
+    groups with permissions (as ``permission_model`` instances) on the nodes at
+    or below ``path``, after the paths of those nodes may have changed - for
+    example, when a node has been moved or inserted among them.
+    """
+    group_ids = (
+        permission_model.objects.filter(
+            **{f"{node_field_name}__path__startswith": path}
+        )
+        .values_list("group_id", flat=True)
+        .distinct()
+    )
+    clear_group_permissions_cache(list(group_ids))
+
+
+def clear_user_permissions_cache(user_ids):
+    """
+    Invalidate the permissions cached in the shared cache for the given users,
+    after their group memberships have changed.
+    """
+    _clear_permissions_versions(
+        [get_user_groups_version_key(user_id) for user_id in user_ids]
+    )
+
 
 class BasePermissionPolicy:
     """
@@ -64,11 +144,52 @@ class BasePermissionPolicy:
         if hasattr(user, self.permission_cache_name):
             perms = getattr(user, self.permission_cache_name)
         else:
-            perms = self.get_all_permissions_for_user(user)
+            if self._use_shared_permission_cache(user):
+                perms = self._get_shared_cached_permissions_for_user(user)
+            else:
+                perms = self.get_all_permissions_for_user(user)
             if self.permission_cache_name:
                 setattr(user, self.permission_cache_name, perms)
         return perms
 
+    def _use_shared_permission_cache(self, user):
+        # Inactive, anonymous and superusers are handled without looking up
+        # their permissions, so there is nothing worth sharing for them
+        return (
+            self.permission_cache_name
+            and getattr(settings, "WAGTAIL_PERMISSION_CACHE", False)
+            and user.is_active
+            and not user.is_anonymous
+            and not user.is_superuser
+        )
+
+    def _get_shared_cached_permissions_for_user(self, user):
+        """
+        Return a list of the user's permissions from the shared cache, where
+        they are kept along with the versions of the user's group memberships
+        and of each group's permissions, so that they are looked up again
+        once any of those change.
+        """
+        cache_key = (
+            f"{PERMISSIONS_CACHE_KEY_PREFIX}{self.permission_cache_name}:{user.pk}"
+        )
+
+        if cached := cache.get(cache_key):
+            versions, perms = cached
+            if cache.get_many(list(versions)) == versions:
+                return perms
+
+        # Find the versions before the permissions, so that a change made
+        # while the permissions are looked up leaves them out of date
+        group_ids = user.groups.values_list("pk", flat=True)
+        versions = get_permissions_versions(
+            [get_user_groups_version_key(user.pk)]
+            + [get_group_permissions_version_key(group_id) for group_id in group_ids]
+        )
+        perms = list(self.get_all_permissions_for_user(user))
+        cache.set(cache_key, (versions, perms))
+        return perms
+
     # Basic user permission tests. Most policies are expected to override these,
     # since the default implementation is to query the set of permitted users
     # (which is pretty inefficient).
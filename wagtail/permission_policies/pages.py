@@ -1,3 +1,7 @@
+from collections import defaultdict
+from functools import reduce
+from operator import or_
+
 from django.contrib.auth import get_permission_codename, get_user_model
 from django.db.models import Q
 
@@ -5,8 +9,54 @@ from wagtail.models import GroupPagePermission, Page
 from wagtail.permission_policies.base import OwnershipPermissionPolicy
 
 
+class PagePermissionIndex:
+    """
+    A user's page permissions, compiled into a mapping from the path of each
+    page that the user has permissions on to the codenames of those
+    permissions. Finding the permissions that apply to a page looks up each of
+    its ancestors' paths, rather than testing every permission in turn.
+    """
+
+    def __init__(self, permissions, steplen=Page.steplen):
+        self.steplen = steplen
+        codenames_by_path = defaultdict(set)
+        for perm in permissions:
+            codenames_by_path[perm.page.path].add(perm.permission.codename)
+        self.codenames_by_path = dict(codenames_by_path)
+
+    def get_codenames_for_path(self, path):
+        """
+        Return the set of permission codenames that apply to the page with the
+        given path, i.e. those on the page itself or any of its ancestors.
+        """
+        codenames = set()
+        for end in range(self.steplen, len(path) + 1, self.steplen):
+            if path_codenames := self.codenames_by_path.get(path[:end]):
+                codenames |= path_codenames
+        return codenames
+
+    def get_paths_for_codenames(self, codenames):
+        """
+        Return the paths of the pages with any of the given permission codenames,
+        leaving out the pages that are descendants of another, so that the
+        subtrees of the paths returned don't overlap.
+        """
+        paths = sorted(
+            path
+            for path, path_codenames in self.codenames_by_path.items()
+            if not path_codenames.isdisjoint(codenames)
+        )
+        # Descendants sort directly after their ancestors
+        result = []
+        for path in paths:
+            if not result or not path.startswith(result[-1]):
+                result.append(path)
+        return result
+
+
 class PagePermissionPolicy(OwnershipPermissionPolicy):
     permission_cache_name = "_page_permission_cache"
+    _permission_index_cache_name = "_page_permission_index_cache"
     _explorable_root_instance_cache_name = "_explorable_root_page_cache"
 
     def __init__(self, model=Page):
@@ -19,6 +69,20 @@ class PagePermissionPolicy(OwnershipPermissionPolicy):
             "page", "permission"
         )
 
+    def get_permission_index_for_user(self, user):
+        """
+        Return a PagePermissionIndex of the user's page permissions, cached on the
+        user alongside the permissions it was built from.
+        """
+        perms = self.get_cached_permissions_for_user(user)
+        cached = getattr(user, self._permission_index_cache_name, None)
+        if cached is not None and cached[0] is perms:
+            return cached[1]
+
+        index = PagePermissionIndex(perms, steplen=self.model.steplen)
+        setattr(user, self._permission_index_cache_name, (perms, index))
+        return index
+
     def _base_user_has_permission(self, user):
         if not user.is_active:
             return False
@@ -84,16 +148,14 @@ class PagePermissionPolicy(OwnershipPermissionPolicy):
         if base_permission is not None:
             return base_permission
 
-        permissions = set()
-        for perm in self.get_cached_permissions_for_user(user):
-            if instance.pk == perm.page_id or instance.is_descendant_of(perm.page):
-                permissions.add(perm.permission.codename)
-                if (
-                    perm.permission.codename
-                    == get_permission_codename("add", self.model._meta)
-                    and instance.owner_id == user.pk
-                ):
-                    permissions.add(get_permission_codename("change", self.model._meta))
+        permissions = self.get_permission_index_for_user(user).get_codenames_for_path(
+            instance.path
+        )
+        if (
+            get_permission_codename("add", self.model._meta) in permissions
+            and instance.owner_id == user.pk
+        ):
+            permissions.add(get_permission_codename("change", self.model._meta))
 
         return bool(self._get_permission_codenames(actions) & permissions)
 
@@ -102,22 +164,27 @@ class PagePermissionPolicy(OwnershipPermissionPolicy):
         if base_queryset is not None:
             return base_queryset
 
-        pages = self.model._default_manager.none()
-        for perm in self.get_cached_permissions_for_user(user):
-            if (
-                perm.permission.codename
-                == get_permission_codename("add", self.model._meta)
-                and "add" not in actions
-                and "change" in actions
-            ):
-                pages |= self.model._default_manager.descendant_of(
-                    perm.page, inclusive=True
-                ).filter(owner=user)
-            elif perm.permission.codename in self._get_permission_codenames(actions):
-                pages |= self.model._default_manager.descendant_of(
-                    perm.page, inclusive=True
-                )
-        return pages
+        index = self.get_permission_index_for_user(user)
+        paths = index.get_paths_for_codenames(self._get_permission_codenames(actions))
+        filters = [Q(path__startswith=path) for path in paths]
+
+        if "add" not in actions and "change" in actions:
+            # Users with "add" permission can edit the pages they own
+            owned_paths = index.get_paths_for_codenames(
+                {get_permission_codename("add", self.model._meta)}
+            )
+            owned_filters = [
+                Q(path__startswith=path)
+                for path in owned_paths
+                # Leave out paths already covered by the other permissions
+                if not any(path.startswith(other_path) for other_path in paths)
+            ]
+            if owned_filters:
+                filters.append(reduce(or_, owned_filters) & Q(owner=user))
+
+        if not filters:
+            return self.model._default_manager.none()
+        return self.model._default_manager.filter(reduce(or_, filters))
 
     def users_with_any_permission_for_instance(
         self, actions, instance, include_superusers=True
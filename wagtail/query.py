@@ -318,6 +318,37 @@ class SpecificQuerySetMixin:
 
 
 class PageQuerySet(SearchableQuerySetMixin, SpecificQuerySetMixin, TreeQuerySet):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # set by PageQuerySet.prefetch_stream_blocks()
+        self._prefetch_stream_block_fields = ()
+        self._stream_blocks_prefetch_done = False
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._prefetch_stream_block_fields = self._prefetch_stream_block_fields
+        return clone
+
+    def _fetch_all(self):
+        super()._fetch_all()
+        if self._prefetch_stream_block_fields and not self._stream_blocks_prefetch_done:
+            self._prefetch_stream_blocks()
+            self._stream_blocks_prefetch_done = True
+
+    def _prefetch_stream_blocks(self):
+        from wagtail.blocks import StreamValue
+
+        stream_values = []
+        for obj in self._result_cache:
+            for field_name in self._prefetch_stream_block_fields:
+                # Skip pages that don't have the field (e.g. pages of other types),
+                # or where it has been deferred
+                value = getattr(obj, "__dict__", {}).get(field_name)
+                if isinstance(value, StreamValue):
+                    stream_values.append(value)
+
+        StreamValue.prefetch_blocks(stream_values)
+
     def live_q(self):
         return Q(live=True)
 
@@ -559,6 +590,32 @@ class PageQuerySet(SearchableQuerySetMixin, SpecificQuerySetMixin, TreeQuerySet)
             return clone
         return clone.defer(*streamfield_names)
 
+    def prefetch_stream_blocks(self, *field_names):
+        """
+        Performance optimisation for listing pages.
+        When the queryset is evaluated, converts the named StreamFields of all
+        results in one go, so that child blocks which query the database (such as
+        ``ImageChooserBlock`` or ``PageChooserBlock``) make one query per block
+        type across all pages, rather than one per page. Pages that do not have
+        a field with the given name are skipped, so this is typically used with
+        ``specific()``:
+
+        .. code-block:: python
+
+            Page.objects.live().specific().prefetch_stream_blocks("body")
+
+        As with ``prefetch_related()``, passing ``None`` clears any previously
+        given field names.
+        """
+        clone = self._chain()
+        if field_names == (None,):
+            clone._prefetch_stream_block_fields = ()
+        else:
+            clone._prefetch_stream_block_fields = (
+                self._prefetch_stream_block_fields + field_names
+            )
+        return clone
+
     def in_site(self, site):
         """
         This filters the QuerySet to only contain pages within the specified site.
@@ -1,31 +1,76 @@
 import logging
+import uuid
 from contextlib import contextmanager
+from datetime import timedelta
 
 from asgiref.local import Local
+from django.conf import settings
+from django.contrib.auth import get_user_model
 from django.core.cache import cache
 from django.db import transaction
 from django.db.models.signals import (
+    m2m_changed,
     post_delete,
     post_migrate,
     post_save,
     pre_delete,
     pre_migrate,
 )
+from django.utils import timezone
+from modelcluster.fields import ParentalKey
+
+from wagtail.models import (
+    Collection,
+    GroupCollectionPermission,
+    GroupPagePermission,
+    GroupSitePermission,
+    Locale,
+    Page,
+    ReferenceIndex,
+    Site,
+    get_page_models,
+)
+from wagtail.models.sites import clear_site_matching_table, get_site_matching_table
+from wagtail.permission_policies.base import (
+    clear_group_permissions_cache,
+    clear_tree_permissions_cache,
+    clear_user_permissions_cache,
+)
+from wagtail.signals import post_page_move
+from wagtail.utils.transactions import get_current_transaction
 
-from wagtail.models import Locale, Page, ReferenceIndex, Site
-
-from .tasks import update_reference_index_task
+from .tasks import (
+    get_reference_index_debounce_cache_key,
+    update_reference_index_batch_task,
+    update_reference_index_task,
+)
 
 logger = logging.getLogger("wagtail")
 
+# How long to keep debounce tokens for reference index updates beyond
+# WAGTAIL_REFERENCE_INDEX_UPDATE_DELAY, in seconds
+REFERENCE_INDEX_DEBOUNCE_GRACE_PERIOD = 300
+
 
 # Clear the wagtail_site_root_paths from the cache whenever Site records are updated.
 def post_save_site_signal_handler(instance, update_fields=None, **kwargs):
     Site.clear_site_root_paths_cache()
+    clear_site_matching_table()
 
 
 def post_delete_site_signal_handler(instance, **kwargs):
     Site.clear_site_root_paths_cache()
+    clear_site_matching_table()
+
+
+# The site matching table holds each site's root page, so it needs rebuilding
+# whenever a root page is updated.
+def post_save_site_root_page_signal_handler(instance, raw=False, **kwargs):
+    if raw or not getattr(settings, "WAGTAIL_SITE_MATCHING_CACHE", False):
+        return
+
+    if instance.pk in get_site_matching_table().root_page_ids:
+        clear_site_matching_table()
 
 
 def pre_delete_page_unpublish(sender, instance, **kwargs):
@@ -43,6 +88,51 @@ def reset_locales_display_names_cache(sender, instance, **kwargs):
     cache.delete("wagtail_locales_display_name")
 
 
+# Invalidate the permissions held in the shared cache whenever a group's
+# permissions or a user's group memberships change.
+def group_permission_changed_signal_handler(instance, **kwargs):
+    if getattr(settings, "WAGTAIL_PERMISSION_CACHE", False):
+        clear_group_permissions_cache([instance.group_id])
+
+
+def user_groups_changed_signal_handler(instance, action, reverse, pk_set, **kwargs):
+    if not getattr(settings, "WAGTAIL_PERMISSION_CACHE", False):
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        # instance is a user
+        clear_user_permissions_cache([instance.pk])
+    elif action == "post_clear":
+        # instance is a group, which no longer has any members to track it
+        clear_group_permissions_cache([instance.pk])
+    else:
+        # instance is a group, and pk_set holds the affected users
+        clear_user_permissions_cache(pk_set)
+
+
+def page_moved_permissions_signal_handler(parent_page_after, **kwargs):
+    # The paths of the moved pages change, as may those of their new siblings
+    if getattr(settings, "WAGTAIL_PERMISSION_CACHE", False):
+        clear_tree_permissions_cache(
+            GroupPagePermission, parent_page_after.path, "page"
+        )
+
+
+def collection_created_permissions_signal_handler(
+    instance, created, raw=False, **kwargs
+):
+    # Collections are kept sorted by name, so adding one may change the paths
+    # of its later siblings
+    if created and not raw and getattr(settings, "WAGTAIL_PERMISSION_CACHE", False):
+        clear_tree_permissions_cache(
+            GroupCollectionPermission,
+            instance.path[: -instance.steplen],
+            "collection",
+        )
+
+
 reference_index_auto_update_disabled = Local()
 
 
@@ -63,6 +153,124 @@ def disable_reference_index_auto_update():
         del reference_index_auto_update_disabled.value
 
 
+def _get_reference_index_update_key(instance):
+    """
+    Return the ``(app_label, model_name, pk)`` of the object that the references
+    on ``instance`` are recorded against. This is the parent object for child
+    models, where it can be found without a query.
+    """
+    for field in instance._meta.get_fields():
+        if not isinstance(field, ParentalKey):
+            continue
+
+        parent_model = field.related_model
+        parent_pk = getattr(instance, field.attname)
+        if (
+            parent_pk is not None
+            and field.target_field.primary_key
+            and not any(
+                isinstance(parent_field, ParentalKey)
+                for parent_field in parent_model._meta.get_fields()
+            )
+        ):
+            return (
+                parent_model._meta.app_label,
+                parent_model._meta.model_name,
+                str(parent_pk),
+            )
+        break
+
+    # Index pages as their specific type, so that saves of the generic and
+    # specific instances of a page are combined
+    model = getattr(instance, "specific_class", None) or type(instance)
+    return (model._meta.app_label, model._meta.model_name, str(instance.pk))
+
+
+class ReferenceIndexUpdateQueue:
+    """
+    Collects the objects saved during a transaction, so that each of them (or
+    the parent object that their references are recorded against) is
+    reindexed once, in as few tasks as possible, when the transaction is
+    committed.
+    """
+
+    def __init__(self):
+        # A dict of (app_label, model_name, pk) tuples, used as an ordered set
+        self.objects = {}
+        self.flushed = False
+
+    def add(self, instance):
+        self.objects[_get_reference_index_update_key(instance)] = None
+
+    def flush(self):
+        if self.flushed:
+            return
+
+        self.flushed = True
+        objects = list(self.objects)
+        self.objects = {}
+
+        delay = getattr(settings, "WAGTAIL_REFERENCE_INDEX_UPDATE_DELAY", 0)
+        batch_size = getattr(settings, "WAGTAIL_REFERENCE_INDEX_UPDATE_BATCH_SIZE", 100)
+
+        debounce_token = None
+        if delay and update_reference_index_task.get_backend().supports_defer:
+            # Tasks only index the objects they were given if no later update
+            # has been queued for them, so an object saved repeatedly within
+            # the delay is only indexed once. The tokens outlive the delay to
+            # allow for a backlog in the task queue - if one has expired, the
+            # object is indexed regardless
+            debounce_token = uuid.uuid4().hex
+            cache.set_many(
+                {
+                    get_reference_index_debounce_cache_key(*obj): debounce_token
+                    for obj in objects
+                },
+                delay + REFERENCE_INDEX_DEBOUNCE_GRACE_PERIOD,
+            )
+            run_after = timezone.now() + timedelta(seconds=delay)
+
+        for i in range(0, len(objects), batch_size):
+            batch = objects[i : i + batch_size]
+            if len(batch) == 1:
+                task = update_reference_index_task
+                args = batch[0]
+            else:
+                task = update_reference_index_batch_task
+                args = (batch,)
+
+            if debounce_token:
+                task = task.using(run_after=run_after)
+
+            task.enqueue(*args, debounce_token=debounce_token)
+
+
+def _queue_reference_index_update(instance):
+    current_transaction = get_current_transaction()
+
+    if current_transaction is None:
+        # Nothing else can be saved in the same transaction, so queue it now
+        queue = ReferenceIndexUpdateQueue()
+        queue.add(instance)
+        queue.flush()
+        return
+
+    # Reuse the queue for the current transaction, unless it has already been
+    # flushed. The queue is kept with the transaction, so it's discarded if
+    # the transaction is rolled back
+    queue = getattr(current_transaction, "reference_index_update_queue", None)
+    if queue is None or queue.flushed:
+        queue = ReferenceIndexUpdateQueue()
+        current_transaction.reference_index_update_queue = queue
+
+    queue.add(instance)
+
+    # The flush is registered for every save, so that it still happens if the
+    # savepoint that first registered it is rolled back. Only the first flush
+    # to run does anything
+    transaction.on_commit(queue.flush)
+
+
 def update_reference_index_on_save(instance, **kwargs):
     # Don't populate reference index while loading fixtures as referenced objects may not be populated yet
     if kwargs.get("raw", False):
@@ -71,9 +279,14 @@ def update_reference_index_on_save(instance, **kwargs):
     if getattr(reference_index_auto_update_disabled, "value", False):
         return
 
-    update_reference_index_task.enqueue(
-        instance._meta.app_label, instance._meta.model_name, str(instance.pk)
-    )
+    # Saving only fields that can't hold references leaves them unchanged
+    update_fields = kwargs.get("update_fields")
+    if update_fields is not None and ReferenceIndex.get_reference_field_names(
+        type(instance)
+    ).isdisjoint(update_fields):
+        return
+
+    _queue_reference_index_update(instance)
 
 
 def remove_reference_index_on_delete(instance, **kwargs):
@@ -107,6 +320,8 @@ def disconnect_reference_index_signal_handlers(**kwargs):
 def register_signal_handlers():
     post_save.connect(post_save_site_signal_handler, sender=Site)
     post_delete.connect(post_delete_site_signal_handler, sender=Site)
+    for model in get_page_models():
+        post_save.connect(post_save_site_root_page_signal_handler, sender=model)
 
     pre_delete.connect(pre_delete_page_unpublish, sender=Page)
     post_delete.connect(post_delete_page_log_deletion, sender=Page)
@@ -114,6 +329,19 @@ def register_signal_handlers():
     post_save.connect(reset_locales_display_names_cache, sender=Locale)
     post_delete.connect(reset_locales_display_names_cache, sender=Locale)
 
+    for model in [GroupPagePermission, GroupCollectionPermission, GroupSitePermission]:
+        post_save.connect(group_permission_changed_signal_handler, sender=model)
+        post_delete.connect(group_permission_changed_signal_handler, sender=model)
+
+    post_page_move.connect(page_moved_permissions_signal_handler)
+    post_save.connect(collection_created_permissions_signal_handler, sender=Collection)
+
+    groups_field = getattr(get_user_model(), "groups", None)
+    if groups_field is not None:
+        m2m_changed.connect(
+            user_groups_changed_signal_handler, sender=groups_field.through
+        )
+
     # Disconnect reference index signals while migrations are running
     # (we don't want to log references in migrations as the ReferenceIndex model might not exist)
     pre_migrate.connect(disconnect_reference_index_signal_handlers)
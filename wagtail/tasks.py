@@ -1,4 +1,5 @@
 from django.apps import apps
+from django.core.cache import cache
 from django.db import transaction
 from django.utils.module_loading import import_string
 from django_tasks import task
@@ -6,12 +7,14 @@ from modelcluster.fields import ParentalKey
 
 from wagtail.models import ReferenceIndex
 
+REFERENCE_INDEX_DEBOUNCE_CACHE_KEY_PREFIX = "wagtail_reference_index_update:"
 
-@task()
-def update_reference_index_task(app_label, model_name, pk):
-    model = apps.get_model(app_label, model_name)
-    instance = model.objects.get(pk=pk)
 
+def get_reference_index_debounce_cache_key(app_label, model_name, pk):
+    return f"{REFERENCE_INDEX_DEBOUNCE_CACHE_KEY_PREFIX}{app_label}.{model_name}:{pk}"
+
+
+def _get_reference_index_root(instance):
     # If the model is a child model, find the parent instance and index that instead
     while True:
         parental_keys = list(
@@ -21,18 +24,79 @@ def update_reference_index_task(app_label, model_name, pk):
             )
         )
         if not parental_keys:
-            break
+            return instance
 
         instance = getattr(instance, parental_keys[0].name)
         if instance is None:
             # parent is null, so there is no valid object to record references against
-            return
+            return None
+
+
+def _is_superseded(app_label, model_name, pk, debounce_token):
+    """
+    Check whether a later update of the object has been queued since the task
+    with the given token was, in which case that update will index it instead
+    """
+    if debounce_token is None:
+        return False
+
+    latest_token = cache.get(
+        get_reference_index_debounce_cache_key(app_label, model_name, pk)
+    )
+    return latest_token is not None and latest_token != debounce_token
+
+
+@task()
+def update_reference_index_task(app_label, model_name, pk, debounce_token=None):
+    if _is_superseded(app_label, model_name, pk, debounce_token):
+        return
+
+    model = apps.get_model(app_label, model_name)
+    instance = _get_reference_index_root(model.objects.get(pk=pk))
+    if instance is None:
+        return
 
     if ReferenceIndex.is_indexed(instance._meta.model):
         with transaction.atomic():
             ReferenceIndex.create_or_update_for_object(instance)
 
 
+@task()
+def update_reference_index_batch_task(objects, debounce_token=None):
+    """
+    Update the reference index for a list of ``[app_label, model_name, pk]``
+    objects, fetching the objects of each model in a single query. Objects
+    that no longer exist are skipped, and objects that share a parent are
+    only indexed once.
+    """
+    pks_by_model = {}
+    for app_label, model_name, pk in objects:
+        if not _is_superseded(app_label, model_name, pk, debounce_token):
+            pks_by_model.setdefault((app_label, model_name), []).append(pk)
+
+    # The objects to index, keyed by base model and pk. Where an object was
+    # saved as more than one model of a multi-table inheritance chain (such
+    # as Page and a page type), only the most specific instance is indexed,
+    # as its references include those of the other models
+    instances = {}
+    for (app_label, model_name), pks in pks_by_model.items():
+        model = apps.get_model(app_label, model_name)
+        for instance in model.objects.filter(pk__in=pks):
+            instance = _get_reference_index_root(instance)
+            if instance is None or not ReferenceIndex.is_indexed(instance._meta.model):
+                continue
+
+            parents = instance._meta.get_parent_list()
+            base_model = parents[-1] if parents else instance._meta.model
+            key = (base_model, instance.pk)
+            if key not in instances or isinstance(instance, type(instances[key])):
+                instances[key] = instance
+
+    for instance in instances.values():
+        with transaction.atomic():
+            ReferenceIndex.create_or_update_for_object(instance)
+
+
 @task()
 def delete_file_from_storage_task(deconstructed_storage, path):
     storage_module, storage_args, storage_kwargs = deconstructed_storage
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tests", "0059_nopromotepage"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="customrendition",
+            name="created_at",
+            field=models.DateTimeField(auto_now_add=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="customrendition",
+            name="file_format",
+            field=models.CharField(
+                blank=True, default="", editable=False, max_length=10
+            ),
+        ),
+        migrations.AddField(
+            model_name="customrendition",
+            name="file_size",
+            field=models.PositiveIntegerField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="customrenditionwithauthor",
+            name="created_at",
+            field=models.DateTimeField(auto_now_add=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="customrenditionwithauthor",
+            name="file_format",
+            field=models.CharField(
+                blank=True, default="", editable=False, max_length=10
+            ),
+        ),
+        migrations.AddField(
+            model_name="customrenditionwithauthor",
+            name="file_size",
+            field=models.PositiveIntegerField(editable=False, null=True),
+        ),
+    ]
@@ -1,6 +1,8 @@
+from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AnonymousUser, Group, Permission
 from django.contrib.contenttypes.models import ContentType
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 
 from wagtail.documents.models import Document
 from wagtail.models import Collection, GroupCollectionPermission
@@ -1585,3 +1587,52 @@ class TestCollectionManagementPermission(
             ),
             [],
         )
+
+
+@override_settings(
+    WAGTAIL_PERMISSION_CACHE=True,
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+)
+class TestSharedCollectionPermissionCache(PermissionPolicyTestCase):
+    def setUp(self):
+        super().setUp()
+        self.policy = CollectionPermissionPolicy(Document)
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+        # Permissions on a collection itself are matched by id, so check them
+        # against a document in a child collection, which are matched by path
+        reports_2020_collection = self.reports_collection.add_child(name="2020")
+        self.report_2020 = Document.objects.create(
+            title="2020 report", collection=reports_2020_collection
+        )
+
+    def user_can_change(self, user, document):
+        # Fresh instances, as would be loaded for each request
+        return self.policy.user_has_permission_for_instance(
+            get_user_model().objects.get(pk=user.pk),
+            "change",
+            Document.objects.get(pk=document.pk),
+        )
+
+    def test_collection_added_before_siblings_invalidates_cache(self):
+        self.assertTrue(self.user_can_change(self.report_changer, self.report_2020))
+
+        # "Archive" is sorted before "Reports", which moves to a new path
+        self.root_collection.add_child(name="Archive")
+        self.assertNotEqual(
+            Collection.objects.get(pk=self.reports_collection.pk).path,
+            self.reports_collection.path,
+        )
+
+        self.assertTrue(self.user_can_change(self.report_changer, self.report_2020))
+
+    def test_collection_move_invalidates_cache(self):
+        archive_collection = self.root_collection.add_child(name="Archive")
+        self.assertTrue(self.user_can_change(self.report_changer, self.report_2020))
+
+        reports_collection = Collection.objects.get(pk=self.reports_collection.pk)
+        reports_collection.move(archive_collection, "sorted-child")
+
+        self.assertTrue(self.user_can_change(self.report_changer, self.report_2020))
+        self.assertFalse(self.user_can_change(self.report_changer, self.changer_doc))
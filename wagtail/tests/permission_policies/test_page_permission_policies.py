@@ -1,5 +1,7 @@
+from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AnonymousUser, Group, Permission
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 
 from wagtail.models import GroupPagePermission, Page, get_default_page_content_type
 from wagtail.permission_policies.pages import PagePermissionPolicy
@@ -521,3 +523,190 @@ class TestPagePermissionPolicy(PermissionPolicyTestCase):
             ),
             [self.superuser],
         )
+
+
+class TestPagePermissionIndex(PermissionPolicyTestCase):
+    def setUp(self):
+        super().setUp()
+        self.policy = PagePermissionPolicy()
+
+        # a user with edit permission on the root and add permission on reports
+        self.multi_group_user = self.create_user(
+            "multigroupuser", "multigroupuser@example.com", "password"
+        )
+        self.multi_group_user.groups.add(
+            self.root_edit_perm.group, self.report_add_perm.group
+        )
+
+    def test_get_codenames_for_path(self):
+        index = self.policy.get_permission_index_for_user(self.multi_group_user)
+
+        self.assertEqual(
+            index.get_codenames_for_path(self.root_page.path), {"change_page"}
+        )
+        self.assertEqual(
+            index.get_codenames_for_path(self.adder_report.path),
+            {"change_page", "add_page"},
+        )
+        self.assertEqual(
+            index.get_codenames_for_path(Page.get_first_root_node().path), set()
+        )
+
+    def test_get_paths_for_codenames(self):
+        index = self.policy.get_permission_index_for_user(self.multi_group_user)
+
+        # The reports page is within the root page, so is left out
+        self.assertEqual(
+            index.get_paths_for_codenames({"change_page", "add_page"}),
+            [self.root_page.path],
+        )
+        self.assertEqual(
+            index.get_paths_for_codenames({"add_page"}), [self.reports_page.path]
+        )
+        self.assertEqual(index.get_paths_for_codenames({"delete_page"}), [])
+
+    def test_index_is_cached_on_user(self):
+        index = self.policy.get_permission_index_for_user(self.multi_group_user)
+
+        with self.assertNumQueries(0):
+            self.assertIs(
+                self.policy.get_permission_index_for_user(self.multi_group_user),
+                index,
+            )
+            self.assertTrue(
+                self.policy.user_has_permission_for_instance(
+                    self.multi_group_user, "add", self.adder_report
+                )
+            )
+            self.assertFalse(
+                self.policy.user_has_permission_for_instance(
+                    self.multi_group_user, "add", self.editor_page
+                )
+            )
+
+        # Rebuilt if the cached permissions are reset
+        del self.multi_group_user._page_permission_cache
+        self.assertIsNot(
+            self.policy.get_permission_index_for_user(self.multi_group_user), index
+        )
+
+    def test_instances_user_has_permission_for_with_overlapping_permissions(self):
+        self.assertResultSetEqual(
+            self.policy.instances_user_has_any_permission_for(
+                self.multi_group_user, ["add", "change"]
+            ),
+            Page.objects.descendant_of(self.root_page, inclusive=True),
+        )
+        self.assertResultSetEqual(
+            self.policy.instances_user_has_permission_for(self.multi_group_user, "add"),
+            Page.objects.descendant_of(self.reports_page, inclusive=True),
+        )
+
+
+@override_settings(
+    WAGTAIL_PERMISSION_CACHE=True,
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+)
+class TestSharedPermissionCache(PermissionPolicyTestCase):
+    def setUp(self):
+        super().setUp()
+        self.policy = PagePermissionPolicy()
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def get_user(self, username):
+        # A fresh instance, as would be loaded for each request
+        return get_user_model().objects.get(username=username)
+
+    def get_perms(self, username):
+        return self.policy.get_cached_permissions_for_user(self.get_user(username))
+
+    def test_permissions_are_shared_across_requests(self):
+        self.assertEqual(self.get_perms("reporteditor"), [self.report_edit_perm])
+
+        user = self.get_user("reporteditor")
+        with self.assertNumQueries(0):
+            perms = self.policy.get_cached_permissions_for_user(user)
+            self.assertEqual(perms, [self.report_edit_perm])
+            self.assertEqual(perms[0].page, self.reports_page)
+            self.assertTrue(
+                self.policy.user_has_permission_for_instance(
+                    user, "change", self.reports_page
+                )
+            )
+
+    def test_superusers_are_not_cached(self):
+        self.policy.get_cached_permissions_for_user(self.superuser)
+        self.assertIsNone(
+            cache.get(f"wagtail_permissions_page_permission_cache:{self.superuser.pk}")
+        )
+
+    def test_group_permission_change_invalidates_cache(self):
+        self.assertEqual(self.get_perms("reporteditor"), [self.report_edit_perm])
+
+        delete_perm = GroupPagePermission.objects.create(
+            group=self.report_edit_perm.group,
+            page=self.reports_page,
+            permission=Permission.objects.get(codename="delete_page"),
+        )
+        self.assertCountEqual(
+            self.get_perms("reporteditor"), [self.report_edit_perm, delete_perm]
+        )
+
+        delete_perm.delete()
+        self.assertEqual(self.get_perms("reporteditor"), [self.report_edit_perm])
+
+    def test_permission_added_to_empty_group_invalidates_cache(self):
+        group = Group.objects.create(name="Empty group")
+        self.report_editor.groups.add(group)
+        self.assertEqual(self.get_perms("reporteditor"), [self.report_edit_perm])
+
+        perm = GroupPagePermission.objects.create(
+            group=group,
+            page=self.root_page,
+            permission=Permission.objects.get(codename="publish_page"),
+        )
+        self.assertCountEqual(
+            self.get_perms("reporteditor"), [self.report_edit_perm, perm]
+        )
+
+    def test_page_move_invalidates_cache(self):
+        archive_page = self.root_page.add_child(
+            instance=Page(title="Archive", slug="archive")
+        )
+        self.assertEqual(self.get_perms("reporteditor"), [self.report_edit_perm])
+
+        self.reports_page.move(archive_page, pos="last-child")
+        reports_page = Page.objects.get(pk=self.reports_page.pk)
+        report_page = reports_page.add_child(
+            instance=Page(title="Report", slug="report")
+        )
+
+        perms = self.get_perms("reporteditor")
+        self.assertEqual(perms[0].page.path, reports_page.path)
+        self.assertTrue(
+            self.policy.user_has_permission_for_instance(
+                self.get_user("reporteditor"), "change", report_page
+            )
+        )
+
+    def test_group_membership_change_invalidates_cache(self):
+        self.assertEqual(self.get_perms("reporteditor"), [self.report_edit_perm])
+
+        self.report_editor.groups.add(self.root_edit_perm.group)
+        self.assertCountEqual(
+            self.get_perms("reporteditor"),
+            [self.report_edit_perm, self.root_edit_perm],
+        )
+
+        self.report_editor.groups.remove(self.report_edit_perm.group)
+        self.assertEqual(self.get_perms("reporteditor"), [self.root_edit_perm])
+
+        self.root_edit_perm.group.user_set.remove(self.report_editor)
+        self.assertEqual(self.get_perms("reporteditor"), [])
+
+        self.report_edit_perm.group.user_set.add(self.report_editor)
+        self.assertEqual(self.get_perms("reporteditor"), [self.report_edit_perm])
+
+        self.report_edit_perm.group.user_set.clear()
+        self.assertEqual(self.get_perms("reporteditor"), [])
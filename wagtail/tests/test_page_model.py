@@ -252,6 +252,33 @@ class TestSiteRouting(TestCase):
             # subsequent lookups should be cached on the request
             Page.route_for_request(request, request.path)
 
+    def test_route_for_request_prefetches_pages_along_path(self):
+        christmas_page = EventPage.objects.get(url_path="/home/events/christmas/")
+        request = get_dummy_request(path="/events/christmas/", site=self.default_site)
+
+        # site, all pages along the path in a single query, then one query
+        # for each distinct specific page type
+        with self.assertNumQueries(4):
+            (found_page, args, kwargs) = Page.route_for_request(request, request.path)
+        self.assertEqual(found_page, christmas_page)
+        self.assertIsInstance(found_page, EventPage)
+        self.assertFalse(hasattr(request, "_wagtail_route_candidates"))
+
+        # parent cache should be set from the prefetched pages
+        with self.assertNumQueries(0):
+            parent = found_page.get_parent(update=False)
+        self.assertIsInstance(parent, EventIndex)
+
+    @override_settings(WAGTAIL_PREFETCH_ROUTE_PAGES=False)
+    def test_route_for_request_without_prefetching(self):
+        christmas_page = EventPage.objects.get(url_path="/home/events/christmas/")
+        request = get_dummy_request(path="/events/christmas/", site=self.default_site)
+
+        # site, then a query for each level plus one for its specific page
+        with self.assertNumQueries(5):
+            (found_page, args, kwargs) = Page.route_for_request(request, request.path)
+        self.assertEqual(found_page, christmas_page)
+
     def test_route_for_request_value(self):
         request = get_dummy_request(site=self.events_site)
         self.assertFalse(hasattr(request, "_wagtail_route_for_request"))
@@ -404,6 +431,38 @@ class TestRouting(TestCase):
         )
         self.assertEqual(christmas_page.get_site(), default_site)
 
+    def test_get_urls_for_pages(self):
+        events_page = Page.objects.get(url_path="/home/events/")
+        Site.objects.create(hostname="events.example.com", root_page=events_page)
+        default_site = Site.objects.get(is_default_site=True)
+        pages = list(Page.objects.all())
+
+        urls = Page.get_urls_for_pages(pages)
+        self.assertEqual(
+            urls, {page.pk: (page.get_url(), page.get_full_url()) for page in pages}
+        )
+
+        request = get_dummy_request(site=default_site)
+        urls = Page.get_urls_for_pages(pages, request=request)
+        self.assertEqual(
+            urls,
+            {
+                page.pk: (page.get_url(request), page.get_full_url(request))
+                for page in pages
+            },
+        )
+        root = Page.objects.get(url_path="/")
+        self.assertEqual(urls[root.pk], (None, None))
+
+    def test_get_urls_for_pages_finds_site_root_paths_once(self):
+        pages = list(Page.objects.all())
+        request = get_dummy_request()
+        Site.find_for_request(request)
+        Page.get_urls_for_pages(pages[:1], request=request)
+
+        with self.assertNumQueries(0):
+            Page.get_urls_for_pages(pages, request=request)
+
     def test_page_with_no_url(self):
         root = Page.objects.get(url_path="/")
         default_site = Site.objects.get(is_default_site=True)
@@ -584,6 +643,22 @@ class TestRouting(TestCase):
                 christmas_page.get_url(request=request), "/events/christmas/"
             )
 
+    def test_route_for_request_with_prefetching_to_unknown_page(self):
+        request = get_dummy_request(
+            path="/events/quinquagesima/",
+            site=Site.objects.get(is_default_site=True),
+        )
+        self.assertIsNone(Page.route_for_request(request, request.path))
+
+    def test_route_for_request_with_prefetching_respects_custom_route(self):
+        # SingleEventPage.route() treats "pointless-suffix/" as the page itself
+        request = get_dummy_request(
+            path="/events/saint-patrick/pointless-suffix/",
+            site=Site.objects.get(is_default_site=True),
+        )
+        (found_page, args, kwargs) = Page.route_for_request(request, request.path)
+        self.assertEqual(found_page.url_path, "/home/events/saint-patrick/")
+
     def test_cached_parent_obj_set(self):
         homepage = Page.objects.get(url_path="/home/")
         christmas_page = EventPage.objects.get(url_path="/home/events/christmas/")
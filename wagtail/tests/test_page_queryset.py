@@ -1,3 +1,4 @@
+import json
 from io import StringIO
 from unittest import mock
 
@@ -7,6 +8,8 @@ from django.core import management
 from django.db.models import Count, Q
 from django.test import TestCase, TransactionTestCase
 
+from wagtail.images.models import Image
+from wagtail.images.tests.utils import get_test_image_file
 from wagtail.models import Locale, Page, PageViewRestriction, Site, Workflow
 from wagtail.search.query import MATCH_ALL
 from wagtail.signals import page_unpublished
@@ -648,6 +651,80 @@ class TestPageQuerySet(TestCase):
                         )
 
 
+class TestPrefetchStreamBlocks(TestCase):
+    fixtures = ["test.json"]
+
+    def setUp(self):
+        self.image = Image.objects.create(
+            title="Test image", file=get_test_image_file()
+        )
+        homepage = Page.objects.get(url_path="/home/")
+        for i in range(3):
+            homepage.add_child(
+                instance=StreamPage(
+                    title=f"Stream page {i}",
+                    body=json.dumps(
+                        [
+                            {"type": "image", "value": self.image.pk},
+                            {"type": "text", "value": f"Text {i}"},
+                            {"type": "image", "value": self.image.pk},
+                        ]
+                    ),
+                )
+            )
+
+    def test_prefetch_stream_blocks(self):
+        with self.assertNumQueries(2):
+            # Page query, then a single query for all images
+            pages = list(
+                StreamPage.objects.order_by("title").prefetch_stream_blocks("body")
+            )
+
+        with self.assertNumQueries(0):
+            for i, page in enumerate(pages):
+                self.assertEqual(page.body[0].value, self.image)
+                self.assertEqual(page.body[1].value, f"Text {i}")
+                self.assertEqual(page.body[2].value, self.image)
+
+    def test_prefetch_stream_blocks_with_mixed_page_types(self):
+        with self.assertNumQueries(4):
+            # Page query, EventIndex and StreamPage queries, then a single query
+            # for all images. Pages without a body field are skipped.
+            pages = list(
+                Page.objects.filter(
+                    Q(title__startswith="Stream page") | Q(url_path="/home/events/")
+                )
+                .specific()
+                .prefetch_stream_blocks("body")
+            )
+
+        stream_pages = [page for page in pages if isinstance(page, StreamPage)]
+        self.assertEqual(len(stream_pages), 3)
+        with self.assertNumQueries(0):
+            for page in stream_pages:
+                self.assertEqual(page.body[0].value, self.image)
+
+    def test_prefetch_stream_blocks_is_chainable(self):
+        queryset = StreamPage.objects.prefetch_stream_blocks("body").filter(
+            title__startswith="Stream"
+        )
+        self.assertEqual(queryset._prefetch_stream_block_fields, ("body",))
+
+        with self.assertNumQueries(2):
+            self.assertEqual(len(queryset), 3)
+
+    def test_prefetch_stream_blocks_none_clears_fields(self):
+        queryset = StreamPage.objects.prefetch_stream_blocks("body")
+        queryset = queryset.prefetch_stream_blocks(None)
+        self.assertEqual(queryset._prefetch_stream_block_fields, ())
+
+        with self.assertNumQueries(1):
+            pages = list(queryset)
+
+        with self.assertNumQueries(1):
+            pages[0].body[0].value
+
+
 class TestPageQueryInSite(TestCase):
     fixtures = ["test.json"]
 
@@ -1,10 +1,16 @@
 from io import StringIO
+from unittest import mock
 
+from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
 from django.core import management
+from django.core.cache import cache
 from django.core.exceptions import FieldDoesNotExist
-from django.db import models
-from django.test import TestCase
+from django.core.management import CommandError
+from django.db import connection, models, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from django.utils.functional import SimpleLazyObject
 
 from wagtail.blocks import StreamValue, StructValue
@@ -14,6 +20,12 @@ from wagtail.images import get_image_model
 from wagtail.images.tests.utils import get_test_image_file
 from wagtail.models import Page, ReferenceIndex
 from wagtail.rich_text import RichText
+from wagtail.signal_handlers import disable_reference_index_auto_update
+from wagtail.tasks import (
+    get_reference_index_debounce_cache_key,
+    update_reference_index_batch_task,
+    update_reference_index_task,
+)
 from wagtail.test.testapp.models import (
     Advert,
     AdvertWithCustomUUIDPrimaryKey,
@@ -276,6 +288,113 @@ class TestCreateOrUpdateForObject(TestCase):
         )
         self.assertFalse(stdout.getvalue())
 
+    def get_index_records(self):
+        return set(
+            ReferenceIndex.objects.values_list(
+                "content_type",
+                "base_content_type",
+                "object_id",
+                "to_content_type",
+                "to_object_id",
+                "model_path",
+                "content_path",
+                "content_path_hash",
+            )
+        )
+
+    def create_stale_reference(self, object):
+        return ReferenceIndex.objects.create(
+            content_type=ContentType.objects.get_for_model(object),
+            base_content_type=ReferenceIndex._get_base_content_type(object),
+            object_id=object.pk,
+            to_content_type=self.image_content_type,
+            to_object_id=self.test_image_2.pk,
+            model_path="hero_image",
+            content_path="hero_image",
+            content_path_hash=ReferenceIndex._get_content_path_hash("hero_image"),
+        )
+
+    def test_rebuild_references_index(self):
+        expected_records = self.get_index_records()
+        stale_reference = self.create_stale_reference(self.event_page)
+
+        management.call_command(
+            "rebuild_references_index", chunk_size=1, stdout=StringIO()
+        )
+
+        self.assertFalse(ReferenceIndex.objects.filter(pk=stale_reference.pk).exists())
+        self.assertSetEqual(self.get_index_records(), expected_records)
+
+    def test_rebuild_references_index_commit_per_chunk(self):
+        expected_records = self.get_index_records()
+        ReferenceIndex.objects.all().delete()
+
+        management.call_command(
+            "rebuild_references_index",
+            chunk_size=2,
+            commit_per_chunk=True,
+            stdout=StringIO(),
+        )
+
+        self.assertSetEqual(self.get_index_records(), expected_records)
+
+    def test_rebuild_references_index_for_model(self):
+        expected_records = self.get_index_records()
+        ReferenceIndex.get_references_for_object(self.event_page).delete()
+        stale_reference = self.create_stale_reference(self.event_page)
+        advert = Advert.objects.create(text="An advertisement")
+        unrelated_reference = self.create_stale_reference(advert)
+
+        management.call_command(
+            "rebuild_references_index", models=["tests.EventPage"], stdout=StringIO()
+        )
+
+        self.assertFalse(ReferenceIndex.objects.filter(pk=stale_reference.pk).exists())
+        # References of other models are left alone
+        self.assertTrue(
+            ReferenceIndex.objects.filter(pk=unrelated_reference.pk).exists()
+        )
+        unrelated_reference.delete()
+        self.assertSetEqual(self.get_index_records(), expected_records)
+
+    def test_rebuild_references_index_for_pk_range(self):
+        other_event_page = EventPage(
+            title="Other event page",
+            slug="other-event-page",
+            location="the moon",
+            audience="public",
+            cost="free",
+            date_from="2001-01-01",
+        )
+        self.root_page.add_child(instance=other_event_page)
+        in_range_reference = self.create_stale_reference(self.event_page)
+        out_of_range_reference = self.create_stale_reference(other_event_page)
+
+        management.call_command(
+            "rebuild_references_index",
+            models=["tests.EventPage"],
+            start_pk=self.event_page.pk,
+            end_pk=self.event_page.pk,
+            stdout=StringIO(),
+        )
+
+        self.assertFalse(
+            ReferenceIndex.objects.filter(pk=in_range_reference.pk).exists()
+        )
+        self.assertTrue(
+            ReferenceIndex.objects.filter(pk=out_of_range_reference.pk).exists()
+        )
+
+    def test_rebuild_references_index_for_unindexed_model(self):
+        with self.assertRaisesMessage(
+            CommandError, "wagtailcore.ReferenceIndex is not indexed"
+        ):
+            management.call_command(
+                "rebuild_references_index",
+                models=["wagtailcore.ReferenceIndex"],
+                stdout=StringIO(),
+            )
+
     def test_show_references_index(self):
         stdout = StringIO()
         management.call_command(
@@ -878,3 +997,313 @@ class TestBulkFetch(TestCase):
             },
             expected_refs,
         )
+
+
+class TestReferenceIndexUpdateQueue(TestCase):
+    fixtures = ["test.json"]
+
+    def setUp(self):
+        self.event_page = EventPage.objects.get(id=4)
+        self.speaker = self.event_page.speakers.get()
+
+        patcher = mock.patch.multiple(
+            "wagtail.signal_handlers",
+            update_reference_index_task=mock.DEFAULT,
+            update_reference_index_batch_task=mock.DEFAULT,
+        )
+        self.tasks = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_saves_in_transaction_are_combined(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event_page.save()
+            self.event_page.save()
+            self.speaker.save()
+
+            # Nothing is queued until the transaction is committed
+            self.tasks["update_reference_index_task"].enqueue.assert_not_called()
+
+        # The speaker's references are recorded against the event page
+        self.tasks["update_reference_index_task"].enqueue.assert_called_once_with(
+            "tests", "eventpage", "4", debounce_token=None
+        )
+        self.tasks["update_reference_index_batch_task"].enqueue.assert_not_called()
+
+    def test_batch_task(self):
+        advert = AdvertWithCustomUUIDPrimaryKey.objects.create(text="An advertisement")
+
+        # The creation of the advert and its later save are combined
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event_page.save()
+            advert.save()
+
+        self.tasks["update_reference_index_task"].enqueue.assert_not_called()
+        self.tasks["update_reference_index_batch_task"].enqueue.assert_called_once_with(
+            [
+                ("tests", "advertwithcustomuuidprimarykey", str(advert.pk)),
+                ("tests", "eventpage", "4"),
+            ],
+            debounce_token=None,
+        )
+
+    @override_settings(WAGTAIL_REFERENCE_INDEX_UPDATE_BATCH_SIZE=2)
+    def test_batch_size(self):
+        adverts = [
+            AdvertWithCustomUUIDPrimaryKey.objects.create(text=f"Advert {i}")
+            for i in range(5)
+        ]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            for advert in adverts:
+                advert.save()
+
+        batch_task = self.tasks["update_reference_index_batch_task"]
+        self.assertEqual(
+            [call.args[0] for call in batch_task.enqueue.call_args_list],
+            [
+                [
+                    ("tests", "advertwithcustomuuidprimarykey", str(advert.pk))
+                    for advert in adverts[0:2]
+                ],
+                [
+                    ("tests", "advertwithcustomuuidprimarykey", str(advert.pk))
+                    for advert in adverts[2:4]
+                ],
+            ],
+        )
+        self.tasks["update_reference_index_task"].enqueue.assert_called_once_with(
+            "tests",
+            "advertwithcustomuuidprimarykey",
+            str(adverts[4].pk),
+            debounce_token=None,
+        )
+
+    def test_new_queue_after_flush(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event_page.save()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event_page.save()
+
+        self.assertEqual(
+            self.tasks["update_reference_index_task"].enqueue.call_count, 2
+        )
+
+    def test_queue_from_rolled_back_transaction_is_discarded(self):
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                AdvertWithCustomUUIDPrimaryKey.objects.create(text="An advertisement")
+                raise RuntimeError
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event_page.save()
+
+        self.tasks["update_reference_index_task"].enqueue.assert_called_once_with(
+            "tests", "eventpage", "4", debounce_token=None
+        )
+        self.tasks["update_reference_index_batch_task"].enqueue.assert_not_called()
+
+    def test_save_without_reference_fields_is_skipped(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event_page.save(update_fields=["title", "location"])
+            self.speaker.save(update_fields=["first_name"])
+
+        self.tasks["update_reference_index_task"].enqueue.assert_not_called()
+
+    def test_save_revision_is_skipped(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event_page.save_revision()
+
+        self.tasks["update_reference_index_task"].enqueue.assert_not_called()
+
+    def test_lock_is_skipped(self):
+        user = get_user_model().objects.first()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event_page.locked = True
+            self.event_page.locked_by = user
+            self.event_page.locked_at = timezone.now()
+            self.event_page.save(update_fields=["locked", "locked_by", "locked_at"])
+
+        self.tasks["update_reference_index_task"].enqueue.assert_not_called()
+
+    def test_save_with_reference_fields(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event_page.save(update_fields=["title", "feed_image"])
+            self.speaker.save(update_fields=["page_id"])
+
+        self.tasks["update_reference_index_task"].enqueue.assert_called_once_with(
+            "tests", "eventpage", "4", debounce_token=None
+        )
+
+    @override_settings(
+        WAGTAIL_REFERENCE_INDEX_UPDATE_DELAY=60,
+        CACHES={
+            "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+        },
+    )
+    def test_debounce(self):
+        cache.clear()
+        task = self.tasks["update_reference_index_task"]
+        task.get_backend.return_value.supports_defer = True
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event_page.save()
+
+        task.using.assert_called_once()
+        self.assertGreater(task.using.call_args.kwargs["run_after"], timezone.now())
+        debounce_token = task.using.return_value.enqueue.call_args.kwargs[
+            "debounce_token"
+        ]
+        self.assertEqual(
+            cache.get(
+                get_reference_index_debounce_cache_key("tests", "eventpage", "4")
+            ),
+            debounce_token,
+        )
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class TestUpdateReferenceIndexTasks(TestCase):
+    fixtures = ["test.json"]
+
+    def setUp(self):
+        cache.clear()
+        self.event_page = EventPage.objects.get(id=4)
+        self.image = get_image_model().objects.create(
+            title="Test image", file=get_test_image_file()
+        )
+        with disable_reference_index_auto_update():
+            self.event_page.feed_image = self.image
+            self.event_page.save()
+
+    def get_references(self):
+        return ReferenceIndex.get_references_to(self.image)
+
+    def test_batch_task(self):
+        speaker = self.event_page.speakers.get()
+        advert = Advert.objects.create(text="An advertisement")
+
+        update_reference_index_batch_task.call(
+            [
+                ("tests", "eventpagespeaker", str(speaker.pk)),
+                ("tests", "eventpage", "4"),
+                ("tests", "advert", str(advert.pk)),
+                ("tests", "advert", "999999"),
+            ]
+        )
+
+        self.assertEqual(self.get_references().count(), 1)
+
+    def test_superseded_update_is_skipped(self):
+        cache.set(
+            get_reference_index_debounce_cache_key("tests", "eventpage", "4"), "later"
+        )
+
+        update_reference_index_task.call("tests", "eventpage", "4", "earlier")
+        update_reference_index_batch_task.call(
+            [("tests", "eventpage", "4")], debounce_token="earlier"
+        )
+        self.assertEqual(self.get_references().count(), 0)
+
+        update_reference_index_task.call("tests", "eventpage", "4", "later")
+        self.assertEqual(self.get_references().count(), 1)
+
+
+@override_settings(
+    WAGTAIL_REFERENCE_INDEX_DIGEST_CACHE_TIMEOUT=3600,
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+)
+class TestReferenceIndexDigest(TestCase):
+    fixtures = ["test.json"]
+
+    def setUp(self):
+        cache.clear()
+        self.event_page = EventPage.objects.get(id=4)
+        self.image = get_image_model().objects.create(
+            title="Test image", file=get_test_image_file()
+        )
+
+    def update_index(self):
+        with CaptureQueriesContext(connection) as queries:
+            with self.captureOnCommitCallbacks(execute=True):
+                ReferenceIndex.create_or_update_for_object(self.event_page)
+        return any("wagtailcore_referenceindex" in q["sql"] for q in queries)
+
+    def get_references(self):
+        return ReferenceIndex.get_references_to(self.image)
+
+    def test_unchanged_references_are_skipped(self):
+        self.assertTrue(self.update_index())
+        self.assertFalse(self.update_index())
+
+        self.event_page.feed_image = self.image
+        self.assertTrue(self.update_index())
+        self.assertEqual(self.get_references().count(), 1)
+        self.assertFalse(self.update_index())
+
+    def test_remove_for_object(self):
+        self.event_page.feed_image = self.image
+        self.update_index()
+
+        ReferenceIndex.remove_for_object(self.event_page)
+        self.assertEqual(self.get_references().count(), 0)
+
+        self.assertTrue(self.update_index())
+        self.assertEqual(self.get_references().count(), 1)
+
+    def test_digest_depends_on_content_type(self):
+        self.update_index()
+
+        page = Page.objects.get(id=4)
+        with self.captureOnCommitCallbacks(execute=True):
+            ReferenceIndex.create_or_update_for_object(page)
+
+        # The page was last indexed as a Page rather than an EventPage
+        self.assertTrue(self.update_index())
+
+    def test_rebuild_references_index_clears_digests(self):
+        self.event_page.feed_image = self.image
+        self.update_index()
+
+        ReferenceIndex.objects.all().delete()
+        management.call_command("rebuild_references_index", stdout=StringIO())
+
+        self.assertTrue(self.update_index())
+
+    @override_settings(WAGTAIL_REFERENCE_INDEX_DIGEST_CACHE_TIMEOUT=None)
+    def test_disabled_by_default(self):
+        self.assertTrue(self.update_index())
+        self.assertTrue(self.update_index())
+
+
+class TestGetReferenceFieldNames(TestCase):
+    def test_get_reference_field_names(self):
+        field_names = ReferenceIndex.get_reference_field_names(EventPage)
+        self.assertIn("feed_image", field_names)
+        self.assertIn("feed_image_id", field_names)
+        self.assertIn("body", field_names)
+        self.assertNotIn("title", field_names)
+        self.assertNotIn("location", field_names)
+
+    def test_child_model(self):
+        field_names = ReferenceIndex.get_reference_field_names(EventPageSpeaker)
+        self.assertIn("page", field_names)
+        self.assertIn("image_id", field_names)
+        self.assertNotIn("first_name", field_names)
+
+    def test_ignored_fields(self):
+        field_names = ReferenceIndex.get_reference_field_names(EventPage)
+        # Fields marked with wagtail_reference_index_ignore
+        self.assertNotIn("owner", field_names)
+        self.assertNotIn("locked_by_id", field_names)
+        # Relations to models marked with wagtail_reference_index_ignore
+        self.assertNotIn("latest_revision", field_names)
+        self.assertNotIn("live_revision_id", field_names)
+
+    def test_generic_foreign_key(self):
+        field_names = ReferenceIndex.get_reference_field_names(GenericSnippetPage)
+        self.assertIn("snippet_content_type", field_names)
+        self.assertIn("snippet_object_id", field_names)
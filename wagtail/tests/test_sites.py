@@ -1,8 +1,19 @@
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
+from django.db import connection, transaction
 from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 
 from wagtail.coreutils import get_dummy_request
 from wagtail.models import Page, Site
+from wagtail.models.sites import (
+    SiteMatchingTable,
+    SiteRootPath,
+    SiteRootPathMatcher,
+    get_site_for_hostname,
+    get_site_matching_table,
+)
+from wagtail.test.testapp.models import SimplePage
 
 
 class TestSiteNaturalKey(TestCase):
@@ -152,6 +163,166 @@ class TestFindSiteForRequest(TestCase):
         self.assertEqual(Site.find_for_request(request), self.default_site)
 
 
+@override_settings(
+    WAGTAIL_SITE_MATCHING_CACHE=True,
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+)
+class TestSiteMatchingCache(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.root_page = Page.objects.get(pk=2)
+        self.default_site = Site.objects.get()
+        # Run the commit hooks, so that the sites are treated as committed
+        with self.captureOnCommitCallbacks(execute=True):
+            self.site = Site.objects.create(
+                hostname="example.com", port=80, root_page=self.root_page
+            )
+            self.other_port_site = Site.objects.create(
+                hostname="example.com", port=8080, root_page=self.root_page
+            )
+            self.single_site = Site.objects.create(
+                hostname="single.example.com", port=8080, root_page=self.root_page
+            )
+
+    def test_match_is_consistent_with_database_lookup(self):
+        table = SiteMatchingTable(Site.objects.select_related("root_page"))
+        for hostname, port in [
+            ("example.com", 80),
+            ("example.com", 8080),
+            ("example.com", 9000),
+            ("single.example.com", 80),
+            ("single.example.com", 8080),
+            ("localhost", 80),
+            ("localhost", 9000),
+            ("unknown.com", 80),
+        ]:
+            with self.subTest(hostname=hostname, port=port):
+                with self.settings(WAGTAIL_SITE_MATCHING_CACHE=False):
+                    expected = get_site_for_hostname(hostname, port)
+                self.assertEqual(table.match(hostname, port), expected)
+                self.assertEqual(table.match(hostname, str(port)), expected)
+
+    def test_match_without_default_site(self):
+        self.default_site.delete()
+        table = SiteMatchingTable(Site.objects.select_related("root_page"))
+        self.assertEqual(table.match("single.example.com", 80), self.single_site)
+        # Several sites share this hostname, and none of them match the port
+        self.assertIsNone(table.match("example.com", 9000))
+        self.assertIsNone(table.match("unknown.com", 80))
+
+    def test_find_for_request_uses_no_queries_once_built(self):
+        get_site_matching_table()
+
+        request = get_dummy_request()
+        request.META.update({"HTTP_HOST": "example.com", "SERVER_PORT": 8080})
+        with self.assertNumQueries(0):
+            site = Site.find_for_request(request)
+            self.assertEqual(site.root_page, self.root_page)
+        self.assertEqual(site, self.other_port_site)
+
+    def test_find_for_request_returns_a_copy(self):
+        request = get_dummy_request(site=self.site)
+        site = Site.find_for_request(request)
+        site.site_name = "Changed"
+
+        request = get_dummy_request(site=self.site)
+        self.assertEqual(Site.find_for_request(request).site_name, "")
+
+    def test_table_rebuilt_when_site_saved(self):
+        table = get_site_matching_table()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            new_site = Site.objects.create(
+                hostname="new.example.com", root_page=self.root_page
+            )
+
+        self.assertIsNot(get_site_matching_table(), table)
+        self.assertEqual(get_site_for_hostname("new.example.com", 80), new_site)
+
+    def test_table_rebuilt_when_site_deleted(self):
+        get_site_matching_table()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.single_site.delete()
+
+        self.assertEqual(
+            get_site_for_hostname("single.example.com", 8080), self.default_site
+        )
+
+    def test_table_rebuilt_when_root_page_saved(self):
+        get_site_matching_table()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.root_page.title = "Changed"
+            self.root_page.save()
+
+        self.assertEqual(
+            get_site_for_hostname("example.com", 80).root_page.title, "Changed"
+        )
+
+    def test_table_rebuilt_when_specific_root_page_saved(self):
+        root_page = self.root_page.add_child(
+            instance=SimplePage(title="Simple", slug="simple", content="hello")
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            Site.objects.create(hostname="simple.example.com", root_page=root_page)
+        get_site_matching_table()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            root_page.title = "Changed"
+            root_page.save()
+
+        self.assertEqual(
+            get_site_for_hostname("simple.example.com", 80).root_page.title,
+            "Changed",
+        )
+
+    def test_other_page_saved_without_site_query(self):
+        page = self.root_page.add_child(instance=Page(title="Child"))
+        get_site_matching_table()
+
+        with CaptureQueriesContext(connection) as queries:
+            page.save()
+
+        # Whether the page is a site root is checked against the table
+        site_lookup = f'"wagtailcore_site"."root_page_id" = {page.pk}'
+        self.assertFalse(
+            any(site_lookup in query["sql"] for query in queries.captured_queries)
+        )
+
+    def test_table_not_kept_from_rolled_back_transaction(self):
+        get_site_matching_table()
+
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                Site.objects.create(
+                    hostname="new.example.com", root_page=self.root_page
+                )
+
+                # The change is visible within the transaction, but the table
+                # built from it isn't kept
+                self.assertEqual(
+                    get_site_for_hostname("new.example.com", 80).hostname,
+                    "new.example.com",
+                )
+                self.assertIsNot(get_site_matching_table(), get_site_matching_table())
+                raise RuntimeError
+
+        self.assertEqual(
+            get_site_for_hostname("new.example.com", 80), self.default_site
+        )
+        self.assertIs(get_site_matching_table(), get_site_matching_table())
+
+    def test_table_not_rebuilt_when_other_page_saved(self):
+        table = get_site_matching_table()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            page = self.root_page.add_child(instance=Page(title="Child"))
+            page.save()
+
+        self.assertIs(get_site_matching_table(), table)
+
+
 class TestDefaultSite(TestCase):
     def test_create_default_site(self):
         Site.objects.all().delete()
@@ -216,3 +387,36 @@ class TestGetSiteRootPaths(TestCase):
         # Followed by entries for others in 'host' alphabetical order
         self.assertEqual(result[1][0], self.abc_site.id)
         self.assertEqual(result[2][0], self.def_site.id)
+
+
+class TestSiteRootPathMatcher(TestCase):
+    def test_match(self):
+        site_root_paths = [
+            SiteRootPath(2, "/home/events/", "http://events.example.com", "en"),
+            SiteRootPath(1, "/home/", "http://localhost", "en"),
+            SiteRootPath(3, "/home/", "http://other.example.com", "en"),
+        ]
+        matcher = SiteRootPathMatcher(site_root_paths)
+
+        self.assertEqual(matcher.num_sites, 3)
+        self.assertEqual(
+            matcher.match("/home/events/christmas/"), tuple(site_root_paths)
+        )
+        self.assertEqual(matcher.match("/home/about-us/"), tuple(site_root_paths[1:]))
+        self.assertEqual(
+            matcher.match("/home/events-archive/"), tuple(site_root_paths[1:])
+        )
+        self.assertEqual(matcher.match("/other/"), ())
+
+    def test_match_root_path_without_trailing_slash(self):
+        site_root_paths = [
+            SiteRootPath(2, "/home/events/", "http://events.example.com", "en"),
+            SiteRootPath(1, "/home", "http://localhost", "en"),
+        ]
+        matcher = SiteRootPathMatcher(site_root_paths)
+
+        self.assertEqual(
+            matcher.match("/home/events/christmas/"), tuple(site_root_paths)
+        )
+        self.assertEqual(matcher.match("/homepage/"), (site_root_paths[1],))
+        self.assertEqual(matcher.match("/hom/"), ())
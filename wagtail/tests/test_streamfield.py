@@ -166,6 +166,38 @@ class TestLazyStreamField(TestCase):
             assert instance.body[1].value is None
             assert instance.body[2].value.title == "Test image 3"
 
+    def test_prefetch_blocks_across_instances(self):
+        """
+        StreamValue.prefetch_blocks should convert the blocks of several stream
+        values with a single query per block type
+        """
+        with self.assertNumQueries(1):
+            instances = list(
+                self.model.objects.filter(
+                    pk__in=[self.with_image.pk, self.no_image.pk, self.three_items.pk]
+                ).order_by("pk")
+            )
+
+        with self.assertNumQueries(1):
+            StreamValue.prefetch_blocks(
+                [instance.body for instance in instances] + [None]
+            )
+
+        with self.assertNumQueries(0):
+            self.assertEqual(instances[0].body[0].value, self.image)
+            self.assertEqual(instances[0].body[1].value, "foo")
+            self.assertEqual(instances[1].body[0].value, "foo")
+            self.assertEqual(instances[2].body[1].value, self.image)
+            # Each stream gets its own image instance
+            self.assertIsNot(instances[0].body[0].value, instances[2].body[1].value)
+
+    def test_prefetch_blocks_skips_converted_items(self):
+        instance = self.model.objects.get(pk=self.three_items.pk)
+        instance.body[1].value
+        with self.assertNumQueries(0):
+            StreamValue.prefetch_blocks([instance.body])
+        self.assertEqual(instance.body[1].value, self.image)
+
     def test_lazy_load_get_prep_value(self):
         """
         Saving a lazy StreamField that hasn't had its data accessed should not
@@ -31,6 +31,7 @@ from wagtail.coreutils import (
 )
 from wagtail.models import Page, Site
 from wagtail.utils.file import hash_filelike
+from wagtail.utils.ranges import MAX_RANGES, if_range_matches, parse_range_header
 from wagtail.utils.templates import template_is_overridden
 from wagtail.utils.utils import deep_update, flatten_choices
 from wagtail.utils.version import get_main_version
@@ -582,6 +583,53 @@ class HashFileLikeTestCase(SimpleTestCase):
         )
 
 
+class TestParseRangeHeader(SimpleTestCase):
+    def test_ranges(self):
+        self.assertEqual(parse_range_header("bytes=0-99", 1000), [(0, 99)])
+        self.assertEqual(parse_range_header("bytes=500-", 1000), [(500, 999)])
+        self.assertEqual(parse_range_header("bytes=-100", 1000), [(900, 999)])
+        self.assertEqual(
+            parse_range_header("bytes=0-0, -1", 1000), [(0, 0), (999, 999)]
+        )
+
+    def test_ranges_are_clamped_to_size(self):
+        self.assertEqual(parse_range_header("bytes=900-2000", 1000), [(900, 999)])
+        self.assertEqual(parse_range_header("bytes=-2000", 1000), [(0, 999)])
+
+    def test_unsatisfiable_ranges(self):
+        self.assertEqual(parse_range_header("bytes=1000-", 1000), [])
+        self.assertEqual(parse_range_header("bytes=-0", 1000), [])
+        self.assertEqual(parse_range_header("bytes=2000-3000, 0-1", 1000), [(0, 1)])
+
+    def test_invalid_headers_are_ignored(self):
+        self.assertIsNone(parse_range_header("items=0-1", 1000))
+        self.assertIsNone(parse_range_header("bytes=", 1000))
+        self.assertIsNone(parse_range_header("bytes=-", 1000))
+        self.assertIsNone(parse_range_header("bytes=5-1", 1000))
+        self.assertIsNone(parse_range_header("bytes=a-b", 1000))
+
+    def test_too_many_ranges_are_ignored(self):
+        header = "bytes=" + ",".join(f"{i}-{i}" for i in range(MAX_RANGES + 1))
+        self.assertIsNone(parse_range_header(header, 1000))
+
+    def test_if_range(self):
+        request = get_dummy_request()
+        self.assertTrue(if_range_matches(request, etag='"abc"'))
+
+        request = get_dummy_request()
+        request.META["HTTP_IF_RANGE"] = '"abc"'
+        self.assertTrue(if_range_matches(request, etag='"abc"'))
+        self.assertFalse(if_range_matches(request, etag='"def"'))
+        self.assertFalse(if_range_matches(request, etag='W/"abc"'))
+        self.assertFalse(if_range_matches(request))
+
+        request = get_dummy_request()
+        request.META["HTTP_IF_RANGE"] = "Wed, 21 Oct 2015 07:28:00 GMT"
+        self.assertTrue(if_range_matches(request, last_modified=1445412480))
+        self.assertFalse(if_range_matches(request, last_modified=1445412481))
+        self.assertFalse(if_range_matches(request, etag='"abc"'))
+
+
 class TestTemplateIsOverridden(SimpleTestCase):
     def setUp(self):
         template_is_overridden.cache_clear()
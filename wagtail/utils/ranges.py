@@ -0,0 +1,178 @@
+"""
+Support for HTTP range requests (RFC 9110, section 14), so that large files
+can be downloaded in parts, resumed, and seeked by media players.
+"""
+
+import re
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.crypto import get_random_string
+from django.utils.http import parse_http_date_safe
+
+RANGE_SPEC_RE = re.compile(r"^\s*(\d*)\s*-\s*(\d*)\s*$")
+
+# Requests for more ranges than this are answered with the whole file, to
+# avoid the overhead of serving many tiny (or overlapping) parts
+MAX_RANGES = 16
+
+RANGE_READ_SIZE = 2**16
+
+
+def parse_range_header(header, size):
+    """
+    Parse the value of a ``Range`` header for a file of the given size.
+
+    Returns a list of ``(start, end)`` tuples (where ``end`` is inclusive) for
+    the satisfiable ranges, which may be empty if none of them can be
+    satisfied. Returns ``None`` if the header is malformed or should
+    otherwise be ignored, in which case the whole file should be served.
+    """
+    units, _, range_set = header.partition("=")
+    if units.strip().lower() != "bytes" or not range_set.strip():
+        return None
+
+    ranges = []
+    for range_spec in range_set.split(","):
+        match = RANGE_SPEC_RE.match(range_spec)
+        if match is None:
+            return None
+
+        first, last = match.groups()
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+            if last and end < start:
+                return None
+            if start >= size:
+                # This range is unsatisfiable, but others may not be
+                continue
+            end = min(end, size - 1)
+        elif last:
+            # A suffix range, for the last N bytes of the file
+            suffix_length = int(last)
+            if suffix_length == 0:
+                continue
+            start = max(size - suffix_length, 0)
+            end = size - 1
+        else:
+            return None
+
+        ranges.append((start, end))
+
+    if len(ranges) > MAX_RANGES:
+        return None
+
+    return ranges
+
+
+def if_range_matches(request, etag=None, last_modified=None):
+    """
+    Check the ``If-Range`` header of the request (if any) against the current
+    ETag and last modified timestamp of the file, to determine whether the
+    requested ranges may be served. ETags must match using the strong
+    comparison function, and dates must match exactly.
+    """
+    if_range = request.headers.get("if-range")
+    if if_range is None:
+        return True
+
+    if_range = if_range.strip()
+    if if_range.startswith(('"', "W/")):
+        return etag is not None and not etag.startswith("W/") and if_range == etag
+
+    if_range_date = parse_http_date_safe(if_range)
+    return (
+        if_range_date is not None
+        and last_modified is not None
+        and int(last_modified) == if_range_date
+    )
+
+
+def _read_range(file, start, end):
+    file.seek(start)
+    remaining = end - start + 1
+    while remaining > 0:
+        chunk = file.read(min(RANGE_READ_SIZE, remaining))
+        if not chunk:
+            break
+        remaining -= len(chunk)
+        yield chunk
+
+
+def _stream_ranges(file, parts, closing):
+    try:
+        for part_header, start, end in parts:
+            if part_header:
+                yield part_header
+            yield from _read_range(file, start, end)
+        if closing:
+            yield closing
+    finally:
+        file.close()
+
+
+def get_range_response(
+    request, file, size, content_type, etag=None, last_modified=None
+):
+    """
+    Return a response for the byte ranges of ``file`` requested by the
+    ``Range`` header of the request. This is a ``206 Partial Content``
+    response (using ``multipart/byteranges`` for multiple ranges), or a
+    ``416 Range Not Satisfiable`` response.
+
+    Returns ``None`` if the whole file should be served instead, for example
+    because no ranges were requested or ``If-Range`` does not match. The
+    file is only closed by this function when a response is returned.
+    """
+    if request.method not in ("GET", "HEAD"):
+        return None
+
+    header = request.headers.get("range")
+    if not header or not if_range_matches(request, etag, last_modified):
+        return None
+
+    ranges = parse_range_header(header, size)
+    if ranges is None:
+        return None
+
+    if not ranges:
+        file.close()
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+        return response
+
+    if len(ranges) == 1:
+        start, end = ranges[0]
+        response = StreamingHttpResponse(
+            _stream_ranges(file, [(None, start, end)], None),
+            status=206,
+            content_type=content_type,
+        )
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response["Content-Length"] = end - start + 1
+    else:
+        boundary = get_random_string(32)
+        parts = [
+            (
+                (
+                    f"\r\n--{boundary}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Range: bytes {start}-{end}/{size}\r\n\r\n"
+                ).encode(),
+                start,
+                end,
+            )
+            for start, end in ranges
+        ]
+        closing = f"\r\n--{boundary}--\r\n".encode()
+        response = StreamingHttpResponse(
+            _stream_ranges(file, parts, closing),
+            status=206,
+            content_type=f"multipart/byteranges; boundary={boundary}",
+        )
+        response["Content-Length"] = sum(
+            len(part_header) + end - start + 1 for part_header, start, end in parts
+        ) + len(closing)
+
+    response["Accept-Ranges"] = "bytes"
+    return response
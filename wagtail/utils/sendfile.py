@@ -99,8 +99,10 @@ def sendfile(
             parts.append("filename*=UTF-8''%s" % quoted_filename)
 
     response["Content-Disposition"] = "; ".join(parts)
-    response["Content-length"] = os.path.getsize(filename)
-    response["Content-Type"] = mimetype
+    if response.status_code not in (206, 416):
+        # Partial responses describe their own content
+        response["Content-length"] = os.path.getsize(filename)
+        response["Content-Type"] = mimetype
     response["Content-Encoding"] = encoding or guessed_encoding
 
     return response
@@ -8,20 +8,36 @@ from email.utils import mktime_tz, parsedate_tz
 from django.http import FileResponse, HttpResponseNotModified
 from django.utils.http import http_date
 
+from wagtail.utils.ranges import get_range_response
 
-def sendfile(request, filename, **kwargs):
+
+def sendfile(request, filename, mimetype=None, etag=None, **kwargs):
     # Respect the If-Modified-Since header.
     statobj = os.stat(filename)
+    mtime = statobj[stat.ST_MTIME]
 
     if not was_modified_since(
         request.headers.get("if-modified-since"),
-        statobj[stat.ST_MTIME],
+        mtime,
     ):
         return HttpResponseNotModified()
 
-    response = FileResponse(open(filename, "rb"))
+    file = open(filename, "rb")
+
+    # Respect the Range header, so that downloads can be resumed
+    response = get_range_response(
+        request,
+        file,
+        statobj[stat.ST_SIZE],
+        mimetype,
+        etag=etag,
+        last_modified=mtime,
+    )
+    if response is None:
+        response = FileResponse(file)
+        response["Accept-Ranges"] = "bytes"
 
-    response["Last-Modified"] = http_date(statobj[stat.ST_MTIME])
+    response["Last-Modified"] = http_date(mtime)
     return response
 
 
@@ -0,0 +1,77 @@
+import weakref
+
+from django.db import transaction
+
+
+class TransactionState:
+    """
+    Holds data for a single database transaction. Attributes can be set on it
+    freely, and are discarded along with it once the transaction is over.
+
+    It is registered as one of the transaction's commit hooks, which is the
+    only reference kept to it, so it is released as soon as the transaction is
+    rolled back and Django discards the hooks.
+    """
+
+    committed = False
+
+    def __call__(self):
+        self.committed = True
+
+
+def get_current_transaction(using=None):
+    """
+    Return the TransactionState of the current transaction, or None when not in
+    a transaction. Data for the transaction, such as queues of work to do once
+    it's committed, can be kept on it.
+    """
+    connection = transaction.get_connection(using)
+    if not connection.in_atomic_block:
+        return None
+
+    state_ref = getattr(connection, "_wagtail_transaction_state", None)
+    state = state_ref() if state_ref is not None else None
+    if state is None or state.committed:
+        state = TransactionState()
+        transaction.on_commit(state, using=using)
+        connection._wagtail_transaction_state = weakref.ref(state)
+
+    return state
+
+
+def mark_uncommitted_changes(name, using=None):
+    """
+    Record that the current transaction has changed the data that the
+    process-wide cache ``name`` is built from. Until the transaction is
+    committed or rolled back, ``has_uncommitted_changes(name)`` returns True
+    on this connection, so that the cache isn't built from data that may yet
+    be rolled back.
+    """
+    connection = transaction.get_connection(using)
+    if not connection.in_atomic_block:
+        return
+
+    # Each change is tracked by its own commit hook, so that it's forgotten if
+    # the savepoint it was made in is rolled back
+    change = TransactionState()
+    transaction.on_commit(change, using=using)
+
+    if not hasattr(connection, "_wagtail_uncommitted_changes"):
+        connection._wagtail_uncommitted_changes = {}
+    connection._wagtail_uncommitted_changes.setdefault(name, weakref.WeakSet()).add(
+        change
+    )
+
+
+def has_uncommitted_changes(name, using=None):
+    """
+    Return whether the current transaction has changed the data that the
+    process-wide cache ``name`` is built from, as recorded by
+    ``mark_uncommitted_changes()``.
+    """
+    connection = transaction.get_connection(using)
+    if not connection.in_atomic_block:
+        return False
+
+    changes = getattr(connection, "_wagtail_uncommitted_changes", {}).get(name, ())
+    return any(not change.committed for change in changes)